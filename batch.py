@@ -0,0 +1,188 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+"""
+Headless batch validation for CI and ETL jobs.
+
+Validates the given CSV files, the CSV files below the given directories, or
+a CSV read from stdin ("-"), in parallel worker processes. One JSON object per
+file is written to stdout as soon as that file is done. Unlike watcher.py
+nothing is moved, no folders or logs are created and no banners are printed.
+With --dataset the files are one migration: contacts files are validated first
+and the userIds of points and voucher rows must exist in them; voucher results
+are written once every voucher file has been checked, as a code repeated by a
+later file makes the earlier file invalid too. With
+--user-index the userIds also go into a file that later runs check against,
+so each batch of points or vouchers no longer needs the contacts file.
+--points-totals writes each user's totals over the valid rows of all points
+files to a CSV, gathered while the files are validated. --split-rows and
+--split-mb copy each file into import-sized chunks as it is validated.
+
+Exit codes: 0 when every file is valid, 1 when at least one file is invalid,
+2 for usage errors, 3 when a file could not be read or parsed.
+"""
+
+import argparse
+import functools
+import json
+import os
+import sys
+from src.core.engine import (validate_path, validate_stream, validate_dataset, DEFAULT_MAX_ERRORS,
+                             STATUS_VALID, STATUS_INVALID, STATUS_FAILED)
+from src.core.splitter import SplitOptions
+from src.core.user_index import UserIdFile
+from src.points.user_totals import UserTotals
+from src.watch.worker_pool import WorkerPool, EVENT_STARTED
+
+EXIT_VALID = 0
+EXIT_INVALID = 1
+EXIT_USAGE = 2
+EXIT_FAILED = 3
+
+STDIN = "-"
+DEFAULT_SPLIT_DIRECTORY = "chunks"
+
+
+def collect_files(paths):
+    """Expand directories into the CSV files below them, in sorted order; other paths are kept as given."""
+    files = []
+    for path in paths:
+        if path != STDIN and os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                files.extend(os.path.join(root, name) for name in sorted(names) if name.lower().endswith('.csv'))
+        else:
+            files.append(path)
+    return files
+
+
+def iter_results(files, workers, max_errors, split=None):
+    """Yield each file's result as it finishes; more than one file is spread over worker processes."""
+    task = functools.partial(validate_path, max_errors=max_errors, split=split)
+    if len(files) < 2 or workers == 1:
+        for file in files:
+            yield task(file)
+        return
+
+    pool = WorkerPool(task, workers=min(workers or os.cpu_count() or 1, len(files)))
+    pending = list(reversed(files))
+    try:
+        while pending or pool.in_flight:
+            while pending and pool.submit(pending[-1]):
+                pending.pop()
+            for event, _worker_id, file, result, _elapsed in pool.poll(0.1):
+                if event == EVENT_STARTED:
+                    continue
+                if isinstance(result, Exception):
+                    result = {"file": file, "status": STATUS_FAILED, "error": str(result)}
+                yield result
+    finally:
+        pool.close()
+
+
+def run(files, workers=None, max_errors=DEFAULT_MAX_ERRORS, output=None, stdin=None, dataset=False,
+        user_index=None, user_totals=None, split=None):
+    """
+    Validate files, write one JSON line per file to output and return the exit code.
+
+    With dataset set, or a user_index (a UserIdIndex or UserIdFile) or user_totals (a
+    UserTotals) given, the files are validated in this process with validate_dataset(),
+    as the index and totals are built and used in one process. With split (a SplitOptions)
+    each file is also written to chunks, listed in its result's "chunks".
+    """
+    output = output or sys.stdout
+    counts = {STATUS_VALID: 0, STATUS_INVALID: 0, STATUS_FAILED: 0}
+
+    def emit(result):
+        counts[result["status"]] += 1
+        output.write(json.dumps(result, ensure_ascii=False) + "\n")
+        output.flush()
+
+    if STDIN in files:
+        emit(validate_stream(stdin or sys.stdin.buffer, "<stdin>", max_errors, split=split))
+    files = [file for file in files if file != STDIN]
+    if dataset or user_index is not None or user_totals is not None:
+        results = validate_dataset(files, max_errors, user_index, user_totals, split)
+    else:
+        results = iter_results(files, workers, max_errors, split)
+    for result in results:
+        emit(result)
+
+    if counts[STATUS_FAILED]:
+        return EXIT_FAILED
+    if counts[STATUS_INVALID]:
+        return EXIT_INVALID
+    return EXIT_VALID
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Validate loyalty CSV files without the watch folder and print one JSON result per file.",
+        epilog="Exit codes: 0 all files valid, 1 a file is invalid, 2 usage error, 3 a file could not be read.")
+    parser.add_argument("paths", nargs="*", metavar="PATH",
+                        help="CSV files or directories to search for *.csv files; '-' reads a CSV from stdin "
+                             "(the default when no paths are given and stdin is not a terminal)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes for validating files in parallel (default: one per CPU core)")
+    parser.add_argument("--max-errors", type=int, default=DEFAULT_MAX_ERRORS,
+                        help=f"row errors listed per file, 0 for all; the total is always counted "
+                             f"(default: {DEFAULT_MAX_ERRORS})")
+    parser.add_argument("--dataset", action="store_true",
+                        help="treat the files as one migration and report points and voucher rows whose userId "
+                             "is not in its contacts file(s); files are then validated one after another")
+    parser.add_argument("--user-index", metavar="FILE", default=None,
+                        help="like --dataset, but the userIds of contacts files are also appended to FILE "
+                             "(created if missing) and points and voucher rows are checked against all userIds "
+                             "indexed there by earlier runs")
+    parser.add_argument("--points-totals", metavar="FILE", default=None,
+                        help="write each user's pointsToSpend, statusPoints and cashback totals over the valid "
+                             "rows of all points files to the CSV FILE; files are then validated one after another")
+    parser.add_argument("--split-rows", type=int, default=None, metavar="N",
+                        help="also write each file to chunks of at most N data rows, each starting with the header")
+    parser.add_argument("--split-mb", type=float, default=None, metavar="MB",
+                        help="also write each file to chunks of at most MB megabytes, each starting with the header")
+    parser.add_argument("--split-dir", default=DEFAULT_SPLIT_DIRECTORY, metavar="DIR",
+                        help=f"directory for the chunks, named <file>_part0001.csv and so on "
+                             f"(default: {DEFAULT_SPLIT_DIRECTORY})")
+    args = parser.parse_args(argv)
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.max_errors < 0:
+        parser.error("--max-errors must not be negative")
+    if (args.split_rows is not None and args.split_rows < 1) or (args.split_mb is not None and args.split_mb <= 0):
+        parser.error("--split-rows and --split-mb must be positive")
+    if not args.paths:
+        if sys.stdin.isatty():
+            parser.error("no files given")
+        args.paths = [STDIN]
+    if (args.dataset or args.user_index or args.points_totals) and STDIN in args.paths:
+        parser.error("--dataset, --user-index and --points-totals need files, not stdin")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    files = collect_files(args.paths)
+    split = None
+    if args.split_rows is not None or args.split_mb is not None:
+        max_bytes = int(args.split_mb * 1024 * 1024) if args.split_mb is not None else None
+        split = SplitOptions(args.split_dir, args.split_rows, max_bytes)
+    user_totals = UserTotals() if args.points_totals else None
+    try:
+        if args.user_index is None:
+            exit_code = run(files, args.workers, args.max_errors or None, dataset=args.dataset,
+                            user_totals=user_totals, split=split)
+        else:
+            with UserIdFile(args.user_index) as user_index:
+                exit_code = run(files, args.workers, args.max_errors or None, user_index=user_index,
+                                user_totals=user_totals, split=split)
+        if user_totals is not None:
+            user_totals.write(args.points_totals)
+        return exit_code
+    finally:
+        if user_totals is not None:
+            user_totals.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
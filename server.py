@@ -4,8 +4,9 @@
 import os
 import sys
 import csv
+import gzip
+import time
 import threading
-import webbrowser
 
 # Handle PyInstaller frozen bundle - templates must be found relative to the bundle root
 if getattr(sys, 'frozen', False):
@@ -13,12 +14,86 @@ if getattr(sys, 'frozen', False):
 else:
     _base_dir = os.path.dirname(os.path.abspath(__file__))
 
-from flask import Flask, render_template, request, jsonify
-from src.utils.file_utils import detect_encoding, strip_bom, detect_csv_type
+from collections import Counter
+from flask import Flask, Response, g, render_template, request, jsonify
+from src.utils.file_utils import decode_bytes, strip_bom, detect_csv_type
+from src.core.profiling import Profiler, lap
+from src.core.report import generate_unique_log_filename
+from src.core.sampling import SamplingProfiler, PROFILE_EXTENSION
+from src.core.error_codes import error_details
+from src.core import metrics
 
 app = Flask(__name__, template_folder=os.path.join(_base_dir, 'templates'))
 
 PORT = 7777
+# Responses to clients that accept gzip are compressed above this size; large error lists shrink ~10x
+COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', '6'))
+COMPRESS_MIN_BYTES = 1024
+# /validate requests still running after this many seconds are sampled; unset disables it
+SAMPLE_AFTER_SECONDS = float(os.environ['SAMPLE_AFTER_SECONDS']) if os.environ.get('SAMPLE_AFTER_SECONDS') else None
+SAMPLE_LOGS_DIRECTORY = os.path.join('.', 'watch_folder', 'logs')
+
+METRICS = metrics.Registry()
+REQUESTS = METRICS.register(metrics.Counter(
+    'verifier_requests_total', 'Validation requests by HTTP status.', ['status']))
+RECEIVED_BYTES = METRICS.register(metrics.Counter(
+    'verifier_received_bytes_total', 'Bytes of uploaded CSV files received.'))
+ROWS_VALIDATED = METRICS.register(metrics.Counter(
+    'verifier_rows_validated_total', 'Data rows validated, by CSV type.', ['csv_type']))
+ROWS_PER_SECOND = METRICS.register(metrics.Gauge(
+    'verifier_rows_per_second', 'Rows per second of the most recent validation, by CSV type.', ['csv_type']))
+VALIDATION_SECONDS = METRICS.register(metrics.Histogram(
+    'verifier_validation_seconds', 'Time spent validating the rows of an upload, by CSV type.', ['csv_type']))
+INFLIGHT = METRICS.register(metrics.Gauge(
+    'verifier_inflight_validations', 'Validation requests currently being processed.'))
+ROW_ERRORS = METRICS.register(metrics.Counter(
+    'verifier_row_errors_total', 'Row errors reported, by error code (see src/core/error_codes.py).', ['code']))
+METRICS.register(metrics.CallbackGauge(
+    'process_resident_memory_bytes', 'Resident memory size of the server process in bytes.',
+    metrics.process_resident_memory_bytes))
+
+
+@app.before_request
+def track_inflight():
+    if request.endpoint == 'validate':
+        INFLIGHT.inc()
+        g.inflight = True
+
+
+@app.teardown_request
+def finish_request(_error):
+    if g.pop('inflight', False):
+        INFLIGHT.dec()
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.close()
+    sampler = g.pop('sampler', None)
+    if sampler is not None:
+        # Only reached with the sampler still running when the request failed
+        sampler.stop()
+
+
+@app.after_request
+def count_request(response):
+    if request.endpoint == 'validate':
+        REQUESTS.inc(labels=(response.status_code,))
+    return response
+
+
+@app.after_request
+def compress_response(response):
+    if (COMPRESS_LEVEL <= 0
+            or 'gzip' not in request.headers.get('Accept-Encoding', '').lower()
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers):
+        return response
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_BYTES:
+        return response
+    response.set_data(gzip.compress(data, compresslevel=COMPRESS_LEVEL))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
 
 
 @app.route('/')
@@ -26,6 +101,36 @@ def index():
     return render_template('index.html')
 
 
+@app.route('/metrics')
+def metrics_endpoint():
+    return Response(METRICS.render(), content_type=metrics.CONTENT_TYPE)
+
+
+def _start_sampling():
+    """Sample this request when ?sample=1 is set or SAMPLE_AFTER_SECONDS is configured."""
+    if request.args.get('sample', '').lower() in ('1', 'true', 'yes'):
+        g.sampler = SamplingProfiler().start()
+    elif SAMPLE_AFTER_SECONDS is not None:
+        g.sampler = SamplingProfiler(delay=SAMPLE_AFTER_SECONDS).start()
+    else:
+        return None
+    return g.sampler
+
+
+def _finish_sampling(sampler, filename, result):
+    """Stop sampler and, if it collected stacks, save them and name the file in result."""
+    if sampler is None:
+        return
+    g.pop('sampler', None)
+    sampler.stop()
+    if sampler.stacks:
+        os.makedirs(SAMPLE_LOGS_DIRECTORY, exist_ok=True)
+        profile_filename = generate_unique_log_filename(
+            SAMPLE_LOGS_DIRECTORY, os.path.basename(filename), PROFILE_EXTENSION)
+        sampler.write(os.path.join(SAMPLE_LOGS_DIRECTORY, profile_filename))
+        result['sample_profile'] = profile_filename
+
+
 @app.route('/validate', methods=['POST'])
 def validate():
     if 'file' not in request.files:
@@ -43,7 +148,16 @@ def validate():
             'errors': [{'row': None, 'message': 'Only .csv files are supported'}]
         })
 
+    # /validate?profile=1 adds a timing breakdown per phase and rule to the response,
+    # /validate?memory=1 the peak and net allocation per phase
+    profile = request.args.get('profile', '').lower() in ('1', 'true', 'yes')
+    profile_memory = request.args.get('memory', '').lower() in ('1', 'true', 'yes')
+    profiler = Profiler(timing=profile, memory=profile_memory) if profile or profile_memory else None
+    if profiler is not None:
+        g.profiler = profiler
     raw_bytes = file.read()
+    RECEIVED_BYTES.inc(len(raw_bytes))
+    lap(profiler, "upload")
 
     if len(raw_bytes) == 0:
         return jsonify({
@@ -54,13 +168,16 @@ def validate():
             'errors': [{'row': None, 'message': 'File is empty'}]
         })
 
-    encoding = detect_encoding(raw_bytes)
-    content_str = raw_bytes.decode(encoding)
+    # /validate?sample=1 saves a flame graph profile of the request to watch_folder/logs
+    sampler = _start_sampling()
+    content_str, encoding, fallback_offset = decode_bytes(raw_bytes)
+    lap(profiler, "decode")
 
     has_bom = content_str.startswith('﻿')
     content_str = strip_bom(content_str)
 
     csv_type, validator_class, expected_cols, delimiter = detect_csv_type(content_str)
+    lap(profiler, "header detection")
 
     file_level_errors = []
 
@@ -71,13 +188,15 @@ def validate():
         file_level_errors.append({'row': None, 'message': 'File uses semicolon (;) separators. SAP Engagement Cloud requires comma (,) separators.'})
 
     if validator_class is None:
-        return jsonify({
+        result = {
             'filename': filename,
             'csv_type': 'Unknown',
             'row_count': 0,
             'is_valid': False,
             'errors': file_level_errors + [{'row': None, 'message': 'Unrecognized CSV format. Headers do not match Contacts, Points, or Vouchers.'}]
-        })
+        }
+        _finish_sampling(sampler, filename, result)
+        return jsonify(result)
 
     non_empty_lines = [l for l in content_str.splitlines() if l.strip()]
     row_count = max(0, len(non_empty_lines) - 1)
@@ -85,30 +204,51 @@ def validate():
     validator = validator_class('<upload>', None, expected_cols, delimiter)
     validator._cleaned_content = content_str
     validator._enable_progress_tracking = False
+    if profiler is not None:
+        validator.enable_profiling(profiler)
+    lap(profiler, "row count")
 
+    started = time.perf_counter()
     is_valid = validator.validate()
+    elapsed = time.perf_counter() - started
+    VALIDATION_SECONDS.observe(elapsed, (csv_type,))
+    ROWS_VALIDATED.inc(validator.row_count, (csv_type,))
+    if elapsed > 0:
+        ROWS_PER_SECOND.set(validator.row_count / elapsed, (csv_type,))
 
     row_errors = []
-    for err in validator.validation_error_details + validator.timestamp_error_details:
+    error_codes = Counter()
+    for err in validator.validation_error_details:
         row_num = err['row']
-        for msg in err['message'].split('; '):
+        for code, _column, msg in error_details(err['message'], validator.timestamp_column):
             msg = msg.strip()
             if msg:
                 row_errors.append({'row': row_num, 'message': msg})
+                error_codes[(code,)] += 1
+    # One lock acquisition per request rather than per error
+    ROW_ERRORS.inc_many(error_codes)
 
     all_errors = file_level_errors + row_errors
     final_valid = is_valid and len(file_level_errors) == 0
 
-    return jsonify({
+    result = {
         'filename': filename,
         'csv_type': csv_type,
         'row_count': row_count,
         'is_valid': final_valid,
+        'encoding': encoding,
+        'encoding_fallback_offset': fallback_offset,
         'errors': all_errors
-    })
+    }
+    if profiler is not None:
+        lap(profiler, "response")
+        result['profile'] = profiler.as_dict()
+    _finish_sampling(sampler, filename, result)
+    return jsonify(result)
 
 
 def _open_browser():
+    import webbrowser
     webbrowser.open(f'http://localhost:{PORT}')
 
 
@@ -0,0 +1,56 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+"""
+Validation API for using the verifier as a library.
+
+    from src import api
+    result = api.validate_path("contacts.csv")
+    if result["status"] != "valid":
+        ...
+
+Importing this module has no side effects and imports nothing else: each
+name below is loaded from its module on first access, so a script that only
+detects a CSV type never loads the validation engine, and nothing here ever
+loads Flask, the watch folder machinery or the profilers. Results are the
+JSON-ready dicts described in src.core.engine.validate_stream().
+"""
+
+import importlib
+
+# Public name -> module defining it
+_EXPORTS = {
+    'validate_path': 'src.core.engine',
+    'validate_stream': 'src.core.engine',
+    'validate_bytes': 'src.core.engine',
+    'validate_dataset': 'src.core.engine',
+    'DEFAULT_MAX_ERRORS': 'src.core.engine',
+    'STATUS_VALID': 'src.core.engine',
+    'STATUS_INVALID': 'src.core.engine',
+    'STATUS_FAILED': 'src.core.engine',
+    'detect_csv_type': 'src.utils.file_utils',
+    'UserIdIndex': 'src.core.user_index',
+    'UserIdFile': 'src.core.user_index',
+    'UserTotals': 'src.points.user_totals',
+    'SplitOptions': 'src.core.splitter',
+    'ContactsValidator': 'src.contacts.contacts_csv_validator',
+    'PointsValidator': 'src.points.points_csv_validator',
+    'VoucherValidator': 'src.vouchers.voucher_csv_validator',
+    'classify_error': 'src.core.error_codes',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    # Cache it so later lookups no longer go through __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -3,10 +3,12 @@
 
 import time
 from src.utils.time_utils import _is_past_timestamp, _is_unix_millisecond_timestamp
+from src.core.error_codes import ErrorMessage, join_errors
 from src.core.validator import Validator
 
 class ContactsValidator(Validator):
     contact_columns = ['userId', 'shouldJoin', 'joinDate', 'tierName', 'tierEntryAt', 'tierCalcAt', 'shouldReward']
+    timestamp_column = 'joinDate'
 
     def __init__(self, csv_path, log_path, expected_columns=contact_columns, delimiter=','):
         super().__init__(csv_path=csv_path, log_path=log_path, expected_columns=expected_columns, delimiter=delimiter)
@@ -15,39 +17,39 @@ class ContactsValidator(Validator):
     def _validate_row(self, values):
         errors = []
         if len(values) != len(self.expected_columns):
-            errors.append(f"Row should have {len(self.expected_columns)} columns")
+            errors.append(ErrorMessage(f"Row should have {len(self.expected_columns)} columns", "column_count"))
 
         if not values[0]:
-            errors.append("Column 'userId' should not be empty")
+            errors.append(ErrorMessage("Column 'userId' should not be empty", "empty_value", "userId"))
         elif values[0] == "NULL":
-            errors.append("Column 'userId' should not be 'NULL'")
+            errors.append(ErrorMessage("Column 'userId' should not be 'NULL'", "null_value", "userId"))
         elif values[0] in self.seen_user_ids:
-            errors.append(f"Duplicate userId found: {values[0]}")
+            errors.append(ErrorMessage(f"Duplicate userId found: {values[0]}", "duplicate_user_id", "userId"))
         else:
             self.seen_user_ids.add(values[0])
 
         if values[1] != "TRUE":
-            errors.append("Column 'shouldJoin' should be 'TRUE'")
+            errors.append(ErrorMessage("Column 'shouldJoin' should be 'TRUE'", "invalid_value", "shouldJoin"))
         
         try:
             join_date = int(values[2])
             is_valid_unix_timestamp, timestamp_message = _is_unix_millisecond_timestamp(join_date)
             if not is_valid_unix_timestamp:
-                errors.append(f"Column 'joinDate': {timestamp_message}")
+                errors.append(timestamp_message.in_column('joinDate', prefix=True))
             else:
                 is_past, past_message = _is_past_timestamp(join_date)
                 if not is_past:
-                    errors.append("Column 'joinDate' should be a past UNIX timestamp in milliseconds")
+                    errors.append(ErrorMessage("Column 'joinDate' should be a past UNIX timestamp in milliseconds", "timestamp_not_past", "joinDate"))
         except ValueError:
-            errors.append("Column 'joinDate' should be an integer (UNIX timestamp in milliseconds)")
+            errors.append(ErrorMessage("Column 'joinDate' should be an integer (UNIX timestamp in milliseconds)", "not_integer", "joinDate"))
         
         if values[4] or values[5]:
-            errors.append("Columns 'tierEntryAt' and 'tierCalcAt' should be empty")
+            errors.append(ErrorMessage("Columns 'tierEntryAt' and 'tierCalcAt' should be empty", "must_be_empty", "tierEntryAt"))
         
         if values[6] not in ["TRUE", "FALSE"]:
-            errors.append("Column 'shouldReward' should be 'TRUE' or 'FALSE'")
+            errors.append(ErrorMessage("Column 'shouldReward' should be 'TRUE' or 'FALSE'", "invalid_value", "shouldReward"))
         
         if errors:
-            return False, "; ".join(errors)
+            return False, join_errors(errors)
         
         return True, ""
\ No newline at end of file
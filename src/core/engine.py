@@ -0,0 +1,301 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+import csv
+import io
+import itertools
+import os
+import time
+from src.core.error_codes import ErrorMessage, error_details
+from src.core.tokenizer import iter_block_records, iter_block_rows
+from src.core.unique_index import UniqueValueIndex
+from src.core.user_index import UserIdIndex
+from src.points.points_csv_validator import PointsValidator
+from src.utils.file_utils import detect_csv_type
+from src.vouchers.voucher_csv_validator import VoucherValidator
+from src.watch.pipeline import PipelineReader
+
+# Row errors listed per file in a result; the rest are only counted
+DEFAULT_MAX_ERRORS = 100
+
+STATUS_VALID = "valid"
+STATUS_INVALID = "invalid"
+STATUS_FAILED = "failed"
+
+
+class _ErrorCollector:
+    """
+    Stands in for a DetailsReport: keeps the first max_errors individual row errors.
+
+    Each "; "-joined row message is split into records with a stable code and
+    column, as in the ndjson export. max_errors None keeps every error.
+    """
+
+    def __init__(self, max_errors, timestamp_column=None):
+        self.max_errors = max_errors
+        self.timestamp_column = timestamp_column
+        self.errors = []
+        self.count = 0
+
+    def add(self, error):
+        for code, column, message in error_details(error["message"], self.timestamp_column):
+            self.count += 1
+            if self.max_errors is None or len(self.errors) < self.max_errors:
+                self.errors.append({"row": error["row"], "column": column, "code": code, "message": message})
+
+    def close(self):
+        pass
+
+    def abandon(self):
+        pass
+
+
+def _file_error(message):
+    return {"row": None, "column": None, "code": "file", "message": message}
+
+
+def _failed(name, message):
+    return {"file": name, "status": STATUS_FAILED, "error": message}
+
+
+def _written_rows(records, writer):
+    """Yield the rows of (row, text) records, writing the text of each non-empty row to writer first."""
+    for row, text in records:
+        if any(row):
+            writer.write(text)
+        yield row
+
+
+def validate_stream(stream, name, max_errors=DEFAULT_MAX_ERRORS, user_index=None, unique_indexes=None,
+                    user_totals=None, split=None):
+    """
+    Validate a CSV read from a binary stream and return its result as a JSON-ready dict.
+
+    Nothing is printed, written or moved: rows are streamed through the
+    validator for the detected type and their errors collected in the result
+    ("status", "csv_type", "row_count", "encoding", "error_count" and the
+    first max_errors "errors"). File-level problems (BOM, semicolons, unknown
+    headers) are errors with row None, as in the server's response. A file
+    the CSV parser gives up on, or that makes a validator raise, has status
+    "failed" and its "error".
+
+    With a user_index (see validate_dataset()) the userIds of a contacts file
+    are added to it, and points or voucher rows whose userId it does not
+    contain get an "Unknown userId" error; "unknown_user_ids" counts them.
+    unique_indexes (column -> UniqueValueIndex) shared between voucher files
+    reports voucher codes and externalIds repeated across them. The valid rows
+    of a points file are summed per user into user_totals (a UserTotals).
+
+    With split (a SplitOptions) the rows are also copied to chunks as they
+    are validated, listed in "chunks"; the source is still read only once.
+    """
+    try:
+        return _validate_stream(stream, name, max_errors, user_index, unique_indexes, user_totals, split)
+    except Exception as error:
+        # A row the validators cannot handle fails the file, not the run, in every caller
+        return _failed(name, f"{type(error).__name__}: {error}")
+
+
+def _validate_stream(stream, name, max_errors, user_index, unique_indexes, user_totals, split):
+    started = time.perf_counter()
+    result = {"file": name, "status": STATUS_INVALID, "csv_type": "Unknown", "row_count": 0}
+    file_errors = []
+    collector = _ErrorCollector(max_errors)
+    with PipelineReader(stream) as reader:
+        blocks = iter(reader)
+        first_block = next(blocks, '')
+        header_end = first_block.find('\n') + 1 or len(first_block)
+        csv_type, validator_class, expected_cols, delimiter = detect_csv_type(first_block[:header_end])
+        if reader.has_bom:
+            file_errors.append(_file_error("File starts with a UTF-8 Byte Order Mark (BOM), which is not supported."))
+        if delimiter == ';':
+            file_errors.append(_file_error("File uses semicolon (;) separators. SAP Engagement Cloud requires comma (,) separators."))
+
+        if not first_block.strip():
+            file_errors.append(_file_error("File is empty"))
+        elif validator_class is None:
+            file_errors.append(_file_error("Unrecognized CSV format. Headers do not match Contacts, Points, or Vouchers."))
+        else:
+            result["csv_type"] = csv_type
+            # ContactsValidator reports repeated userIds itself, so the watcher's extra scan is not needed
+            validator = validator_class(name, None, expected_cols, delimiter)
+            collector.timestamp_column = validator.timestamp_column
+            validator.report = collector
+            if unique_indexes is not None and validator_class is VoucherValidator:
+                validator.unique_indexes = unique_indexes
+            if user_totals is not None and validator_class is PointsValidator:
+                validator.user_totals = user_totals
+            validator.start_validation()
+            idx = 1
+            remaining = itertools.chain((first_block[header_end:],), blocks)
+            chunks = None
+            if split is None:
+                rows = iter_block_rows(remaining, delimiter)
+            else:
+                chunks = split.writer(name, first_block[:header_end])
+                rows = _written_rows(iter_block_records(remaining, delimiter), chunks)
+            unknown_user_ids = 0
+            try:
+                if user_index is None:
+                    for row in rows:
+                        if any(row):
+                            idx += 1
+                            validator.validate_record(idx, row)
+                elif csv_type == "Contacts":
+                    for row in rows:
+                        if any(row):
+                            idx += 1
+                            validator.validate_record(idx, row)
+                            if row[0]:
+                                user_index.add(row[0])
+                else:
+                    for row in rows:
+                        if any(row):
+                            idx += 1
+                            validator.validate_record(idx, row)
+                            if row[0] and row[0] not in user_index:
+                                unknown_user_ids += 1
+                                collector.add({"row": idx, "message": ErrorMessage(
+                                    f"Unknown userId: {row[0]} does not exist in the contacts file",
+                                    "unknown_user_id", "userId")})
+            except csv.Error as error:
+                if chunks is not None:
+                    chunks.discard()
+                return _failed(name, f"Row {idx + 1}: {error}")
+            except Exception as error:
+                # The row that was being validated
+                if chunks is not None:
+                    chunks.discard()
+                return _failed(name, f"Row {idx}: {type(error).__name__}: {error}")
+            validator.finish_validation()
+            result["row_count"] = validator.row_count
+            if chunks is not None:
+                result["chunks"] = chunks.close()
+            if user_index is not None and csv_type != "Contacts":
+                result["unknown_user_ids"] = unknown_user_ids
+        result["encoding"] = "utf-8" if reader.fallback_offset is None else "ISO-8859-1"
+        result["encoding_fallback_offset"] = reader.fallback_offset
+
+    errors = file_errors + collector.errors
+    result["error_count"] = len(file_errors) + collector.count
+    result["errors"] = errors if max_errors is None else errors[:max_errors]
+    if result["error_count"] == 0:
+        result["status"] = STATUS_VALID
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def validate_path(path, max_errors=DEFAULT_MAX_ERRORS, user_index=None, unique_indexes=None, user_totals=None,
+                  split=None):
+    """validate_stream() for a file; a file that cannot be read gives status "failed" and its "error"."""
+    try:
+        with open(path, 'rb') as stream:
+            return validate_stream(stream, path, max_errors, user_index, unique_indexes, user_totals, split)
+    except OSError as error:
+        return _failed(path, str(error))
+
+
+def _earlier_duplicates(unique_indexes):
+    """Errors, sorted by file and row, for rows of earlier voucher files whose value a later file repeated."""
+    errors = []
+    for index in unique_indexes.values():
+        for source, row, column, value, repeat_source, repeat_row in index.earlier_duplicates:
+            message = (f"Column '{column}' has a duplicate value: {value} "
+                       f"(repeated in row {repeat_row} of {os.path.basename(index.source_name(repeat_source))})")
+            errors.append({"file": index.source_name(source), "row": row, "column": column, "code": "duplicate_value",
+                           "message": message})
+    errors.sort(key=lambda error: (error["file"], error["row"]))
+    return errors
+
+
+def _add_earlier_duplicates(result, duplicates, max_errors):
+    """Count a voucher file's rows that a later file repeated as errors of that file's result."""
+    rows = [{key: value for key, value in error.items() if key != "file"}
+            for error in duplicates if error["file"] == result["file"]]
+    if not rows or result["status"] == STATUS_FAILED:
+        return
+    result["status"] = STATUS_INVALID
+    result["error_count"] += len(rows)
+    errors = sorted(result["errors"] + rows, key=lambda error: (error["row"] is not None, error["row"] or 0))
+    result["errors"] = errors if max_errors is None else errors[:max_errors]
+
+
+def _earlier_duplicates_result(errors, max_errors):
+    """
+    Dataset result listing rows of earlier voucher files whose value a later file repeated.
+
+    The rows also count as errors of their own file (see _add_earlier_duplicates()); this
+    result lists them for the whole dataset. None when there are none.
+    """
+    if not errors:
+        return None
+    return {"file": None, "dataset": True, "status": STATUS_INVALID, "csv_type": "Vouchers",
+            "error_count": len(errors), "errors": errors if max_errors is None else errors[:max_errors]}
+
+
+def validate_bytes(raw_bytes, name="<upload>", max_errors=DEFAULT_MAX_ERRORS):
+    """validate_stream() for a file already in memory, such as an upload."""
+    return validate_stream(io.BytesIO(raw_bytes), name, max_errors)
+
+
+def validate_dataset(paths, max_errors=DEFAULT_MAX_ERRORS, user_index=None, user_totals=None, split=None):
+    """
+    Validate the files of one migration together and yield their results.
+
+    Contacts files are validated first while their userIds go into a
+    UserIdIndex, or into user_index; points and voucher files are then
+    checked against it row by row, so orphaned userIds are found before the
+    import. Each contacts file is indexed on its own first and its userIds are
+    added only once it has been read completely. A user_index such as a
+    UserIdFile that already holds the userIds of earlier runs is used even
+    without a contacts file, and keeps being used when a contacts file fails.
+    Otherwise, without a contacts file or when one cannot be read completely,
+    the files are validated on their own. Voucher codes and externalIds must also be unique
+    across all voucher files: voucher results are held back until every
+    voucher file has been checked, so rows of an earlier file repeated by a
+    later one make that file invalid too; these rows are also listed in a
+    final result with "dataset" set. With user_totals the valid rows of all
+    points files are summed per user into it. split is passed on to
+    validate_stream().
+    """
+    contacts, others = [], []
+    for path in paths:
+        try:
+            with open(path, 'rb') as stream:
+                csv_type = detect_csv_type(stream)[0]
+        except OSError:
+            csv_type = None
+        (contacts if csv_type == "Contacts" else others).append(path)
+
+    persistent = user_index is not None
+    if user_index is None and contacts:
+        user_index = UserIdIndex()
+    for path in contacts:
+        # A failed file's partial userIds must not count as known, nor be persisted
+        file_index = None if user_index is None else UserIdIndex(fingerprint=user_index.fingerprint)
+        result = validate_path(path, max_errors, file_index, split=split)
+        if file_index is not None:
+            if result["status"] != STATUS_FAILED:
+                user_index.update(file_index)
+            elif not persistent:
+                user_index = None
+        yield result
+    unique_indexes = {column: UniqueValueIndex() for column in VoucherValidator.unique_columns}
+    try:
+        voucher_results = []
+        for path in others:
+            result = validate_path(path, max_errors, user_index, unique_indexes, user_totals, split)
+            if result.get("csv_type") == "Vouchers":
+                voucher_results.append(result)
+            else:
+                yield result
+        duplicates = _earlier_duplicates(unique_indexes)
+        for result in voucher_results:
+            _add_earlier_duplicates(result, duplicates, max_errors)
+            yield result
+        summary = _earlier_duplicates_result(duplicates, max_errors)
+        if summary is not None:
+            yield summary
+    finally:
+        for index in unique_indexes.values():
+            index.close()
@@ -0,0 +1,134 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+import re
+from functools import lru_cache
+
+# Legacy classification of plain-str messages, e.g. from callers of Validator.record_error()
+# outside this package: (pattern, code, column) checked in order against a single error message;
+# column None means it is taken from a "Column '<name>'" mention, or the validator's timestamp
+# column for bare "Timestamp (...)" messages. The validators' own messages are ErrorMessages and
+# never reach these rules.
+ERROR_RULES = [
+    (r"^Row has \d+ columns but should have", "too_many_columns", None),
+    (r"^Row should have \d+ columns", "column_count", None),
+    (r"^If setPlanExpiration is TRUE, expireAt should be empty", "must_be_empty", "expireAt"),
+    (r"^expireAt should be a future", "timestamp_not_future", "expireAt"),
+    (r"^expireAt ", "not_integer", "expireAt"),
+    (r"^setPlanExpiration ", "invalid_value", "setPlanExpiration"),
+    (r"should not be empty at the same time", "missing_identifier", "userId"),
+    (r"should not be empty$", "empty_value", None),
+    (r"should not be 'NULL'", "null_value", None),
+    (r"^Duplicate userId found", "duplicate_user_id", "userId"),
+    (r"^Unknown userId", "unknown_user_id", "userId"),
+    (r"has a duplicate value", "duplicate_value", None),
+    (r"contains comma as decimal separator|contains decimal point", "decimal_separator", None),
+    (r"should be enclosed in double quotes", "unquoted_comma", None),
+    (r"should be an integer", "not_integer", None),
+    (r"should be a float", "not_float", None),
+    (r"^At least one of", "no_positive_value", None),
+    (r"^Negative values are not allowed", "negative_value", None),
+    (r"must be empty$|should be empty$", "must_be_empty", None),
+    (r"requires '\w+' to be set", "missing_dependency", None),
+    (r"should be a past UNIX timestamp", "timestamp_not_past", None),
+    (r"Timestamp \(.*\) is in the past", "timestamp_in_past", None),
+    (r"Timestamp \(.*\) appears to be in seconds", "timestamp_seconds", None),
+    (r"Timestamp \(", "timestamp_format", None),
+    (r"should be (either )?'", "invalid_value", None),
+]
+UNKNOWN_ERROR_CODE = "invalid"
+
+_COLUMN_MENTION = r"Columns? '(\w+)'"
+
+
+@lru_cache(maxsize=None)
+def _compiled_rules():
+    # Compiled on first use so importing the validators stays cheap
+    return [(re.compile(pattern), code, column) for pattern, code, column in ERROR_RULES], re.compile(_COLUMN_MENTION)
+
+
+@lru_cache(maxsize=4096)
+def classify_error(message, timestamp_column=None):
+    """Return (code, column) for one validator error message; column is None for row-level errors."""
+    rules, column_mention = _compiled_rules()
+    for pattern, code, column in rules:
+        if pattern.search(message):
+            break
+    else:
+        code, column = UNKNOWN_ERROR_CODE, None
+
+    if column is None:
+        mention = column_mention.search(message)
+        if mention:
+            column = mention.group(1)
+        elif message.startswith("Timestamp ("):
+            column = timestamp_column
+    return code, column
+
+
+class ErrorMessage(str):
+    """
+    One validator error: the message text, carrying the stable code and column it was created with.
+
+    It is a str, so validators and reports keep handling messages as text, while
+    error_details() reads the code and column from it instead of matching the text.
+    column None stands for a row-level error or, for bare "Timestamp (...)"
+    messages, the validator's timestamp column.
+    """
+
+    def __new__(cls, text, code, column=None):
+        message = super().__new__(cls, text)
+        message.code = code
+        message.column = column
+        return message
+
+    def __reduce__(self):
+        return ErrorMessage, (str(self), self.code, self.column)
+
+    def in_column(self, column, prefix=False):
+        """This error attributed to column, with "Column '<column>': " in front of the text if prefix is set."""
+        text = f"Column '{column}': {self}" if prefix else str(self)
+        return ErrorMessage(text, self.code, column)
+
+
+class RowErrors(str):
+    """A row's "; "-joined error message that keeps its individual ErrorMessages in errors."""
+
+    def __new__(cls, errors):
+        for error in errors:
+            if not isinstance(error, ErrorMessage):
+                raise TypeError(f"row error without a code: {error!r}")
+        message = super().__new__(cls, "; ".join(errors))
+        message.errors = tuple(errors)
+        return message
+
+    def __reduce__(self):
+        return RowErrors, (self.errors,)
+
+
+def join_errors(errors):
+    """Join a row's ErrorMessages into its message, as "; ".join() does, keeping their codes."""
+    return RowErrors(errors)
+
+
+def error_details(message, timestamp_column=None):
+    """
+    Return (code, column, text) for each individual error of a row message.
+
+    Codes and columns come from the ErrorMessages the validator created. Only
+    a message given as a plain str (a legacy caller) is split and classified
+    by ERROR_RULES.
+    """
+    if isinstance(message, ErrorMessage):
+        errors = (message,)
+    elif isinstance(message, RowErrors):
+        errors = message.errors
+    else:
+        return [classify_error(error, timestamp_column) + (error,) for error in message.split("; ")]
+    details = []
+    for error in errors:
+        column = error.column
+        if column is None and error.startswith("Timestamp ("):
+            column = timestamp_column
+        details.append((error.code, column, str(error)))
+    return details
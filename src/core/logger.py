@@ -1,41 +1,161 @@
 # SPDX-FileCopyrightText: 2024 SAP Engagement Cloud
 # SPDX-License-Identifier: MIT
 
+import io
+import atexit
+import queue
+import threading
+import weakref
+
+_open_loggers = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_loggers():
+    for logger in list(_open_loggers):
+        try:
+            logger.close()
+        except Exception:
+            pass
+
+
+def _write_batches(log_path, batches, errors, compress_level=None):
+    """Writer thread: append queued byte batches through one open handle until None arrives."""
+    log_file = None
+    compressor = None
+    item = b''
+    try:
+        if compress_level is None:
+            log_file = open(log_path, 'ab', buffering=1024 * 1024)
+        else:
+            # Appending adds a gzip member; readers decompress concatenated members as one stream
+            import gzip
+            compressor = gzip.GzipFile(log_path, 'ab', compresslevel=compress_level)
+            log_file = io.BufferedWriter(compressor, 1024 * 1024)
+        while True:
+            item = batches.get()
+            if item is None:
+                break
+            if isinstance(item, threading.Event):
+                log_file.flush()
+                if compressor is not None:
+                    # Sync-flush the deflate stream so everything so far can be decompressed
+                    compressor.flush()
+                item.set()
+                continue
+            log_file.write(item)
+    except Exception as e:
+        errors.append(e)
+        # Keep draining so callers blocked on the queue or waiting for a flush are released
+        while item is not None:
+            item = batches.get()
+            if isinstance(item, threading.Event):
+                item.set()
+    finally:
+        if log_file is not None:
+            try:
+                log_file.close()
+            except OSError as e:
+                errors.append(e)
+
+
 class Logger:
-    def __init__(self, log_path):
+    """
+    Appends messages to a log file from a background writer thread.
+
+    Messages are encoded on the calling thread and collected into a batch; once
+    the batch reaches flush_bytes it is handed to the writer through a bounded
+    queue (so a slow disk applies backpressure instead of growing memory). The
+    writer keeps one file handle open for its lifetime, gzip-compressed when
+    compress_level (1-9) is given. Call flush() to make everything logged so far
+    visible on disk and close() when done; loggers still open at interpreter
+    exit are closed automatically.
+    """
+
+    def __init__(self, log_path, flush_bytes=64 * 1024, max_queued_batches=64, compress_level=None):
         self.log_path = log_path
-        self._buffer = []
-        self._buffer_size = 0
-        self._max_buffer_size = 1000  # Buffer up to 1000 messages for efficiency
+        self.compress_level = compress_level
+        self.flush_bytes = flush_bytes
+        self._max_queued_batches = max_queued_batches
+        self._batch = []
+        self._batch_bytes = 0
+        self._queue = None
+        self._thread = None
+        self._errors = []
+        self._lock = threading.Lock()
 
     def log(self, message):
         if isinstance(message, list):
             message = "; ".join(message)
-        
-        # For large files, use buffering to improve performance
-        self._buffer.append(message)
-        self._buffer_size += 1
-        
-        # Flush buffer when it gets large or when explicitly requested
-        if self._buffer_size >= self._max_buffer_size:
-            self._flush_buffer()
-
-    def _flush_buffer(self):
-        """Write all buffered messages to file."""
-        if self._buffer:
-            with open(self.log_path, 'a', encoding='utf-8') as log_file:
-                for message in self._buffer:
-                    log_file.write(message + '\n')
-            self._buffer.clear()
-            self._buffer_size = 0
+
+        data = (message + '\n').encode('utf-8')
+        with self._lock:
+            self._batch.append(data)
+            self._batch_bytes += len(data)
+            if self._batch_bytes >= self.flush_bytes:
+                self._hand_off_batch()
+
+    def _hand_off_batch(self):
+        """Queue the collected messages for the writer; caller holds the lock."""
+        if not self._batch:
+            return
+        if self._thread is None:
+            self._start_writer()
+        data = b''.join(self._batch)
+        self._batch.clear()
+        self._batch_bytes = 0
+        self._queue.put(data)
+
+    def _start_writer(self):
+        self._queue = queue.Queue(maxsize=self._max_queued_batches)
+        # The thread gets no reference to self, so an abandoned logger can still be collected
+        self._thread = threading.Thread(target=_write_batches, args=(self.log_path, self._queue, self._errors, self.compress_level),
+                                        name="logger-writer", daemon=True)
+        self._thread.start()
+        _open_loggers.add(self)
+
+    def _raise_writer_error(self):
+        if self._errors:
+            raise self._errors.pop(0)
+
+    def flush(self):
+        """Block until everything logged so far has been written to the file; raises the writer's error, if any."""
+        with self._lock:
+            self._hand_off_batch()
+            if self._thread is None:
+                return
+            done = threading.Event()
+            self._queue.put(done)
+        done.wait()
+        self._raise_writer_error()
 
     def flush_if_possible(self):
         """Public method to flush buffer - used for memory management."""
-        self._flush_buffer()
+        self.flush()
+
+    def close(self):
+        """Write any remaining messages and stop the writer thread. Logging again restarts it."""
+        with self._lock:
+            self._hand_off_batch()
+            thread = self._thread
+            if thread is None:
+                return
+            self._queue.put(None)
+            self._thread = None
+            self._queue = None
+        thread.join()
+        _open_loggers.discard(self)
+        self._raise_writer_error()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def __del__(self):
-        """Ensure buffer is flushed when logger is destroyed."""
+        """Best-effort close for loggers that were never closed explicitly."""
         try:
-            self._flush_buffer()
-        except:
+            self.close()
+        except Exception:
             pass  # Ignore errors during cleanup
@@ -0,0 +1,181 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+import contextlib
+import functools
+import threading
+import time
+import types
+
+# Rule helpers called from the validators' _validate_row(); timed per call when profiling
+RULE_FUNCTIONS = ('_is_unix_millisecond_timestamp', '_is_past_timestamp', '_has_decimal_separators', '_needs_csv_quoting')
+
+_NOT_PROFILED = contextlib.nullcontext()
+
+# Profilers measuring memory; tracemalloc runs while any of them is open. It is imported
+# on first use, as it pulls in pickle and linecache that plain validation never needs
+tracemalloc = None
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+
+
+def _start_tracing():
+    global _tracing_users, tracemalloc
+    with _tracing_lock:
+        if tracemalloc is None:
+            import tracemalloc
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _tracing_users += 1
+
+
+def _stop_tracing():
+    global _tracing_users
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0:
+            tracemalloc.stop()
+
+
+class Profiler:
+    """
+    Wall time and call counts per validation phase and per rule helper.
+
+    Phases are timed with phase() or, for consecutive steps of one function,
+    lap(); rule helpers are timed by functions rebuilt with instrument(). A
+    Profiler belongs to one file or request and is not shared between threads.
+
+    With memory set, tracemalloc also records each phase's net allocation
+    (memory still held when it ends) and peak (highest allocation above its
+    starting point). tracemalloc slows Python code down several times and
+    counts the whole process, so concurrent validations blur each other's
+    numbers; close() stops tracing. With timing unset the rule helpers are
+    not instrumented.
+    """
+
+    def __init__(self, timing=True, memory=False):
+        self.timing = timing
+        # name -> [seconds, calls]
+        self.phases = {}
+        self.rules = {}
+        # name -> [net bytes, peak bytes, calls], or None without memory accounting
+        self.memory = None
+        if memory:
+            self.memory = {}
+            _start_tracing()
+            self._memory_start = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self._lap_start = time.perf_counter()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        stats = self.phases.setdefault(name, [0.0, 0])
+        if self.memory is not None:
+            self._mark_memory(None)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._lap_start = time.perf_counter()
+            stats[0] += self._lap_start - start
+            stats[1] += 1
+            if self.memory is not None:
+                self._mark_memory(name)
+
+    def lap(self, name):
+        """Add the time since the previous lap or phase (or since creation) to phase name."""
+        now = time.perf_counter()
+        stats = self.phases.setdefault(name, [0.0, 0])
+        stats[0] += now - self._lap_start
+        stats[1] += 1
+        self._lap_start = now
+        if self.memory is not None:
+            self._mark_memory(name)
+
+    def _mark_memory(self, name):
+        """Charge the allocations since the previous mark to phase name (or to nothing) and start a new one."""
+        current, peak = tracemalloc.get_traced_memory()
+        if name is not None:
+            stats = self.memory.setdefault(name, [0, 0, 0])
+            stats[0] += current - self._memory_start
+            stats[1] = max(stats[1], peak - self._memory_start)
+            stats[2] += 1
+        self._memory_start = current
+        tracemalloc.reset_peak()
+
+    def close(self):
+        """Stop memory accounting; the recorded numbers stay available."""
+        if self.memory is not None and self._memory_start is not None:
+            self._memory_start = None
+            _stop_tracing()
+
+    def timed(self, name, func):
+        """Return func wrapped to add its wall time and calls to the rule name."""
+        stats = self.rules.setdefault(name, [0.0, 0])
+        perf_counter = time.perf_counter
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stats[0] += perf_counter() - start
+                stats[1] += 1
+        return wrapper
+
+    def instrument(self, func, names=RULE_FUNCTIONS):
+        """
+        Return a copy of func whose calls to the global helpers in names are timed.
+
+        Only the copy sees the timed helpers, so other callers (and other
+        threads) keep calling the plain functions at no extra cost.
+        """
+        namespace = dict(func.__globals__)
+        for name in names:
+            if name in namespace:
+                namespace[name] = self.timed(name, namespace[name])
+        copy = types.FunctionType(func.__code__, namespace, func.__name__, func.__defaults__, func.__closure__)
+        copy.__kwdefaults__ = func.__kwdefaults__
+        return copy
+
+    def as_dict(self):
+        def section(entries):
+            return {name: {'seconds': round(seconds, 6), 'calls': calls} for name, (seconds, calls) in entries.items()}
+        result = {}
+        if self.timing:
+            result.update(phases=section(self.phases), rules=section(self.rules))
+        if self.memory is not None:
+            result['memory'] = {name: {'net_bytes': net, 'peak_bytes': peak, 'calls': calls}
+                                for name, (net, peak, calls) in self.memory.items()}
+        return result
+
+    def format_lines(self):
+        """Human-readable timing breakdown, slowest first."""
+        lines = []
+        for title, entries in (("Phase", self.phases), ("Rule", self.rules)):
+            for name, (seconds, calls) in sorted(entries.items(), key=lambda item: -item[1][0]):
+                lines.append(f"{title} {name}: {seconds * 1000:.1f} ms ({calls:,} calls)")
+        return lines
+
+    def format_memory_lines(self):
+        """Human-readable memory breakdown in phase order."""
+        return [f"{name}: peak {_format_mebibytes(peak)}, net {_format_mebibytes(net, signed=True)}"
+                for name, (net, peak, _calls) in (self.memory or {}).items()]
+
+
+def _format_mebibytes(size, signed=False):
+    return f"{size / (1024 * 1024):{'+' if signed else ''}.1f} MB"
+
+
+def phase(profiler, name):
+    """profiler.phase(name), or a no-op context when profiler is None."""
+    if profiler is None:
+        return _NOT_PROFILED
+    return profiler.phase(name)
+
+
+def lap(profiler, name):
+    """profiler.lap(name), or nothing when profiler is None."""
+    if profiler is not None:
+        profiler.lap(name)
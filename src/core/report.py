@@ -0,0 +1,229 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+import io
+import os
+import csv
+import gzip
+import json
+from src.core.error_codes import error_details
+from src.core.validator import ERROR_CATEGORY_TIMESTAMP
+
+DETAILS_RULE = "=" * 80
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_COLUMNS = ["row", "column", "code", "message"]
+
+
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+def generate_unique_log_filename(logs_directory, original_name, extension=".txt"):
+    """Reserve a log file name for the file original_name, named after it without its extension."""
+    return reserve_log_filename(logs_directory, os.path.splitext(original_name)[0], extension)
+
+
+def reserve_log_filename(logs_directory, base_name, extension=".txt"):
+    """Reserve <base_name><extension> by creating it exclusively, so concurrent workers never share one; base_name is used as given."""
+    log_filename = f"{base_name}{extension}"
+    counter = 1
+
+    while True:
+        try:
+            os.close(os.open(os.path.join(logs_directory, log_filename), os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return log_filename
+        except FileExistsError:
+            log_filename = f"{base_name}_{counter}{extension}"
+            counter += 1
+
+
+def log_base_name(log_filename):
+    """Name of a log without its .txt or .txt.gz extension, used to name the files belonging to it."""
+    for extension in (".txt.gz", ".txt"):
+        if log_filename.endswith(extension):
+            return log_filename[:-len(extension)]
+    return os.path.splitext(log_filename)[0]
+
+
+def open_report_file(path, compress_level=None, newline=None, mode='w'):
+    """Open a report file for writing text, through a gzip stream when compress_level (1-9) is set."""
+    if compress_level is None:
+        return open(path, mode, encoding='utf-8', newline=newline, buffering=WRITE_BUFFER_SIZE)
+    compressor = gzip.GzipFile(path, mode + 'b', compresslevel=compress_level)
+    return io.TextIOWrapper(io.BufferedWriter(compressor, WRITE_BUFFER_SIZE), encoding='utf-8', newline=newline)
+
+
+def format_details_header(filename):
+    return DETAILS_RULE + "\n" + f"DETAILED VALIDATION ERRORS FOR: {filename}\n" + DETAILS_RULE + "\n\n"
+
+
+def format_details_entry(number, error):
+    """Format one entry of the details report; error is a row error dict or a plain message."""
+    if not isinstance(error, dict):
+        return f"#{number}. {error}\n" + "-" * 50 + "\n\n"
+
+    kind = "TIMESTAMP" if error.get("category") == ERROR_CATEGORY_TIMESTAMP else "VALIDATION"
+    parts = [f"#{number}. ROW {error['row']} {kind} ERRORS\n", "-" * 50 + "\n"]
+    for index, individual_error in enumerate(error["message"].split("; "), 1):
+        parts.append(f"   {index}. {individual_error}\n")
+    if error.get("row_data") is not None:
+        parts.append(f"\n   Row Data: {error['row_data']}\n")
+    parts.append("\n" + DETAILS_RULE + "\n\n")
+    return "".join(parts)
+
+
+class ReportOptions:
+    """
+    How error reports are written.
+
+    export_formats adds machine-readable exports (see ErrorExport); compress_level
+    (1-9) gzips logs, details reports and exports, adding a .gz suffix.
+    points_totals writes the per-user totals of points files (see UserTotals).
+    """
+
+    def __init__(self, export_formats=(), compress_level=None, points_totals=False):
+        unknown = set(export_formats) - set(EXPORT_FORMATS)
+        if unknown:
+            raise ValueError(f"Unknown export format(s): {', '.join(sorted(unknown))}. Expected: {', '.join(EXPORT_FORMATS)}")
+        if compress_level is not None and not 1 <= compress_level <= 9:
+            raise ValueError(f"Compression level must be between 1 and 9, got {compress_level}")
+        self.export_formats = tuple(export_formats)
+        self.compress_level = compress_level
+        self.points_totals = points_totals
+
+    @property
+    def suffix(self):
+        return ".gz" if self.compress_level is not None else ""
+
+
+class ErrorExport:
+    """
+    Writes one record per error message to <log>_errors.ndjson and/or <log>_errors.csv.
+
+    Each record carries the row number, the column (empty for row-level errors),
+    a stable error code and the message, so tooling can ingest the errors without
+    parsing the text report. Files are written through large buffers.
+    """
+
+    def __init__(self, logs_directory, base_name, formats, timestamp_column=None, compress_level=None):
+        self.timestamp_column = timestamp_column
+        self.filenames = []
+        self._ndjson = None
+        self._csv_file = None
+        self._csv = None
+        suffix = ".gz" if compress_level is not None else ""
+        if "ndjson" in formats:
+            self.filenames.append(f"{base_name}_errors.ndjson{suffix}")
+            self._ndjson = open_report_file(os.path.join(logs_directory, self.filenames[-1]), compress_level)
+        if "csv" in formats:
+            self.filenames.append(f"{base_name}_errors.csv{suffix}")
+            self._csv_file = open_report_file(os.path.join(logs_directory, self.filenames[-1]), compress_level, newline='')
+            self._csv = csv.writer(self._csv_file)
+            self._csv.writerow(EXPORT_COLUMNS)
+
+    def add(self, row, message):
+        """Export a row's "; "-joined error message, one record per individual error."""
+        for code, column, individual_error in error_details(message, self.timestamp_column):
+            if self._ndjson is not None:
+                self._ndjson.write(json.dumps({"row": row, "column": column, "code": code, "message": individual_error},
+                                              ensure_ascii=False) + "\n")
+            if self._csv is not None:
+                self._csv.writerow([row, column or "", code, individual_error])
+
+    def close(self):
+        for file in (self._ndjson, self._csv_file):
+            if file is not None:
+                file.close()
+        self._ndjson = self._csv_file = self._csv = None
+
+
+class DetailsReport:
+    """
+    Streams the <log>_details.txt report while a file is being validated.
+
+    Failing rows are written as they are found, so none are held in memory.
+    The log and details file names are reserved when the first error arrives,
+    so files without errors leave nothing behind. Errors also go to the
+    exports selected in options.
+    """
+
+    def __init__(self, logs_directory, original_filename, filename_for_log, options=None, timestamp_column=None):
+        self.logs_directory = logs_directory
+        self.original_filename = original_filename
+        self.filename_for_log = filename_for_log
+        self.options = options or ReportOptions()
+        self.timestamp_column = timestamp_column
+        self.export = None
+        self.log_filename = None
+        self.details_filename = None
+        self.entries = 0
+        self._file = None
+
+    def _open(self):
+        extension = ".txt" + self.options.suffix
+        self.log_filename = generate_unique_log_filename(self.logs_directory, self.original_filename, extension)
+        base_name = log_base_name(self.log_filename)
+        self.details_filename = reserve_log_filename(self.logs_directory, f"{base_name}_details", extension)
+        self._file = open_report_file(os.path.join(self.logs_directory, self.details_filename), self.options.compress_level)
+        self._file.write(format_details_header(self.filename_for_log))
+        if self.options.export_formats:
+            self.export = ErrorExport(self.logs_directory, base_name, self.options.export_formats,
+                                      self.timestamp_column, self.options.compress_level)
+
+    def add(self, error):
+        """Write a row error dict ({"row", "message", "row_data", "category"}) to the report."""
+        if self._file is None:
+            self._open()
+        number = self.entries + 1
+        self._file.write(format_details_entry(number, error))
+        self.entries = number
+        if self.export is not None:
+            self.export.add(error["row"], error["message"])
+
+    def close(self):
+        """Close the details report and exports."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self.export is not None:
+            self.export.close()
+
+    def abandon(self):
+        """
+        Close the report of a validation that stopped partway.
+
+        The rows written so far are kept; reserved files that received none are
+        removed, including the log, whose summary is only written once validation
+        completes.
+        """
+        try:
+            self.close()
+        finally:
+            unused = [self.log_filename]
+            if not self.entries:
+                unused.append(self.details_filename)
+                if self.export is not None:
+                    unused.extend(self.export.filenames)
+            self._remove(unused)
+            self.log_filename = None
+
+    def _remove(self, filenames):
+        for filename in filenames:
+            if filename:
+                try:
+                    os.remove(os.path.join(self.logs_directory, filename))
+                except OSError:
+                    pass
+
+    def discard(self):
+        """Close the report and remove the files it reserved, e.g. when validation is restarted."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        export_filenames = []
+        if self.export is not None:
+            self.export.close()
+            export_filenames = self.export.filenames
+            self.export = None
+        self._remove([self.details_filename, self.log_filename] + export_filenames)
+        self.log_filename = self.details_filename = None
+        self.entries = 0
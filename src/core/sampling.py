@@ -0,0 +1,82 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+import collections
+import os
+import sys
+import threading
+
+DEFAULT_INTERVAL_SECONDS = 0.005
+PROFILE_EXTENSION = "_profile.folded"
+
+
+def _frame_label(code):
+    # ';' separates frames in the collapsed format and ' ' precedes the count
+    name = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    return name.replace(';', ':')
+
+
+class SamplingProfiler:
+    """
+    Samples the call stack of one thread at a fixed interval.
+
+    A background thread reads the target thread's current frame every
+    interval seconds and counts identical stacks. With delay set, sampling
+    only starts once the target has been running that long, so fast runs
+    leave no samples and cost nothing but a sleeping thread. write() saves
+    the stacks in the collapsed format read by flamegraph.pl, speedscope and
+    similar tools: "outer;inner;innermost <samples>" per line.
+    """
+
+    def __init__(self, thread_id=None, interval=DEFAULT_INTERVAL_SECONDS, delay=0.0):
+        self.thread_id = threading.get_ident() if thread_id is None else thread_id
+        self.interval = interval
+        self.delay = delay
+        self.stacks = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def sample_count(self):
+        return sum(self.stacks.values())
+
+    def _run(self):
+        if self.delay and self._stop.wait(self.delay):
+            return
+        labels = {}
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                return
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = _frame_label(code)
+                stack.append(label)
+                frame = frame.f_back
+            del frame
+            self.stacks[';'.join(reversed(stack))] += 1
+
+    def write(self, path):
+        """Write the collapsed stacks, most sampled first."""
+        with open(path, 'w', encoding='utf-8') as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f"{stack} {count}\n")
@@ -0,0 +1,100 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+import os
+
+CHUNK_BUFFER_BYTES = 1024 * 1024
+
+
+class SplitOptions:
+    """
+    How validated files are split into chunks.
+
+    Chunks go to directory and hold at most max_rows data rows and/or at most
+    max_bytes bytes (UTF-8, header included); at least one limit is required.
+    """
+
+    def __init__(self, directory, max_rows=None, max_bytes=None):
+        if max_rows is None and max_bytes is None:
+            raise ValueError("A row or size limit is required to split files")
+        if max_rows is not None and max_rows < 1:
+            raise ValueError(f"Rows per chunk must be at least 1, got {max_rows}")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError(f"Chunk size must be at least 1 byte, got {max_bytes}")
+        self.directory = directory
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+
+    def writer(self, name, header):
+        """A ChunkWriter for the file name with the given header record."""
+        return ChunkWriter(self.directory, os.path.basename(name), header, self.max_rows, self.max_bytes)
+
+
+class ChunkWriter:
+    """
+    Writes the records of one CSV to numbered chunks as they are validated.
+
+    Each chunk, <name>_part0001.csv and so on, starts with the header and
+    takes records until the next one would exceed max_rows or max_bytes; a
+    record larger than max_bytes on its own still gets a chunk of its own.
+    Records are written exactly as they appeared in the source, quoting and
+    line breaks inside quoted fields included, with "\n" line endings and
+    UTF-8 encoding. Only the chunk being filled is open, through a buffered
+    file, so memory use does not depend on the size of the source.
+    """
+
+    def __init__(self, directory, name, header, max_rows=None, max_bytes=None):
+        self.directory = directory
+        self.base_name = os.path.splitext(name)[0] or "chunk"
+        self.header = header.rstrip('\n') + '\n'
+        self._header_bytes = _encoded_size(self.header)
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.paths = []
+        self._file = None
+        self._rows = 0
+        self._bytes = 0
+
+    def _start_chunk(self):
+        if self._file is not None:
+            self._file.close()
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{self.base_name}_part{len(self.paths) + 1:04d}.csv")
+        self._file = open(path, 'w', encoding='utf-8', newline='', buffering=CHUNK_BUFFER_BYTES)
+        self._file.write(self.header)
+        self.paths.append(path)
+        self._rows = 0
+        self._bytes = self._header_bytes
+
+    def write(self, text):
+        """Add one record, given as its text without the final newline."""
+        record = text + '\n'
+        size = _encoded_size(record)
+        if (self._file is None
+                or (self.max_rows is not None and self._rows >= self.max_rows)
+                or (self.max_bytes is not None and self._rows and self._bytes + size > self.max_bytes)):
+            self._start_chunk()
+        self._file.write(record)
+        self._rows += 1
+        self._bytes += size
+
+    def close(self):
+        """Finish the last chunk and return the paths of all chunks."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        return self.paths
+
+    def discard(self):
+        """Close and remove the chunks written so far, e.g. when the source turned out to be unreadable."""
+        self.close()
+        for path in self.paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self.paths = []
+
+
+def _encoded_size(text):
+    return len(text) if text.isascii() else len(text.encode('utf-8'))
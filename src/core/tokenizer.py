@@ -0,0 +1,168 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+import csv
+import gc
+import itertools
+
+BATCH_LINES = 1024
+
+# Characters only the csv module handles: quotes, and carriage returns it rejects in unquoted fields
+_NEEDS_CSV = ('"', '\r')
+
+
+class _BlockLines:
+    """
+    Iterates the lines of block from position onwards, then those of the following blocks.
+
+    With lines set to a list, the lines returned are also appended to it.
+    """
+
+    def __init__(self, block, position, blocks, lines=None):
+        self.block = block
+        self.position = position
+        self.blocks = blocks
+        self.lines = lines
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while self.position >= len(self.block):
+            self.block = next(self.blocks)
+            self.position = 0
+        end = self.block.find('\n', self.position) + 1 or len(self.block)
+        line = self.block[self.position:end]
+        self.position = end
+        if self.lines is not None:
+            self.lines.append(line)
+        return line
+
+
+def _split_plain(block, delimiter, field_size_limit, rows, texts=None):
+    """Split quote-free lines on the delimiter, raising the csv module's error for oversized fields."""
+    lines = block.split('\n')
+    if lines[-1] == '':
+        # The block ends with a newline; there is no line after it
+        lines.pop()
+    if texts is not None:
+        texts.extend(lines)
+    if len(block) > field_size_limit and max(map(len, lines)) > field_size_limit:
+        for line in lines:
+            row = line.split(delimiter) if line else []
+            if any(len(field) > field_size_limit for field in row):
+                raise csv.Error(f"field larger than field limit ({field_size_limit})")
+            rows.append(row)
+        return
+    rows.extend([line.split(delimiter) if line else [] for line in lines])
+
+
+def _block_rows(block, delimiter, blocks, rows, texts=None):
+    """
+    Append the rows of block to rows.
+
+    block must end at a line boundary. A quoted field may continue into the
+    following blocks; those are then taken from blocks and tokenized as far
+    as the csv module read into them, up to the end of the block it stopped in.
+    With texts set to a list, the text of each row's record (its line or
+    lines, without the final newline) is appended to it as well.
+    """
+    field_size_limit = csv.field_size_limit()
+    position = 0
+    # Next occurrence of each special character; str.find is much faster than a regex search
+    next_special = {char: block.find(char) for char in _NEEDS_CSV}
+    while position < len(block):
+        for char, index in next_special.items():
+            if 0 <= index < position:
+                next_special[char] = block.find(char, position)
+        found = [index for index in next_special.values() if index >= 0]
+        if not found:
+            _split_plain(block[position:] if position else block, delimiter, field_size_limit, rows, texts)
+            return
+        line_start = max(position, block.rfind('\n', position, min(found)) + 1)
+        if line_start > position:
+            _split_plain(block[position:line_start], delimiter, field_size_limit, rows, texts)
+
+        # csv.reader pulls any continuation lines itself and stops at the end of the record
+        source = _BlockLines(block, line_start, blocks, [] if texts is not None else None)
+        rows.append(next(csv.reader(source, delimiter=delimiter, quotechar='"')))
+        if texts is not None:
+            text = ''.join(source.lines)
+            texts.append(text[:-1] if text.endswith('\n') else text)
+        if source.block is not block:
+            block = source.block
+            next_special = {char: block.find(char, source.position) for char in _NEEDS_CSV}
+        position = source.position
+
+
+def _iter_rows(blocks, delimiter):
+    for block in blocks:
+        rows = []
+        try:
+            _block_rows(block, delimiter, blocks, rows)
+        except csv.Error:
+            # Rows before the bad one are still produced, as csv.reader would
+            yield from rows
+            raise
+        yield from rows
+
+
+def _iter_records(blocks, delimiter):
+    for block in blocks:
+        rows = []
+        texts = []
+        try:
+            _block_rows(block, delimiter, blocks, rows, texts)
+        except csv.Error:
+            yield from zip(rows, texts)
+            raise
+        yield from zip(rows, texts)
+
+
+def split_csv_text(text, delimiter=','):
+    """
+    Return the rows csv.reader would produce for text, faster.
+
+    text must be newline-translated, as read from a file opened in text mode
+    or io.StringIO(text, newline=None). Runs of lines without quote characters
+    are split on the delimiter directly; each line with a quote (together with
+    the following lines of a field spanning several) is parsed by the csv module.
+    """
+    rows = []
+    # Rows are lists of strings and cannot form reference cycles; pausing the cyclic
+    # collector avoids traversing the growing result over and over
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        _block_rows(text, delimiter, iter(()), rows)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return rows
+
+
+def iter_csv_rows(lines, delimiter=','):
+    """Yield the rows csv.reader(lines) would yield, tokenizing BATCH_LINES lines at a time like split_csv_text()."""
+    lines = iter(lines)
+    return _iter_rows(iter(lambda: ''.join(itertools.islice(lines, BATCH_LINES)), ''), delimiter)
+
+
+def iter_block_rows(blocks, delimiter=','):
+    """
+    Yield the rows of consecutive text blocks, each ending at a line boundary.
+
+    The blocks together must be newline-translated CSV text; a quoted field
+    may span blocks. Rows are the same as split_csv_text(''.join(blocks)).
+    """
+    return _iter_rows(iter(blocks), delimiter)
+
+
+def iter_block_records(blocks, delimiter=','):
+    """
+    Yield (row, text) for the rows of iter_block_rows(blocks), where text is the row's record as written.
+
+    text keeps the record's quoting and any line breaks inside quoted fields,
+    but not the newline ending it, so records can be copied to another CSV
+    unchanged.
+    """
+    return _iter_records(iter(blocks), delimiter)
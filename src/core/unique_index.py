@@ -0,0 +1,137 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+import tempfile
+from array import array
+
+_EMPTY = 0
+_MASK64 = (1 << 64) - 1
+_MAX_LOAD = 0.7
+# Row numbers and source numbers are packed into one 64-bit location
+_ROW_BITS = 40
+_ROW_MASK = (1 << _ROW_BITS) - 1
+# Set on a location once its row has been reported as the first of a duplicate group
+_REPORTED = 1 << 63
+# Values are written to the temporary file in chunks of about this size
+_BUFFER_SIZE = 1 << 20
+
+
+class UniqueValueIndex:
+    """
+    Finds repeated values of a column across the rows of one or more files.
+
+    The table keeps three 64-bit words per value: its fingerprint (the
+    process's str hash), the source and row where it was first seen, and the
+    offset of the value in a temporary file. The values themselves are spilled
+    to that file and read back only when a fingerprint matches, to confirm the
+    duplicate exactly, so memory stays at 24 bytes per table slot however
+    long the values are: with the table kept 35-70% full (see _MAX_LOAD),
+    about 34 to 69 bytes per distinct value. A fingerprint collision is never
+    reported as a duplicate. One index may be shared by the validators of
+    several files (see source()).
+    """
+
+    def __init__(self, expected=0):
+        capacity = 1024
+        while capacity * _MAX_LOAD < expected:
+            capacity *= 2
+        self._allocate(capacity)
+        self._count = 0
+        self._sources = []
+        # (source, row, column, value, repeating source, repeating row) for first occurrences
+        # in an earlier source, recorded by the validators that share this index
+        self.earlier_duplicates = []
+        self._values = tempfile.TemporaryFile()
+        # Values not yet written to the file, starting at offset _written
+        self._buffer = bytearray()
+        self._written = 0
+
+    def _allocate(self, capacity):
+        self._fingerprints = array('Q', bytes(8 * capacity))
+        self._locations = array('Q', bytes(8 * capacity))
+        self._offsets = array('Q', bytes(8 * capacity))
+        self._mask = capacity - 1
+
+    def __len__(self):
+        return self._count
+
+    def source(self, name):
+        """Register a file whose rows are checked next and return its number for check()."""
+        self._sources.append(name)
+        return len(self._sources) - 1
+
+    def source_name(self, source):
+        return self._sources[source] if source < len(self._sources) else None
+
+    def _stored_value(self, offset):
+        if offset >= self._written:
+            start = offset - self._written
+            size = int.from_bytes(self._buffer[start:start + 4], 'little')
+            return bytes(self._buffer[start + 4:start + 4 + size])
+        self._values.seek(offset)
+        size = int.from_bytes(self._values.read(4), 'little')
+        return self._values.read(size)
+
+    def _store_value(self, encoded):
+        buffer = self._buffer
+        offset = self._written + len(buffer)
+        buffer += len(encoded).to_bytes(4, 'little')
+        buffer += encoded
+        if len(buffer) >= _BUFFER_SIZE:
+            self._values.seek(self._written)
+            self._values.write(buffer)
+            self._written += len(buffer)
+            buffer.clear()
+        return offset
+
+    def check(self, value, row, source=0):
+        """
+        Record value as seen in row of source.
+
+        Returns None the first time value is seen, otherwise (source, row, first)
+        for its first occurrence, where first is True only for the first duplicate
+        found, so callers can report the first occurrence once.
+        """
+        fingerprint = (hash(value) & _MASK64) or 1
+        fingerprints = self._fingerprints
+        mask = self._mask
+        slot = fingerprint & mask
+        encoded = value.encode('utf-8')
+        while True:
+            stored = fingerprints[slot]
+            if stored == _EMPTY:
+                break
+            if stored == fingerprint and self._stored_value(self._offsets[slot]) == encoded:
+                location = self._locations[slot]
+                first = not location & _REPORTED
+                if first:
+                    self._locations[slot] = location | _REPORTED
+                location &= ~_REPORTED
+                return location >> _ROW_BITS, location & _ROW_MASK, first
+            slot = (slot + 1) & mask
+
+        fingerprints[slot] = fingerprint
+        self._locations[slot] = (source << _ROW_BITS) | row
+        self._offsets[slot] = self._store_value(encoded)
+        self._count += 1
+        if self._count > len(fingerprints) * _MAX_LOAD:
+            self._grow()
+        return None
+
+    def _grow(self):
+        old = self._fingerprints, self._locations, self._offsets
+        self._allocate(2 * len(old[0]))
+        mask = self._mask
+        for fingerprint, location, offset in zip(*old):
+            if fingerprint != _EMPTY:
+                slot = fingerprint & mask
+                while self._fingerprints[slot] != _EMPTY:
+                    slot = (slot + 1) & mask
+                self._fingerprints[slot] = fingerprint
+                self._locations[slot] = location
+                self._offsets[slot] = offset
+
+    def close(self):
+        """Remove the temporary file of values."""
+        self._buffer.clear()
+        self._values.close()
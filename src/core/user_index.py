@@ -0,0 +1,266 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+import bisect
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+_EMPTY = 0
+_MASK64 = (1 << 64) - 1
+# Grow when more than this share of the slots is used, keeping probe chains short
+_MAX_LOAD = 0.7
+
+
+def _fingerprint(user_id):
+    # str hashes are 64-bit and stable within a process; 0 marks an empty slot
+    return (hash(user_id) & _MASK64) or 1
+
+
+def stable_fingerprint(user_id):
+    """64-bit fingerprint of user_id that is the same in every process, for indexes kept on disk."""
+    digest = hashlib.blake2b(user_id.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') or 1
+
+
+class UserIdIndex:
+    """
+    Set of userIds stored as 64-bit fingerprints in one flat hash table.
+
+    Each userId costs 8 bytes per slot at 50-70% occupancy (about 13 bytes on
+    average), a tenth of a Python set of strings, so tens of millions of
+    contacts fit in a few hundred MB. Lookups probe a few slots of an
+    array('Q') and take constant time. Fingerprints are not exact: an unknown
+    userId is taken for a known one with a probability of about
+    len(index) / 2**64, i.e. never in practice. Fingerprints come from the
+    process's str hash, so an index is only valid in the process that built it,
+    unless fingerprint is replaced, e.g. with stable_fingerprint().
+    """
+
+    def __init__(self, expected=0, fingerprint=_fingerprint):
+        self.fingerprint = fingerprint
+        capacity = 1024
+        while capacity * _MAX_LOAD < expected:
+            capacity *= 2
+        self._slots = array('Q', bytes(8 * capacity))
+        self._mask = capacity - 1
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def nbytes(self):
+        """Memory held by the table."""
+        return self._slots.itemsize * len(self._slots)
+
+    def _find(self, fingerprint):
+        # Linear probing: the slot holding fingerprint, or the empty slot where it belongs
+        slots = self._slots
+        mask = self._mask
+        slot = fingerprint & mask
+        while True:
+            value = slots[slot]
+            if value == fingerprint or value == _EMPTY:
+                return slot
+            slot = (slot + 1) & mask
+
+    def add(self, user_id):
+        """Add user_id; returns False when it (or a userId with the same fingerprint) was already present."""
+        return self.add_fingerprint(self.fingerprint(user_id))
+
+    def add_fingerprint(self, fingerprint):
+        slot = self._find(fingerprint)
+        if self._slots[slot] != _EMPTY:
+            return False
+        self._slots[slot] = fingerprint
+        self._count += 1
+        if self._count > len(self._slots) * _MAX_LOAD:
+            self._grow()
+        return True
+
+    def __contains__(self, user_id):
+        return self.contains_fingerprint(self.fingerprint(user_id))
+
+    def contains_fingerprint(self, fingerprint):
+        return self._slots[self._find(fingerprint)] == fingerprint
+
+    def fingerprints(self):
+        """The stored fingerprints, in table order."""
+        return (fingerprint for fingerprint in self._slots if fingerprint != _EMPTY)
+
+    def update(self, other):
+        """Add the userIds of other, an index built with the same fingerprint function."""
+        for fingerprint in other.fingerprints():
+            self.add_fingerprint(fingerprint)
+
+    def _grow(self):
+        old_slots = self._slots
+        self._slots = array('Q', bytes(16 * len(old_slots)))
+        self._mask = len(self._slots) - 1
+        for fingerprint in old_slots:
+            if fingerprint != _EMPTY:
+                self._slots[self._find(fingerprint)] = fingerprint
+
+
+class UserIdFile:
+    """
+    userId index kept in a file and memory-mapped, so later runs load it instantly.
+
+    The file starts with an 8-byte magic followed by runs, each an 8-byte
+    count and that many fixed-width 8-byte stable_fingerprint() values in
+    ascending order (little-endian). Lookups binary-search each run through a
+    memoryview of the mapping, so opening an index of tens of millions of
+    userIds reads nothing but the run headers. add() collects new userIds in
+    memory until flush() (or close()) appends them as one more sorted run:
+    appending never rewrites existing data, and compact() merges the runs
+    when many small appends have accumulated. A run cut short by a crash is
+    ignored and overwritten by the next append.
+    """
+
+    MAGIC = b"UIDX\x01\x00\x00\x00"
+    _COUNT = struct.Struct('<Q')
+    # For UserIdIndex(fingerprint=...) indexes whose userIds are later added with update()
+    fingerprint = staticmethod(stable_fingerprint)
+
+    def __init__(self, path):
+        self.path = path
+        if not os.path.exists(path):
+            with open(path, 'wb') as file:
+                file.write(self.MAGIC)
+        self._pending = UserIdIndex(fingerprint=stable_fingerprint)
+        self._file = None
+        self._map = None
+        self._runs = []
+        self._open()
+
+    def _open(self):
+        self._file = open(self.path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        if size < len(self.MAGIC) or self._file.read(len(self.MAGIC)) != self.MAGIC:
+            self._file.close()
+            raise ValueError(f"{self.path} is not a userId index")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        offset = len(self.MAGIC)
+        while offset + self._COUNT.size <= size:
+            count, = self._COUNT.unpack_from(self._map, offset)
+            end = offset + self._COUNT.size + 8 * count
+            if end > size:
+                break
+            run = view[offset + self._COUNT.size:end]
+            if sys.byteorder == 'little':
+                run = run.cast('Q')
+            else:
+                run = array('Q', run)
+                run.byteswap()
+            self._runs.append(run)
+            offset = end
+        # Where the next run goes; anything after it is a run cut short
+        self._valid_size = offset
+        view.release()
+
+    def _close_map(self):
+        for run in self._runs:
+            if isinstance(run, memoryview):
+                run.release()
+        self._runs = []
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __len__(self):
+        return sum(len(run) for run in self._runs) + len(self._pending)
+
+    @property
+    def runs(self):
+        return len(self._runs)
+
+    def _stored(self, fingerprint):
+        for run in self._runs:
+            position = bisect.bisect_left(run, fingerprint)
+            if position < len(run) and run[position] == fingerprint:
+                return True
+        return False
+
+    def __contains__(self, user_id):
+        fingerprint = stable_fingerprint(user_id)
+        return self._stored(fingerprint) or self._pending.contains_fingerprint(fingerprint)
+
+    def add(self, user_id):
+        """Add user_id (written by the next flush()); returns False when it is already indexed."""
+        fingerprint = stable_fingerprint(user_id)
+        if self._stored(fingerprint):
+            return False
+        return self._pending.add_fingerprint(fingerprint)
+
+    def update(self, other):
+        """Add the userIds of other, a UserIdIndex built with stable_fingerprint (see fingerprint)."""
+        for fingerprint in other.fingerprints():
+            if not self._stored(fingerprint):
+                self._pending.add_fingerprint(fingerprint)
+
+    def flush(self):
+        """Append the userIds added since the last flush as a new sorted run."""
+        if not len(self._pending):
+            return
+        self._append_run(self._pending.fingerprints(), len(self._pending))
+        self._pending = UserIdIndex(fingerprint=stable_fingerprint)
+
+    def compact(self):
+        """Merge all runs (and pending userIds) into one, rewriting the file through a temporary copy."""
+        self.flush()
+        if len(self._runs) < 2:
+            return
+        fingerprints = (fingerprint for run in self._runs for fingerprint in run)
+        count = sum(len(run) for run in self._runs)
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, 'wb') as file:
+            file.write(self.MAGIC)
+            _write_sorted_run(file, fingerprints, count)
+        self._close_map()
+        os.replace(temporary_path, self.path)
+        self._open()
+
+    def _append_run(self, fingerprints, count):
+        valid_size = self._valid_size
+        self._close_map()
+        with open(self.path, 'r+b') as file:
+            file.truncate(valid_size)
+            file.seek(valid_size)
+            _write_sorted_run(file, fingerprints, count)
+        self._open()
+
+    def close(self):
+        self.flush()
+        self._close_map()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _write_sorted_run(file, fingerprints, count):
+    """
+    Write count fingerprints as one run in ascending order.
+
+    They are partitioned by their top byte and each of the 256 partitions is
+    sorted on its own, so at most one partition is held as Python ints.
+    """
+    partitions = [array('Q') for _ in range(256)]
+    for fingerprint in fingerprints:
+        partitions[fingerprint >> 56].append(fingerprint)
+    file.write(UserIdFile._COUNT.pack(count))
+    for partition in partitions:
+        run = array('Q', sorted(partition))
+        if sys.byteorder != 'little':
+            run.byteswap()
+        file.write(run.tobytes())
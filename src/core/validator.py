@@ -1,12 +1,22 @@
 # SPDX-FileCopyrightText: 2024 SAP Engagement Cloud
 # SPDX-License-Identifier: MIT
 
-import csv
 import os
 import time
+import types
+from src.core.error_codes import ErrorMessage, join_errors
 from src.core.logger import Logger
+from src.core.profiling import phase
+from src.core.tokenizer import split_csv_text
+
+# Category of a failing row: only timestamp errors, or at least one other error
+ERROR_CATEGORY_TIMESTAMP = "timestamp"
+ERROR_CATEGORY_DATA = "data"
 
 class Validator:
+    # Column that bare "Timestamp (...)" messages refer to, for structured error exports
+    timestamp_column = None
+
     def __init__(self, csv_path, log_path, expected_columns, delimiter=','):
         self.csv_path = csv_path
         self.delimiter = delimiter
@@ -19,19 +29,33 @@ class Validator:
         self._processed_rows = 0
         self._start_time = None
         self._last_progress_update = 0
-        # Error details storage
+        self.row_count = 0
+        # One entry per failing row, tagged with its category; with a report attached
+        # (see src.core.report.DetailsReport) entries are streamed to it instead and only counted
         self.validation_error_details = []
-        self.timestamp_error_details = []
+        self.validation_error_count = 0
+        self.timestamp_error_count = 0
+        self.report = None
+        self.profiler = None
+
+    def enable_profiling(self, profiler):
+        """Time validate()'s phases and each call of _validate_row() and its rule helpers with profiler."""
+        self.profiler = profiler
+        if not profiler.timing:
+            return
+        validate_row = profiler.timed('_validate_row', profiler.instrument(type(self)._validate_row))
+        self._validate_row = types.MethodType(validate_row, self)
 
     def _load_csv(self):
         if hasattr(self, '_cleaned_content') and self._cleaned_content is not None:
-            reader = csv.reader(self._cleaned_content.splitlines(), delimiter=self.delimiter, quotechar='"')
-            content = [row for row in reader if any(row)]
+            text = self._cleaned_content
+            if '\r' in text:
+                # Same line handling as reading the file in text mode
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
         else:
             with open(self.csv_path, 'r', encoding='utf-8-sig') as file:
-                reader = csv.reader(file, delimiter=self.delimiter, quotechar='"')
-                content = [row for row in reader if any(row)]
-        return content
+                text = file.read()
+        return [row for row in split_csv_text(text, self.delimiter) if any(row)]
 
     def _update_progress(self, current_row):
         """Update progress display for large files."""
@@ -71,73 +95,115 @@ class Validator:
     def format_error_string(error_dict):
         return f"Error: {error_dict['message']} -> Row {error_dict['row']}: {error_dict['row_data']}"
 
-    def validate(self):
-        # Initialize progress tracking
+    def start_validation(self):
+        """Reset per-run state before rows are fed through validate_record()."""
         if self._enable_progress_tracking:
             self._start_time = time.time()
             print(f"    Starting validation of {self._total_rows:,} rows...")
 
-        content = self._load_csv()
-        headers = content[0]
+        self._has_errors = False
+        self._error_count = 0
+        self.row_count = 0
 
-        has_errors = False
-        timestamp_error_rows = []
-        error_count = 0
+    def validate_record(self, idx, row):
+        """Validate one data row; idx is its row number counting the header as row 1."""
+        self.row_count += 1
 
-        # Memory-efficient error handling - write errors incrementally for large files
-        use_streaming_errors = self._enable_progress_tracking and self._total_rows > 10000
+        # Update progress for large files
+        if self._enable_progress_tracking:
+            self._update_progress(idx)
 
-        for idx, row in enumerate(content[1:], start=2):
-            # Update progress for large files
-            if self._enable_progress_tracking:
-                self._update_progress(idx)
+        validation_result = self._validate_row(row)
 
-            validation_result = self._validate_row(row)
+        if len(validation_result) == 3:
+            is_valid, row_errors, timestamp_errors = validation_result
+        else:
+            is_valid, row_errors = validation_result
+            timestamp_errors = []
 
-            if len(validation_result) == 3:
-                is_valid, row_errors, timestamp_errors = validation_result
-                if timestamp_errors:
-                    timestamp_error_rows.append((idx, row, timestamp_errors))
-            else:
-                is_valid, row_errors = validation_result
+        if is_valid and not timestamp_errors:
+            return
 
-            if not is_valid:
-                has_errors = True
-                error_count += 1
+        # Each failing row is recorded once; its message already lists its timestamp errors
+        if not row_errors:
+            row_errors = join_errors(timestamp_errors)
+        if timestamp_errors and set(row_errors.split("; ")) <= set(timestamp_errors):
+            category = ERROR_CATEGORY_TIMESTAMP
+        else:
+            category = ERROR_CATEGORY_DATA
 
-                error_dict = {"row": idx, "message": row_errors, "row_data": row}
-                self.validation_error_details.append(error_dict)
-                if self.error_logger:
-                    self.error_logger.log(Validator.format_error_string(error_dict))
+        self.record_error(idx, row_errors, row, category)
 
-                # Limit memory usage by flushing every 100 errors on large files
-                if use_streaming_errors and error_count % 100 == 0 and self.error_logger:
-                    self.error_logger.flush_if_possible()
+    def record_error(self, idx, message, row_data=None, category=ERROR_CATEGORY_DATA, new_row=True):
+        """
+        Record a failing row; validate_record() calls it, rule checks spanning rows may add more.
 
+        With new_row False the entry is reported but not counted as another failing row, e.g. a
+        note on an earlier row that may already have been recorded.
+        """
+        if new_row:
+            if category == ERROR_CATEGORY_TIMESTAMP:
+                self.timestamp_error_count += 1
+            else:
+                self.validation_error_count += 1
+            self._error_count += 1
+        self._has_errors = True
+        error_dict = {"row": idx, "message": message, "row_data": row_data, "category": category}
+        if self.report is not None:
+            self.report.add(error_dict)
+        else:
+            self.validation_error_details.append(error_dict)
+        if self.error_logger:
+            # Queued for the logger's writer thread, so disk I/O does not stall validation
+            self.error_logger.log(Validator.format_error_string(error_dict))
+
+    def finish_validation(self):
+        """Complete a run started with start_validation() and return whether every row was valid."""
         # Complete progress tracking
         if self._enable_progress_tracking:
             print(f"\r    Validation complete: {self._processed_rows:,} rows processed in {time.time() - self._start_time:.1f}s")
 
-        # Handle timestamp errors
-        if timestamp_error_rows:
-            self._timestamp_error_count = len(timestamp_error_rows)
-            for idx, row, timestamp_errors in timestamp_error_rows:
-                for error in timestamp_errors:
-                    ts_error_dict = {"row": idx, "message": error, "row_data": row}
-                    self.timestamp_error_details.append(ts_error_dict)
-                    if self.error_logger:
-                        self.error_logger.log(Validator.format_error_string(ts_error_dict))
-
-        if has_errors:
+        try:
+            if self.report is not None:
+                self.report.close()
+        finally:
+            if self.error_logger:
+                self.error_logger.close()
+
+        if self._has_errors:
             if self._enable_progress_tracking:
-                print(f"     Found {error_count:,} validation errors")
+                print(f"     Found {self._error_count:,} validation errors")
             return False
 
         return True
+
+    def abort_validation(self):
+        """Close the report and logger of a run that raised before finish_validation() (see DetailsReport.abandon())."""
+        try:
+            if self.report is not None:
+                self.report.abandon()
+        finally:
+            if self.error_logger:
+                self.error_logger.close()
+
+    def validate(self):
+        with phase(self.profiler, "parse"):
+            content = self._load_csv()
+        headers = content[0]
+
+        with phase(self.profiler, "validation"):
+            self.start_validation()
+            try:
+                for idx, row in enumerate(content[1:], start=2):
+                    self.validate_record(idx, row)
+            except BaseException:
+                self.abort_validation()
+                raise
+            return self.finish_validation()
     
 
 
     def _validate_row(self, values: list[str]) -> tuple[bool, str]:
         if len(values) != len(self.expected_columns):
-            return False, f"Row should have {len(self.expected_columns)} columns"
+            return False, ErrorMessage(f"Row should have {len(self.expected_columns)} columns", "column_count")
         return True, ""
@@ -3,47 +3,81 @@
 
 import time
 from src.utils.time_utils import _is_past_timestamp, _is_unix_millisecond_timestamp, _has_decimal_separators, _needs_csv_quoting
+from src.core.error_codes import ErrorMessage, join_errors
 from src.core.validator import Validator
+from src.points.user_totals import UserTotals
 
 class PointsValidator(Validator):
     points_columns = ["userId", "pointsToSpend", "statusPoints", "cashback", "allocatedAt", "expireAt", "setPlanExpiration", "reason", "title", "description"]
+    timestamp_column = 'expireAt'
 
     def __init__(self, csv_path, log_path, expected_columns=points_columns, delimiter=','):
         super().__init__(csv_path=csv_path, log_path=log_path, expected_columns=expected_columns, delimiter=delimiter)
+        # Valid rows are summed per user into user_totals when one is assigned before start_validation()
+        # (e.g. shared by several files); with totals_path set a UserTotals is created and written there
+        # by finish_validation()
+        self.user_totals = None
+        self.totals_path = None
+        self._owns_user_totals = False
+
+    def start_validation(self):
+        super().start_validation()
+        if self.user_totals is None and self.totals_path:
+            self.user_totals = UserTotals()
+            self._owns_user_totals = True
+
+    def validate_record(self, idx, row):
+        error_count = self._error_count
+        super().validate_record(idx, row)
+        if self.user_totals is not None and self._error_count == error_count:
+            self.user_totals.add(row[0], row[1], row[2], row[3])
+
+    def finish_validation(self):
+        if self._owns_user_totals:
+            try:
+                self.user_totals.write(self.totals_path)
+            except BaseException:
+                self.abort_validation()
+                raise
+            finally:
+                self.user_totals.close()
+                self.user_totals = None
+                self._owns_user_totals = False
+        return super().finish_validation()
 
     def _validate_row(self, values):
         errors = []
         if len(values) != len(self.expected_columns):
             if len(values) > len(self.expected_columns):
-                errors.append(f"Row has {len(values)} columns but should have {len(self.expected_columns)}. This often indicates unquoted commas in text fields. Fields containing commas must be enclosed in double quotes.")
+                errors.append(ErrorMessage(f"Row has {len(values)} columns but should have {len(self.expected_columns)}. This often indicates unquoted commas in text fields. Fields containing commas must be enclosed in double quotes.", "too_many_columns"))
             else:
-                errors.append(f"Row should have {len(self.expected_columns)} columns")
+                errors.append(ErrorMessage(f"Row should have {len(self.expected_columns)} columns", "column_count"))
 
         points_to_spend, status_points, cashback = values[1], values[2], values[3]
 
         if points_to_spend:
             has_decimal, decimal_message = _has_decimal_separators(points_to_spend)
             if has_decimal:
-                errors.append(f"Column 'pointsToSpend': {decimal_message}")
+                errors.append(decimal_message.in_column('pointsToSpend', prefix=True))
             elif not points_to_spend.isdigit():
-                errors.append("Column 'pointsToSpend' should be an integer.")
+                errors.append(ErrorMessage("Column 'pointsToSpend' should be an integer.", "not_integer", "pointsToSpend"))
         
         if status_points:
             has_decimal, decimal_message = _has_decimal_separators(status_points)
             if has_decimal:
-                errors.append(f"Column 'statusPoints': {decimal_message}")
+                errors.append(decimal_message.in_column('statusPoints', prefix=True))
             elif not status_points.isdigit():
-                errors.append("Column 'statusPoints' should be an integer.")
+                errors.append(ErrorMessage("Column 'statusPoints' should be an integer.", "not_integer", "statusPoints"))
         
         if cashback:
             has_decimal, decimal_message = _has_decimal_separators(cashback)
             if has_decimal:
-                errors.append(f"Column 'cashback': {decimal_message}")
+                errors.append(decimal_message.in_column('cashback', prefix=True))
             else:
                 try:
                     float(cashback)
                 except ValueError:
-                    errors.append("Column 'cashback' should be a float.")
+                    errors.append(ErrorMessage("Column 'cashback' should be a float.", "not_float", "cashback"))
 
         if not errors:
             valid_pts = (points_to_spend.isdigit() and int(points_to_spend) > 0)
@@ -54,27 +88,27 @@ class PointsValidator(Validator):
                 valid_cashback = False
 
             if not (valid_pts or valid_status or valid_cashback):
-                errors.append("At least one of 'pointsToSpend', 'statusPoints', or 'cashback' must have a valid positive value.")
+                errors.append(ErrorMessage("At least one of 'pointsToSpend', 'statusPoints', or 'cashback' must have a valid positive value.", "no_positive_value"))
             
             if (points_to_spend and int(points_to_spend) < 0) or (status_points and int(status_points) < 0) or (valid_cashback and float(cashback) < 0):
-                errors.append("Negative values are not allowed.")
+                errors.append(ErrorMessage("Negative values are not allowed.", "negative_value"))
         
         for i, field_name in enumerate(['reason', 'title', 'description']):
             field_index = 7 + i
             if field_index < len(values) and values[field_index]:
                 needs_quoting, quoting_message = _needs_csv_quoting(values[field_index])
                 if needs_quoting:
-                    errors.append(f"Column '{field_name}': {quoting_message}")
+                    errors.append(quoting_message.in_column(field_name, prefix=True))
 
         if len(values) > 4 and values[4]:
-            errors.append("Column 'allocatedAt' must be empty")
+            errors.append(ErrorMessage("Column 'allocatedAt' must be empty", "must_be_empty", "allocatedAt"))
 
         if len(values) > 9 and values[9] and (len(values) <= 8 or not values[8]):  
-            errors.append("Column 'description' requires 'title' to be set")
+            errors.append(ErrorMessage("Column 'description' requires 'title' to be set", "missing_dependency", "description"))
 
         if len(values) > 6 and values[6].lower() == "true":
             if len(values) > 5 and values[5]:
-                errors.append("If setPlanExpiration is TRUE, expireAt should be empty")
+                errors.append(ErrorMessage("If setPlanExpiration is TRUE, expireAt should be empty", "must_be_empty", "expireAt"))
         elif len(values) > 6 and values[6].lower() == "false":
             if len(values) > 5:
                 try:
@@ -83,18 +117,18 @@ class PointsValidator(Validator):
                     if not valid:
                         if "appears to be in seconds instead of milliseconds" in message:
                             timestamp_errors = getattr(self, '_temp_timestamp_errors', [])
-                            timestamp_errors.append(message)
+                            timestamp_errors.append(message.in_column(self.timestamp_column))
                             self._temp_timestamp_errors = timestamp_errors
                         else:
-                            errors.append(message)
+                            errors.append(message.in_column(self.timestamp_column))
                     else:
                         past, message = _is_past_timestamp(expiration)
                         if past:
-                            errors.append("expireAt should be a future UNIX timestamp in milliseconds when setPlanExpiration is FALSE")
+                            errors.append(ErrorMessage("expireAt should be a future UNIX timestamp in milliseconds when setPlanExpiration is FALSE", "timestamp_not_future", "expireAt"))
                 except ValueError:
-                    errors.append("expireAt should be an integer (UNIX timestamp in milliseconds) when setPlanExpiration is FALSE")
+                    errors.append(ErrorMessage("expireAt should be an integer (UNIX timestamp in milliseconds) when setPlanExpiration is FALSE", "not_integer", "expireAt"))
         elif len(values) > 6:
-            errors.append("setPlanExpiration should be either TRUE or FALSE")
+            errors.append(ErrorMessage("setPlanExpiration should be either TRUE or FALSE", "invalid_value", "setPlanExpiration"))
 
         timestamp_errors = getattr(self, '_temp_timestamp_errors', [])
         if hasattr(self, '_temp_timestamp_errors'):
@@ -102,6 +136,6 @@ class PointsValidator(Validator):
         
         all_errors = errors
         if all_errors or timestamp_errors:
-            return False, "; ".join(all_errors + timestamp_errors), timestamp_errors
+            return False, join_errors(all_errors + timestamp_errors), timestamp_errors
         
         return True, "", []
\ No newline at end of file
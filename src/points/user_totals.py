@@ -0,0 +1,147 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+import csv
+import heapq
+import tempfile
+from decimal import Decimal
+from operator import itemgetter
+
+TOTALS_COLUMNS = ["userId", "pointsToSpend", "statusPoints", "cashback", "rows"]
+TOTALS_EXTENSION = "_totals.csv"
+# Users summed in memory before the partial sums are spilled to a sorted run on disk
+DEFAULT_MAX_USERS = 200_000
+# Spilled runs kept open at once; beyond that they are merged into one
+MAX_RUNS = 64
+
+
+def _merge_runs(runs):
+    """Merge runs of (userId, totals) sorted by userId, summing the totals of each user."""
+    user_id = None
+    totals = None
+    for key, values in heapq.merge(*runs, key=itemgetter(0)):
+        if key != user_id:
+            if user_id is not None:
+                yield user_id, totals
+            user_id, totals = key, list(values)
+        else:
+            for position, value in enumerate(values):
+                totals[position] += value
+    if user_id is not None:
+        yield user_id, totals
+
+
+def _format_amount(amount):
+    return str(amount) if isinstance(amount, int) else format(amount, 'f')
+
+
+def _parse_amount(text):
+    try:
+        return int(text)
+    except ValueError:
+        return Decimal(text)
+
+
+def _read_run(file):
+    file.seek(0)
+    for user_id, points, status, cashback, rows in csv.reader(file):
+        yield user_id, [int(points), int(status), _parse_amount(cashback), int(rows)]
+
+
+def _write_rows(file, totals):
+    writer = csv.writer(file, lineterminator='\n')
+    users = 0
+    for user_id, (points, status, cashback, rows) in totals:
+        writer.writerow((user_id, points, status, _format_amount(cashback), rows))
+        users += 1
+    return users
+
+
+class UserTotals:
+    """
+    Per-user totals of pointsToSpend, statusPoints and cashback, grouped while rows stream by.
+
+    Totals are summed in a dict until it holds max_users users; the partial
+    sums are then written to a temporary file as a run sorted by userId and
+    the dict starts over, so memory stays bounded however many users there
+    are. write() merges the runs and the users still in memory in one
+    sequential pass, adding up each user's partial sums. Cashback is summed
+    as int, or as Decimal once a value is not a whole number, so totals are
+    exact.
+    """
+
+    def __init__(self, max_users=DEFAULT_MAX_USERS):
+        self.max_users = max_users
+        self._runs = []
+        self.spills = 0
+        self._clear()
+
+    def _clear(self):
+        # userId -> slot in flat lists of totals rather than a list per user: millions of
+        # small lists would make every garbage collection pass walk them all
+        self._slots = {}
+        self._points = []
+        self._status = []
+        self._cashback = []
+        self._rows = []
+
+    def add(self, user_id, points_to_spend, status_points, cashback):
+        """Add one points row; the amounts are the row's (possibly empty) column values."""
+        slot = self._slots.get(user_id)
+        if slot is None:
+            if len(self._slots) >= self.max_users:
+                self._spill()
+            slot = self._slots[user_id] = len(self._rows)
+            self._points.append(0)
+            self._status.append(0)
+            self._cashback.append(0)
+            self._rows.append(0)
+        self._rows[slot] += 1
+        if points_to_spend:
+            self._points[slot] += int(points_to_spend)
+        if status_points:
+            self._status[slot] += int(status_points)
+        if cashback:
+            try:
+                self._cashback[slot] += int(cashback)
+            except ValueError:
+                self._cashback[slot] += Decimal(cashback)
+
+    def _in_memory(self):
+        """The totals held in memory, sorted by userId."""
+        return ((user_id, [self._points[slot], self._status[slot], self._cashback[slot], self._rows[slot]])
+                for user_id, slot in sorted(self._slots.items()))
+
+    def _spill(self):
+        run = tempfile.TemporaryFile('w+', encoding='utf-8', newline='')
+        _write_rows(run, self._in_memory())
+        self._clear()
+        self._runs.append(run)
+        self.spills += 1
+        if len(self._runs) >= MAX_RUNS:
+            merged = tempfile.TemporaryFile('w+', encoding='utf-8', newline='')
+            _write_rows(merged, _merge_runs([_read_run(run) for run in self._runs]))
+            self._close_runs()
+            self._runs = [merged]
+
+    def __iter__(self):
+        """(userId, [pointsToSpend, statusPoints, cashback, rows]) per user, in userId order."""
+        runs = [_read_run(run) for run in self._runs]
+        runs.append(self._in_memory())
+        return _merge_runs(runs)
+
+    def write(self, path):
+        """Write the summary CSV (see TOTALS_COLUMNS) and return the number of users."""
+        with open(path, 'w', encoding='utf-8', newline='') as file:
+            file.write(",".join(TOTALS_COLUMNS) + "\n")
+            return _write_rows(file, self)
+
+    def _close_runs(self):
+        for run in self._runs:
+            run.close()
+        self._runs = []
+
+    def close(self):
+        """Remove the spilled runs."""
+        self._close_runs()
+        self._clear()
@@ -1,12 +1,24 @@
 # SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
 # SPDX-License-Identifier: MIT
 
+import codecs
 import csv
+import io
+from src.contacts.contacts_csv_validator import ContactsValidator
+from src.points.points_csv_validator import PointsValidator
+from src.vouchers.voucher_csv_validator import VoucherValidator
 
 CONTACTS_HEADERS = ["userId", "shouldJoin", "joinDate", "tierName", "tierEntryAt", "tierCalcAt", "shouldReward"]
 POINTS_HEADERS = ["userId", "pointsToSpend", "statusPoints", "cashback", "allocatedAt", "expireAt", "setPlanExpiration", "reason", "title", "description"]
 VOUCHERS_HEADERS = ["userId", "externalId", "voucherType", "voucherName", "iconName", "code", "expiration"]
 
+# Header columns -> (type name, validator class, expected columns)
+CSV_TYPES = {
+    tuple(CONTACTS_HEADERS): ("Contacts", ContactsValidator, CONTACTS_HEADERS),
+    tuple(POINTS_HEADERS): ("Points", PointsValidator, POINTS_HEADERS),
+    tuple(VOUCHERS_HEADERS): ("Vouchers", VoucherValidator, VOUCHERS_HEADERS),
+}
+
 
 def detect_encoding(raw_bytes):
     try:
@@ -16,31 +28,114 @@ def detect_encoding(raw_bytes):
         return 'ISO-8859-1'
 
 
+class FallbackDecoder:
+    """
+    Incremental decoder that reads UTF-8 and switches to ISO-8859-1 once.
+
+    Bytes are fed in chunks through decode(). At the first invalid UTF-8
+    sequence the valid prefix is kept as UTF-8, the rest of the stream is
+    decoded as ISO-8859-1 and fallback_offset records the byte offset of the
+    switch. No byte is decoded twice except within the chunk that failed.
+    """
+
+    def __init__(self):
+        self.encoding = 'utf-8'
+        self.fallback_offset = None
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._consumed = 0
+
+    def decode(self, data, final=False):
+        if self.fallback_offset is not None:
+            return bytes(data).decode('ISO-8859-1')
+        pending = self._decoder.getstate()[0]
+        try:
+            text = self._decoder.decode(data, final)
+        except UnicodeDecodeError as error:
+            buffered = pending + bytes(data)
+            self.fallback_offset = self._consumed - len(pending) + error.start
+            self.encoding = 'ISO-8859-1'
+            return buffered[:error.start].decode('utf-8') + buffered[error.start:].decode('ISO-8859-1')
+        self._consumed += len(data)
+        return text
+
+
+def decode_bytes(raw_bytes, chunk_size=1024 * 1024):
+    """
+    Decode an in-memory file in one pass with FallbackDecoder.
+
+    Returns (text, encoding, fallback_offset); encoding is 'utf-8' or
+    'ISO-8859-1' and fallback_offset is None unless the codec was switched.
+    """
+    decoder = FallbackDecoder()
+    view = memoryview(raw_bytes)
+    parts = [decoder.decode(view[start:start + chunk_size]) for start in range(0, len(view), chunk_size)]
+    parts.append(decoder.decode(b'', final=True))
+    return ''.join(parts), decoder.encoding, decoder.fallback_offset
+
+
+def read_text_file(file_path, chunk_size=1024 * 1024):
+    """
+    Read and decode a file in one pass with FallbackDecoder.
+
+    Newlines are translated as for a file opened in text mode. Returns
+    (text, encoding, fallback_offset) like decode_bytes().
+    """
+    decoder = FallbackDecoder()
+    newlines = io.IncrementalNewlineDecoder(decoder, translate=True)
+    parts = []
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            parts.append(newlines.decode(chunk))
+    parts.append(newlines.decode(b'', final=True))
+    return ''.join(parts), decoder.encoding, decoder.fallback_offset
+
+
 def strip_bom(content):
     if content.startswith('﻿'):
         return content[1:]
     return content
 
 
-def detect_csv_type(content_str):
-    from src.contacts.contacts_csv_validator import ContactsValidator
-    from src.points.points_csv_validator import PointsValidator
-    from src.vouchers.voucher_csv_validator import VoucherValidator
+def read_header_line(source):
+    """
+    Return the first line of a CSV source without reading the rest.
+
+    source may be decoded text, a bytes prefix of the file, or a text or binary
+    stream positioned at the start of the file. Line breaks are those of
+    str.splitlines(), as when the whole content is split. A leading UTF-8
+    BOM is dropped, as when the file is read as utf-8-sig.
+    """
+    if hasattr(source, 'readline'):
+        source = source.readline()
+    if isinstance(source, (bytes, bytearray)):
+        end = source.find(b'\n')
+        first = bytes(source if end < 0 else source[:end])
+        source = first.decode(detect_encoding(first))
+
+    # Split a growing prefix so a long file is never split as a whole
+    size = 4096
+    while True:
+        lines = source[:size].splitlines()
+        if len(lines) > 1 or size >= len(source):
+            return strip_bom(lines[0]) if lines else ''
+        size *= 4
+
 
-    _type_map = {
-        tuple(CONTACTS_HEADERS): ("Contacts", ContactsValidator, CONTACTS_HEADERS),
-        tuple(POINTS_HEADERS): ("Points", PointsValidator, POINTS_HEADERS),
-        tuple(VOUCHERS_HEADERS): ("Vouchers", VoucherValidator, VOUCHERS_HEADERS),
-    }
+def detect_csv_type(source):
+    """
+    Identify the CSV type from its header record.
 
-    content_lines = content_str.splitlines()
+    source is anything read_header_line() accepts; only the first line is read.
+    Returns (csv_type, validator_class, expected_cols, delimiter), with
+    ("Unknown", None, [], ',') when the header matches no known type.
+    """
+    header_line = read_header_line(source)
     for delimiter in (',', ';'):
-        reader = csv.DictReader(content_lines, delimiter=delimiter)
-        headers = reader.fieldnames
+        headers = next(csv.reader([header_line], delimiter=delimiter), None)
         if headers:
-            key = tuple(headers)
-            if key in _type_map:
-                csv_type, validator_class, expected_cols = _type_map[key]
+            match = CSV_TYPES.get(tuple(headers))
+            if match is not None:
+                csv_type, validator_class, expected_cols = match
                 return csv_type, validator_class, expected_cols, delimiter
 
     return "Unknown", None, [], ','
@@ -3,6 +3,7 @@
 
 import time
 from datetime import datetime, timezone
+from src.core.error_codes import ErrorMessage
 
 # Use timezone-aware datetime to avoid Windows epoch issues
 FROM_DATE = datetime(1970, 1, 2, tzinfo=timezone.utc).timestamp() * 1000
@@ -14,7 +15,7 @@ def _is_unix_millisecond_timestamp(timestamp):
     Rejects all other Unix time formats (seconds, microseconds, nanoseconds, etc.)
     """
     if timestamp < 0:
-        return False, "Timestamp ({}) cannot be a negative value. Unix timestamps must be positive milliseconds (13 digits).".format(timestamp)
+        return False, ErrorMessage("Timestamp ({}) cannot be a negative value. Unix timestamps must be positive milliseconds (13 digits).".format(timestamp), "timestamp_format")
     
     try:
         timestamp_int = int(timestamp)
@@ -25,44 +26,44 @@ def _is_unix_millisecond_timestamp(timestamp):
         
         if 1 <= timestamp_int <= 999999999:
             if digit_count <= 6:
-                return False, "Timestamp ({}) appears to be in minutes/hours format ({} digits). Unix timestamps must be in milliseconds (13 digits, e.g., {}).".format(timestamp_int, digit_count, current_time_millis)
+                return False, ErrorMessage("Timestamp ({}) appears to be in minutes/hours format ({} digits). Unix timestamps must be in milliseconds (13 digits, e.g., {}).".format(timestamp_int, digit_count, current_time_millis), "timestamp_format")
             elif digit_count <= 9:
-                return False, "Timestamp ({}) appears to be in days or other small unit format ({} digits). Unix timestamps must be in milliseconds (13 digits, e.g., {}).".format(timestamp_int, digit_count, current_time_millis)
+                return False, ErrorMessage("Timestamp ({}) appears to be in days or other small unit format ({} digits). Unix timestamps must be in milliseconds (13 digits, e.g., {}).".format(timestamp_int, digit_count, current_time_millis), "timestamp_format")
         
         elif 1000000000 <= timestamp_int <= 99999999999:
-            return False, "Timestamp ({}) appears to be in seconds format ({} digits). Unix timestamps must be in milliseconds (13 digits, e.g., {}).".format(timestamp_int, digit_count, current_time_millis)
+            return False, ErrorMessage("Timestamp ({}) appears to be in seconds format ({} digits). Unix timestamps must be in milliseconds (13 digits, e.g., {}).".format(timestamp_int, digit_count, current_time_millis), "timestamp_seconds")
         
         elif 100000000000 <= timestamp_int <= 999999999999:
-            return False, "Timestamp ({}) is close but appears to be truncated milliseconds ({} digits). Unix timestamps must be exactly 13 digits in milliseconds (e.g., {}).".format(timestamp_int, digit_count, current_time_millis)
+            return False, ErrorMessage("Timestamp ({}) is close but appears to be truncated milliseconds ({} digits). Unix timestamps must be exactly 13 digits in milliseconds (e.g., {}).".format(timestamp_int, digit_count, current_time_millis), "timestamp_format")
         
         elif 1000000000000 <= timestamp_int <= 9999999999999:
             if FROM_DATE <= timestamp_int <= TILL_DATE:
                 return True, "Timestamp is a valid Unix millisecond timestamp.".format()
             else:
-                return False, "Timestamp ({}) is in milliseconds format but outside valid date range (1970-2100). Valid range: {} to {}.".format(timestamp_int, int(FROM_DATE), int(TILL_DATE))
+                return False, ErrorMessage("Timestamp ({}) is in milliseconds format but outside valid date range (1970-2100). Valid range: {} to {}.".format(timestamp_int, int(FROM_DATE), int(TILL_DATE)), "timestamp_format")
         
         elif 10000000000000 <= timestamp_int <= 999999999999999:
-            return False, "Timestamp ({}) appears to have extra precision or be in microseconds format ({} digits). Unix timestamps must be exactly 13 digits in milliseconds (e.g., {}).".format(timestamp_int, digit_count, current_time_millis)
+            return False, ErrorMessage("Timestamp ({}) appears to have extra precision or be in microseconds format ({} digits). Unix timestamps must be exactly 13 digits in milliseconds (e.g., {}).".format(timestamp_int, digit_count, current_time_millis), "timestamp_format")
         
         elif timestamp_int >= 1000000000000000:
             if digit_count == 16:
-                return False, "Timestamp ({}) appears to be in microseconds format ({} digits). Unix timestamps must be in milliseconds (13 digits, e.g., {}).".format(timestamp_int, digit_count, current_time_millis)
+                return False, ErrorMessage("Timestamp ({}) appears to be in microseconds format ({} digits). Unix timestamps must be in milliseconds (13 digits, e.g., {}).".format(timestamp_int, digit_count, current_time_millis), "timestamp_format")
             elif digit_count >= 19:
-                return False, "Timestamp ({}) appears to be in nanoseconds format ({} digits). Unix timestamps must be in milliseconds (13 digits, e.g., {}).".format(timestamp_int, digit_count, current_time_millis)
+                return False, ErrorMessage("Timestamp ({}) appears to be in nanoseconds format ({} digits). Unix timestamps must be in milliseconds (13 digits, e.g., {}).".format(timestamp_int, digit_count, current_time_millis), "timestamp_format")
             else:
-                return False, "Timestamp ({}) appears to be in high-precision format ({} digits). Unix timestamps must be in milliseconds (13 digits, e.g., {}).".format(timestamp_int, digit_count, current_time_millis)
+                return False, ErrorMessage("Timestamp ({}) appears to be in high-precision format ({} digits). Unix timestamps must be in milliseconds (13 digits, e.g., {}).".format(timestamp_int, digit_count, current_time_millis), "timestamp_format")
         
         else:
-            return False, "Timestamp ({}) format not recognized. Unix timestamps must be in milliseconds (13 digits, e.g., {}).".format(timestamp_int, current_time_millis)
+            return False, ErrorMessage("Timestamp ({}) format not recognized. Unix timestamps must be in milliseconds (13 digits, e.g., {}).".format(timestamp_int, current_time_millis), "timestamp_format")
             
     except ValueError:
-        return False, "Timestamp ({}) is not a valid integer. Unix timestamps must be in milliseconds (13 digits).".format(timestamp)
+        return False, ErrorMessage("Timestamp ({}) is not a valid integer. Unix timestamps must be in milliseconds (13 digits).".format(timestamp), "timestamp_format")
     except Exception as e:
-        return False, "Timestamp ({}) validation failed: {}. Unix timestamps must be in milliseconds (13 digits).".format(timestamp, str(e))
+        return False, ErrorMessage("Timestamp ({}) validation failed: {}. Unix timestamps must be in milliseconds (13 digits).".format(timestamp, str(e)), "timestamp_format")
 
 def _is_past_timestamp(timestamp_millis):
     current_time_millis = int(time.time() * 1000)
-    return timestamp_millis < current_time_millis, "Timestamp ({}) is in the past. Current timestamp: {}".format(timestamp_millis, current_time_millis)
+    return timestamp_millis < current_time_millis, ErrorMessage("Timestamp ({}) is in the past. Current timestamp: {}".format(timestamp_millis, current_time_millis), "timestamp_in_past")
 
 def _has_decimal_separators(value):
     """Check if a value contains decimal separators (comma or period) which shouldn't be in integer fields."""
@@ -70,10 +71,10 @@ def _has_decimal_separators(value):
         return False, ""
     
     if ',' in value and value.count(',') == 1 and value.split(',')[1].isdigit():
-        return True, "Value contains comma as decimal separator. Integer fields should not have decimal values."
+        return True, ErrorMessage("Value contains comma as decimal separator. Integer fields should not have decimal values.", "decimal_separator")
     
     if '.' in value and value.count('.') == 1 and value.split('.')[1].isdigit():
-        return True, "Value contains decimal point. Integer fields should not have decimal values."
+        return True, ErrorMessage("Value contains decimal point. Integer fields should not have decimal values.", "decimal_separator")
     
     return False, ""
 
@@ -83,6 +84,6 @@ def _needs_csv_quoting(value):
         return False, ""
     
     if ',' in value:
-        return True, "Text contains commas and should be enclosed in double quotes for proper CSV formatting."
+        return True, ErrorMessage("Text contains commas and should be enclosed in double quotes for proper CSV formatting.", "unquoted_comma")
     
     return False, ""
@@ -1,45 +1,107 @@
 # SPDX-FileCopyrightText: 2024 SAP Engagement Cloud
 # SPDX-License-Identifier: MIT
 
+import os
 import time
 import csv
 from src.utils.time_utils import _is_past_timestamp, _is_unix_millisecond_timestamp, _has_decimal_separators, _needs_csv_quoting
+from src.core.error_codes import ErrorMessage, join_errors
+from src.core.unique_index import UniqueValueIndex
 from src.core.validator import Validator
 
 class VoucherValidator(Validator):
     voucher_columns = ['userId', 'externalId', 'voucherType', 'voucherName', 'iconName', 'code', 'expiration']
+    timestamp_column = 'expiration'
+    # Columns whose non-empty values must not repeat, with their position
+    unique_columns = {'externalId': 1, 'code': 5}
 
     def __init__(self, csv_path, log_path, expected_columns=voucher_columns, delimiter=','):
         super().__init__(csv_path=csv_path, log_path=log_path, expected_columns=expected_columns, delimiter=delimiter)
         self.default_icon = "basket-colors-1"
+        # Column -> UniqueValueIndex; assign indexes shared with other files before start_validation()
+        # to find duplicates across them. Without indexes (calling _validate_row() alone) nothing is checked.
+        self.unique_indexes = None
+        self._owns_unique_indexes = False
+        self._unique_sources = {}
+        self._row_number = None
+
+    def start_validation(self):
+        super().start_validation()
+        if self.unique_indexes is None:
+            self.unique_indexes = {column: UniqueValueIndex() for column in self.unique_columns}
+            self._owns_unique_indexes = True
+        self._unique_sources = {column: index.source(self.csv_path) for column, index in self.unique_indexes.items()}
+
+    def validate_record(self, idx, row):
+        self._row_number = idx
+        super().validate_record(idx, row)
+
+    def finish_validation(self):
+        if self._owns_unique_indexes:
+            for index in self.unique_indexes.values():
+                index.close()
+            self.unique_indexes = None
+            self._owns_unique_indexes = False
+        return super().finish_validation()
+
+    def _duplicate_errors(self, values):
+        """Errors for unique columns whose value was seen before; the first occurrence is recorded once too."""
+        errors = []
+        for column, position in self.unique_columns.items():
+            if len(values) <= position or not values[position]:
+                continue
+            value = values[position]
+            index = self.unique_indexes[column]
+            source = self._unique_sources[column]
+            seen = index.check(value, self._row_number, source)
+            if seen is None:
+                continue
+            first_source, first_row, first = seen
+            if first_source == source:
+                errors.append(ErrorMessage(f"Column '{column}' has a duplicate value: {value} (first in row {first_row})",
+                                           "duplicate_value", column))
+                if first:
+                    # The first row is reported once, but is not another failing row of its own
+                    self.record_error(first_row, ErrorMessage(f"Column '{column}' has a duplicate value: {value} "
+                                                              f"(repeated in row {self._row_number})",
+                                                              "duplicate_value", column), new_row=False)
+            else:
+                errors.append(ErrorMessage(f"Column '{column}' has a duplicate value: {value} "
+                                           f"(first in row {first_row} of {os.path.basename(index.source_name(first_source))})",
+                                           "duplicate_value", column))
+                if first:
+                    # That file's result is complete; the shared index keeps its row for the dataset summary
+                    index.earlier_duplicates.append(
+                        (first_source, first_row, column, value, source, self._row_number))
+        return errors
 
     def _validate_row(self, values):
         errors = []
         timestamp_errors = []
         if len(values) != len(self.expected_columns):
             if len(values) > len(self.expected_columns):
-                errors.append(f"Row has {len(values)} columns but should have {len(self.expected_columns)}. This often indicates unquoted commas in text fields. Fields containing commas must be enclosed in double quotes.")
+                errors.append(ErrorMessage(f"Row has {len(values)} columns but should have {len(self.expected_columns)}. This often indicates unquoted commas in text fields. Fields containing commas must be enclosed in double quotes.", "too_many_columns"))
             else:
-                errors.append(f"Row should have {len(self.expected_columns)} columns")
+                errors.append(ErrorMessage(f"Row should have {len(self.expected_columns)} columns", "column_count"))
 
         if len(values) > 1 and not values[0] and not values[1]:
-            errors.append("Column 'userId' and 'externalId' should not be empty at the same time")
+            errors.append(ErrorMessage("Column 'userId' and 'externalId' should not be empty at the same time", "missing_identifier", "userId"))
         if len(values) > 2 and values[2] not in ["one_time", "yearly"]:
-            errors.append("Column 'voucherType' should be either 'one_time' or 'yearly'")
+            errors.append(ErrorMessage("Column 'voucherType' should be either 'one_time' or 'yearly'", "invalid_value", "voucherType"))
         if len(values) > 3 and not values[3]:
-            errors.append("Column 'voucherName' should not be empty")
+            errors.append(ErrorMessage("Column 'voucherName' should not be empty", "empty_value", "voucherName"))
         elif len(values) > 3:
             needs_quoting, quoting_message = _needs_csv_quoting(values[3])
             if needs_quoting:
-                errors.append(f"Column 'voucherName': {quoting_message}")
+                errors.append(quoting_message.in_column('voucherName', prefix=True))
         if len(values) > 4 and not values[4]:
-            errors.append("Column 'iconName' should not be empty")
+            errors.append(ErrorMessage("Column 'iconName' should not be empty", "empty_value", "iconName"))
         if len(values) > 5 and not values[5]:
-            errors.append("Column 'code' should not be empty")
+            errors.append(ErrorMessage("Column 'code' should not be empty", "empty_value", "code"))
         if len(values) > 6:
             has_decimal, decimal_message = _has_decimal_separators(values[6])
             if has_decimal:
-                timestamp_errors.append(f"Column 'expiration': {decimal_message}")
+                timestamp_errors.append(decimal_message.in_column('expiration', prefix=True))
             else:
                 try:
                     expiration = int(values[6])
@@ -47,17 +109,20 @@ class VoucherValidator(Validator):
                     if not valid:
                         if "appears to be in seconds instead of milliseconds" in message:
                             timestamp_errors = getattr(self, '_temp_timestamp_errors', [])
-                            timestamp_errors.append(message)
+                            timestamp_errors.append(message.in_column(self.timestamp_column))
                             self._temp_timestamp_errors = timestamp_errors
                         else:
-                            errors.append(message)
+                            errors.append(message.in_column(self.timestamp_column))
                     else:
                         past, message = _is_past_timestamp(expiration)
                         if past:
-                            errors.append(message)
+                            errors.append(message.in_column(self.timestamp_column))
                 except ValueError:
-                    errors.append("Column 'expiration' should be an integer (UNIX timestamp in milliseconds)")
+                    errors.append(ErrorMessage("Column 'expiration' should be an integer (UNIX timestamp in milliseconds)", "not_integer", "expiration"))
         
+        if self.unique_indexes is not None:
+            errors.extend(self._duplicate_errors(values))
+
         temp_timestamp_errors = getattr(self, '_temp_timestamp_errors', [])
         if hasattr(self, '_temp_timestamp_errors'):
             delattr(self, '_temp_timestamp_errors')
@@ -65,6 +130,6 @@ class VoucherValidator(Validator):
         all_timestamp_errors = timestamp_errors + temp_timestamp_errors
         all_errors = errors + all_timestamp_errors
         if all_errors:
-            return False, "; ".join(all_errors), all_timestamp_errors
+            return False, join_errors(all_errors), all_timestamp_errors
         
         return True, "", []
\ No newline at end of file
@@ -0,0 +1,134 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+import signal
+import time
+from collections import deque
+
+
+class InFlightBudget:
+    """
+    Caps the files and bytes handed to workers but not yet finished.
+
+    A single file is always admitted when nothing is in flight, so a file larger
+    than max_bytes still gets processed, just on its own.
+    """
+
+    def __init__(self, max_files=None, max_bytes=None):
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.files = 0
+        self.bytes = 0
+
+    def can_admit(self, size_bytes):
+        if self.files == 0:
+            return True
+        if self.max_files is not None and self.files + 1 > self.max_files:
+            return False
+        if self.max_bytes is not None and self.bytes + size_bytes > self.max_bytes:
+            return False
+        return True
+
+    def admit(self, size_bytes):
+        self.files += 1
+        self.bytes += size_bytes
+
+    def release(self, size_bytes):
+        self.files = max(0, self.files - 1)
+        self.bytes = max(0, self.bytes - size_bytes)
+
+
+class ThroughputStats:
+    """
+    Counts finished files and reports throughput and latency percentiles per interval.
+
+    Percentiles cover the files finished in the interval, or the last window
+    of them when more finished.
+    """
+
+    def __init__(self, window=1000):
+        self.started_at = time.time()
+        self.total_files = 0
+        self.total_bytes = 0
+        self.total_rows = 0
+        self._interval_start = self.started_at
+        self._interval_files = 0
+        self._interval_bytes = 0
+        self._interval_rows = 0
+        self._latencies = deque(maxlen=window)
+
+    def record(self, size_bytes, rows, latency_seconds):
+        """Record a finished file; latency runs from queueing to the verdict."""
+        self.total_files += 1
+        self.total_bytes += size_bytes
+        self.total_rows += rows
+        self._interval_files += 1
+        self._interval_bytes += size_bytes
+        self._interval_rows += rows
+        self._latencies.append(latency_seconds)
+
+    @staticmethod
+    def _percentile(sorted_values, fraction):
+        if not sorted_values:
+            return 0.0
+        index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+        return sorted_values[index]
+
+    def snapshot(self, reset=True):
+        """Return the figures for the interval since the previous snapshot."""
+        now = time.time()
+        seconds = max(now - self._interval_start, 1e-9)
+        latencies = sorted(self._latencies)
+        figures = {
+            "interval_seconds": seconds,
+            "files": self._interval_files,
+            "files_per_second": self._interval_files / seconds,
+            "mb_per_second": self._interval_bytes / (1024 * 1024) / seconds,
+            "rows_per_second": self._interval_rows / seconds,
+            "latency_p50": self._percentile(latencies, 0.50),
+            "latency_p95": self._percentile(latencies, 0.95),
+            "total_files": self.total_files,
+            "total_rows": self.total_rows,
+        }
+        if reset:
+            self._interval_start = now
+            self._interval_files = 0
+            self._interval_bytes = 0
+            self._interval_rows = 0
+            self._latencies.clear()
+        return figures
+
+    @staticmethod
+    def format(figures, queued=0, in_flight=0, in_flight_bytes=0):
+        return (
+            f"files={figures['files']} ({figures['files_per_second']:.2f}/s) "
+            f"throughput={figures['mb_per_second']:.2f} MB/s {figures['rows_per_second']:,.0f} rows/s "
+            f"latency p50={figures['latency_p50']:.2f}s p95={figures['latency_p95']:.2f}s "
+            f"queued={queued} in_flight={in_flight} ({in_flight_bytes / (1024 * 1024):.1f} MB) "
+            f"total={figures['total_files']}"
+        )
+
+
+class ShutdownRequest:
+    """
+    Turns SIGTERM/SIGINT into a graceful-shutdown flag.
+
+    The first signal sets requested; a second one raises KeyboardInterrupt so an
+    operator can still force an immediate stop.
+    """
+
+    def __init__(self):
+        self.requested = False
+        self.signal_name = None
+
+    def install(self, signals=None):
+        if signals is None:
+            signals = [signal.SIGINT, signal.SIGTERM]
+        for signum in signals:
+            signal.signal(signum, self._handle)
+
+    def _handle(self, signum, _frame):
+        if self.requested:
+            raise KeyboardInterrupt
+        self.requested = True
+        self.signal_name = signal.Signals(signum).name
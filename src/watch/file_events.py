@@ -0,0 +1,260 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+import os
+import sys
+import time
+import select
+import struct
+
+EVENT_CREATED = "created"
+EVENT_MODIFIED = "modified"
+EVENT_CLOSED = "closed"
+EVENT_MOVED = "moved"
+
+# inotify(7) constants
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_Q_OVERFLOW = 0x00004000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def list_files(directory, subdirectories=False, exclude=()):
+    """
+    Return {name: (size, mtime_ns)} for the files in directory.
+
+    With subdirectories=True files one level down (tenant folders) are included
+    as "<folder>/<file>", skipping the folder names listed in exclude.
+    """
+    listing = {}
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        listing[entry.name] = (stat.st_size, stat.st_mtime_ns)
+                    elif subdirectories and entry.is_dir() and entry.name not in exclude:
+                        for name, signature in list_files(entry.path).items():
+                            listing[os.path.join(entry.name, name)] = signature
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return listing
+
+
+class PollingWatcher:
+    """Portable fallback that diffs directory snapshots at a fixed interval."""
+
+    backend = "polling"
+
+    def __init__(self, directory, interval=1.0, subdirectories=False, exclude=()):
+        self.directory = directory
+        self.interval = interval
+        self.subdirectories = subdirectories
+        self.exclude = set(exclude)
+        self._snapshot = self._scan()
+
+    def _scan(self):
+        return list_files(self.directory, self.subdirectories, self.exclude)
+
+    def poll(self, timeout=None):
+        """Return (name, event) pairs for files created or changed since the last poll."""
+        wait = self.interval if timeout is None else min(timeout, self.interval)
+        if wait > 0:
+            time.sleep(wait)
+        current = self._scan()
+        events = []
+        for name, signature in current.items():
+            previous = self._snapshot.get(name)
+            if previous is None:
+                events.append((name, EVENT_CREATED))
+            elif previous != signature:
+                events.append((name, EVENT_MODIFIED))
+        self._snapshot = current
+        return events
+
+    def close(self):
+        self._snapshot = {}
+
+
+class InotifyWatcher:
+    """Linux inotify backend reporting close-write and rename events as they happen."""
+
+    backend = "inotify"
+
+    def __init__(self, directory, subdirectories=False, exclude=()):
+        import ctypes
+        import ctypes.util
+
+        self.directory = directory
+        self.subdirectories = subdirectories
+        self.exclude = set(exclude)
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        # Watch descriptor -> name prefix ("" for the top directory, "<folder>" for tenant folders)
+        self._prefixes = {}
+        try:
+            self._add_watch("")
+            if subdirectories:
+                for entry in os.scandir(directory):
+                    if entry.is_dir() and entry.name not in self.exclude:
+                        self._add_watch(entry.name)
+        except OSError:
+            os.close(self._fd)
+            raise
+
+    def _add_watch(self, prefix):
+        import ctypes
+
+        path = os.path.join(self.directory, prefix) if prefix else self.directory
+        mask = _IN_CREATE | _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), path)
+        self._prefixes[wd] = prefix
+
+    def poll(self, timeout=None):
+        """Block until events arrive (or timeout seconds pass) and return (name, event) pairs."""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, name_len = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            raw_name = data[offset:offset + name_len].rstrip(b"\0")
+            offset += name_len
+
+            if mask & _IN_Q_OVERFLOW:
+                events.extend(self._rescan())
+                continue
+            prefix = self._prefixes.get(wd)
+            if prefix is None or not raw_name:
+                continue
+
+            name = os.fsdecode(raw_name)
+            if mask & _IN_ISDIR:
+                if (self.subdirectories and not prefix and name not in self.exclude
+                        and mask & (_IN_CREATE | _IN_MOVED_TO)):
+                    events.extend(self._watch_new_folder(name))
+                continue
+
+            if prefix:
+                name = os.path.join(prefix, name)
+            if mask & _IN_CLOSE_WRITE:
+                events.append((name, EVENT_CLOSED))
+            elif mask & _IN_MOVED_TO:
+                events.append((name, EVENT_MOVED))
+            elif mask & _IN_CREATE:
+                events.append((name, EVENT_CREATED))
+            elif mask & _IN_MODIFY:
+                events.append((name, EVENT_MODIFIED))
+        return events
+
+    def _watch_new_folder(self, folder):
+        """Start watching a new tenant folder and report the files it already holds."""
+        try:
+            self._add_watch(folder)
+        except OSError:
+            return []
+        return [(os.path.join(folder, name), EVENT_MODIFIED)
+                for name in list_files(os.path.join(self.directory, folder))]
+
+    def _rescan(self):
+        """The kernel queue overflowed, so report every file present as modified."""
+        return [(name, EVENT_MODIFIED)
+                for name in list_files(self.directory, self.subdirectories, self.exclude)]
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watcher(directory, poll_interval=1.0, subdirectories=False, exclude=()):
+    """Return the best available watcher for this platform, falling back to polling."""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(directory, subdirectories=subdirectories, exclude=exclude)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(directory, interval=poll_interval, subdirectories=subdirectories, exclude=exclude)
+
+
+class ReadinessTracker:
+    """
+    Tracks per-file transfer state without blocking.
+
+    A file becomes ready as soon as its writer closes it (or it is renamed into
+    place), or once its size has stayed unchanged for stable_seconds.
+    """
+
+    def __init__(self, directory, stable_seconds=2.0):
+        self.directory = directory
+        self.stable_seconds = stable_seconds
+        self._pending = {}
+
+    def __contains__(self, name):
+        return name in self._pending
+
+    def __len__(self):
+        return len(self._pending)
+
+    def observe(self, name, event, now=None):
+        """Record an event for name. Returns True the first time a file is seen."""
+        now = time.monotonic() if now is None else now
+        is_new = name not in self._pending
+        state = self._pending.setdefault(name, {"size": -1, "changed_at": now, "closed": False})
+        if event in (EVENT_CLOSED, EVENT_MOVED):
+            state["closed"] = True
+        else:
+            state["closed"] = False
+            state["changed_at"] = now
+        return is_new
+
+    def pop_ready(self, now=None):
+        """Return names that are ready for processing and stop tracking them."""
+        now = time.monotonic() if now is None else now
+        ready = []
+        for name, state in list(self._pending.items()):
+            try:
+                size = os.path.getsize(os.path.join(self.directory, name))
+            except OSError:
+                del self._pending[name]
+                continue
+
+            if size != state["size"]:
+                state["size"] = size
+                if not state["closed"]:
+                    state["changed_at"] = now
+                    continue
+
+            if state["closed"] or now - state["changed_at"] >= self.stable_seconds:
+                del self._pending[name]
+                ready.append(name)
+        return ready
+
+    def next_timeout(self, now=None):
+        """Seconds until the next stability check is due, or None when nothing is pending."""
+        if not self._pending:
+            return None
+        now = time.monotonic() if now is None else now
+        due = min(state["changed_at"] + self.stable_seconds for state in self._pending.values())
+        return max(0.05, min(self.stable_seconds, due - now))
@@ -0,0 +1,115 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+import contextlib
+import io
+import os
+import queue
+import threading
+from src.utils.file_utils import FallbackDecoder
+from src.watch.tail import UTF8_BOM
+
+DEFAULT_BATCH_BYTES = 1024 * 1024
+DEFAULT_QUEUE_DEPTH = 4
+
+_END = object()
+
+
+class PipelineReader:
+    """
+    Reads and decodes a complete file on a background thread.
+
+    The reader stage reads batch_bytes at a time, decodes them with
+    FallbackDecoder, translates newlines as text mode does and puts the
+    complete lines as one text block on a queue of at most queue_depth
+    blocks. Iterating over the reader (the consumer stage) yields those
+    blocks, ready for tokenizer.iter_block_rows(), while the next ones are
+    being read. has_bom, fallback_offset and position describe the data read
+    so far. Errors in the reader stage are raised from the iteration.
+
+    path may also be a binary stream such as sys.stdin.buffer; it is read
+    from its current position and left open.
+    """
+
+    def __init__(self, path, batch_bytes=DEFAULT_BATCH_BYTES, queue_depth=DEFAULT_QUEUE_DEPTH):
+        if batch_bytes < 1:
+            raise ValueError("batch_bytes must be at least 1")
+        if queue_depth < 1:
+            raise ValueError("queue_depth must be at least 1")
+        self.path = path
+        self.batch_bytes = batch_bytes
+        self.position = 0
+        self.has_bom = False
+        self._decoder = FallbackDecoder()
+        self._queue = queue.Queue(maxsize=queue_depth)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._read, name="pipeline-reader", daemon=True)
+        self._thread.start()
+
+    @property
+    def fallback_offset(self):
+        """File offset of the first invalid UTF-8 sequence, or None."""
+        offset = self._decoder.fallback_offset
+        if offset is not None and self.has_bom:
+            offset += len(UTF8_BOM)
+        return offset
+
+    def _put(self, item):
+        # Give up once the consumer has stopped, instead of blocking on a full queue forever
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _read(self):
+        newlines = io.IncrementalNewlineDecoder(self._decoder, translate=True)
+        partial = ''
+        try:
+            if isinstance(self.path, (str, bytes, os.PathLike)):
+                source = open(self.path, 'rb')
+            else:
+                source = contextlib.nullcontext(self.path)
+            with source as file:
+                data = file.read(len(UTF8_BOM))
+                if data == UTF8_BOM:
+                    self.has_bom = True
+                    self.position = len(UTF8_BOM)
+                    data = file.read(self.batch_bytes)
+                while data:
+                    self.position += len(data)
+                    text = partial + newlines.decode(data)
+                    # Cutting after '\n' keeps every line whole within one block
+                    cut = text.rfind('\n') + 1
+                    partial = text[cut:]
+                    if cut and not self._put(text[:cut]):
+                        return
+                    data = file.read(self.batch_bytes)
+            text = partial + newlines.decode(b'', final=True)
+            if text and not self._put(text):
+                return
+            self._put(_END)
+        except Exception as error:
+            self._put(error)
+
+    def __iter__(self):
+        while True:
+            item = self._queue.get()
+            if item is _END:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    def close(self):
+        """Stop the reader stage and wait for it to finish."""
+        self._stop.set()
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,119 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+import heapq
+import itertools
+
+POLICY_SJF = "sjf"
+POLICY_FIFO = "fifo"
+POLICY_FAIR = "fair"
+POLICIES = (POLICY_SJF, POLICY_FIFO, POLICY_FAIR)
+
+# Starting guesses until real files have been measured
+DEFAULT_BYTES_PER_ROW = 120.0
+DEFAULT_ROWS_PER_SECOND = 50000.0
+
+
+class CostModel:
+    """Estimates validation time from file size using observed bytes/row and rows/s."""
+
+    def __init__(self, smoothing=0.3):
+        self.smoothing = smoothing
+        self.bytes_per_row = DEFAULT_BYTES_PER_ROW
+        self.rows_per_second = DEFAULT_ROWS_PER_SECOND
+        self.samples = 0
+
+    def _blend(self, current, observed):
+        if self.samples == 0:
+            return observed
+        return current + self.smoothing * (observed - current)
+
+    def record(self, size_bytes, rows, seconds):
+        """Feed the measurements of a finished file back into the model; incomplete measurements are ignored."""
+        if size_bytes <= 0 or rows <= 0 or seconds <= 0:
+            return
+        self.bytes_per_row = self._blend(self.bytes_per_row, size_bytes / rows)
+        self.rows_per_second = self._blend(self.rows_per_second, rows / seconds)
+        self.samples += 1
+
+    def estimate_rows(self, size_bytes):
+        return size_bytes / self.bytes_per_row
+
+    def estimate_seconds(self, size_bytes):
+        return self.estimate_rows(size_bytes) / self.rows_per_second
+
+
+class FileScheduler:
+    """
+    Orders queued files for dispatch.
+
+    sjf  - shortest estimated job first, minimising mean turnaround
+    fifo - arrival order
+    fair - the group (tenant subfolder) that has received the least estimated
+           work goes next; within a group, shortest job first
+    """
+
+    def __init__(self, policy=POLICY_SJF, cost_model=None):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown scheduling policy '{policy}'. Expected one of: {', '.join(POLICIES)}")
+        self.policy = policy
+        self.cost_model = cost_model or CostModel()
+        self._sequence = itertools.count()
+        self._queues = {}
+        self._served = {}
+        self._names = set()
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._names
+
+    def __bool__(self):
+        return bool(self._names)
+
+    def push(self, name, size_bytes, group=""):
+        if name in self._names:
+            return
+        sequence = next(self._sequence)
+        if self.policy == POLICY_FIFO:
+            key = (sequence,)
+        else:
+            key = (size_bytes, sequence)
+        queue = self._queues.setdefault(group, [])
+        if not queue:
+            # A group that becomes active starts level with the least served active group,
+            # so it can neither starve the others nor be starved by their history
+            active = [self._served[other] for other, entries in self._queues.items() if entries]
+            self._served[group] = max(self._served.get(group, 0.0), min(active, default=0.0))
+        heapq.heappush(queue, (key, name, size_bytes))
+        self._names.add(name)
+
+    def _next_group(self):
+        groups = [group for group, entries in self._queues.items() if entries]
+        if self.policy == POLICY_FAIR:
+            return min(groups, key=lambda group: (self._served[group], self._queues[group][0][0]))
+        return min(groups, key=lambda group: self._queues[group][0][0])
+
+    def peek(self):
+        """Return (name, size_bytes, group) of the next file without removing it, or None."""
+        if not self._names:
+            return None
+        group = self._next_group()
+        _key, name, size_bytes = self._queues[group][0]
+        return name, size_bytes, group
+
+    def pop(self):
+        """Remove and return (name, size_bytes, group) of the next file to dispatch."""
+        entry = self.peek()
+        if entry is None:
+            raise IndexError("pop from an empty scheduler")
+        name, size_bytes, group = entry
+        heapq.heappop(self._queues[group])
+        self._served[group] += self.cost_model.estimate_seconds(size_bytes)
+        self._names.discard(name)
+        return entry
+
+    def estimated_backlog_seconds(self):
+        return sum(self.cost_model.estimate_seconds(size) for entries in self._queues.values()
+                   for _key, _name, size in entries)
@@ -0,0 +1,113 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+import io
+import os
+import time
+from src.utils.file_utils import FallbackDecoder
+
+UTF8_BOM = b'\xef\xbb\xbf'
+
+
+class RecordTail:
+    """
+    Reads a file that may still be growing and hands out complete lines.
+
+    The trailing partial line is held back until more data arrives or the file
+    is finished, so a csv.reader fed from iter_lines() only ever sees whole
+    lines and pulls further lines itself for quoted fields spanning several.
+    Bytes are decoded incrementally with FallbackDecoder; a leading BOM is
+    stripped and reported through has_bom. At the first invalid UTF-8 sequence
+    the rest of the file is decoded as ISO-8859-1 and fallback_offset gives the
+    file offset where that happened.
+    """
+
+    def __init__(self, path, chunk_size=1024 * 1024):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.position = 0
+        self.has_bom = False
+        self._decoder = FallbackDecoder()
+        self._partial = ''
+        self._head = b''
+        self._started = False
+
+    def read_complete(self):
+        """Return the complete lines appended since the last call ('' if none)."""
+        try:
+            with open(self.path, 'rb') as file:
+                file.seek(self.position)
+                data = file.read(self.chunk_size)
+        except OSError:
+            return ''
+        if not data:
+            return ''
+        self.position += len(data)
+
+        if not self._started:
+            # Wait for enough bytes to tell whether the file starts with a BOM
+            self._head += data
+            if len(self._head) < len(UTF8_BOM) and UTF8_BOM.startswith(self._head):
+                return ''
+            data, self._head = self._head, b''
+            self._started = True
+            if data.startswith(UTF8_BOM):
+                self.has_bom = True
+                data = data[len(UTF8_BOM):]
+
+        text = self._partial + self._decoder.decode(data)
+        # Cutting after '\n' never separates a '\r\n' pair
+        cut = text.rfind('\n') + 1
+        self._partial = text[cut:]
+        return text[:cut]
+
+    @property
+    def fallback_offset(self):
+        """File offset of the first invalid UTF-8 sequence, or None."""
+        offset = self._decoder.fallback_offset
+        if offset is not None and self.has_bom:
+            offset += len(UTF8_BOM)
+        return offset
+
+    def finish(self):
+        """Read to the end of the now complete file and return the rest, including a last line without newline."""
+        parts = []
+        while True:
+            position = self.position
+            parts.append(self.read_complete())
+            if self.position == position:
+                break
+
+        data, self._head = self._head, b''
+        self._started = True
+        parts.append(self._partial + self._decoder.decode(data, final=True))
+        self._partial = ''
+        return ''.join(parts)
+
+    def is_complete(self, stable_seconds):
+        """True once all data has been read and the file has not been written to for stable_seconds."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return True
+        return self.position >= stat.st_size and time.time() - stat.st_mtime >= stable_seconds
+
+    def iter_lines(self, stable_seconds=2.0, poll_seconds=0.2, max_bytes=None):
+        """
+        Yield lines as they are written, sleeping while the writer catches up.
+
+        Stops once the file is complete or when more than max_bytes have been
+        read; check position afterwards. Lines
+        are newline-translated like a file opened in text mode.
+        """
+        while True:
+            if max_bytes is not None and self.position > max_bytes:
+                return
+            text = self.read_complete()
+            if text:
+                yield from io.StringIO(text, newline=None)
+            elif self.is_complete(stable_seconds):
+                yield from io.StringIO(self.finish(), newline=None)
+                return
+            else:
+                time.sleep(poll_seconds)
@@ -0,0 +1,209 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+import itertools
+import multiprocessing
+import multiprocessing.connection
+import os
+import signal
+import time
+from collections import deque
+
+EVENT_STARTED = "started"
+EVENT_FINISHED = "finished"
+
+
+def _worker_main(worker_id, task, task_conn, result_conn):
+    # Ctrl+C, and a supervisor's SIGTERM sent to the whole process group, are handled by the
+    # parent, which drains or shuts the pool down explicitly
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    while True:
+        try:
+            item = task_conn.recv()
+        except EOFError:
+            break
+        if item is None:
+            break
+        result_conn.send((EVENT_STARTED, worker_id, item, None, 0.0))
+        start_time = time.time()
+        try:
+            result = task(item)
+        except Exception as e:
+            result = e
+        try:
+            result_conn.send((EVENT_FINISHED, worker_id, item, result, time.time() - start_time))
+        except Exception as e:
+            # e.g. a result that cannot be pickled
+            result_conn.send((EVENT_FINISHED, worker_id, item, RuntimeError(f"cannot return result: {e}"),
+                              time.time() - start_time))
+
+
+class WorkerPool:
+    """
+    Runs task(item) in worker processes, each fed through a pipe of its own.
+
+    submit() never blocks: it returns False when workers + queue_size items are
+    already in flight so the caller keeps ownership of the item. Each item goes
+    to the worker with the fewest items, and the pool remembers which worker
+    holds it, so nothing is lost when a worker dies: an item its worker had not
+    yet announced is handed to another worker once, an item that was running
+    (or already retried) is reported as failed. Pipes rather than shared queues
+    mean a killed worker cannot leave a lock held that stalls the others.
+    Results come back from poll() as (event, worker_id, item, result, elapsed)
+    tuples. Workers ignore SIGINT and SIGTERM; after begin_shutdown() the items
+    in flight finish but workers that exit are no longer replaced.
+    """
+
+    def __init__(self, task, workers=None, queue_size=None):
+        self.task = task
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.queue_size = max(1, queue_size or self.workers * 2)
+        self._processes = {}
+        self._task_conns = {}
+        self._result_conns = {}
+        # worker id -> [item, handed at, started, attempts] for each item the worker holds, in its order
+        self._assigned = {}
+        self._current = {}
+        self._in_flight = 0
+        self._shutting_down = False
+        for worker_id in range(1, self.workers + 1):
+            self._start_worker(worker_id)
+
+    def _start_worker(self, worker_id):
+        task_reader, task_writer = multiprocessing.Pipe(duplex=False)
+        result_reader, result_writer = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(
+            target=_worker_main,
+            args=(worker_id, self.task, task_reader, result_writer),
+            name=f"validator-worker-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        # Only the worker keeps these ends, so later workers do not inherit them
+        task_reader.close()
+        result_writer.close()
+        self._processes[worker_id] = process
+        self._task_conns[worker_id] = task_writer
+        self._result_conns[worker_id] = result_reader
+        self._assigned[worker_id] = deque()
+        self._current[worker_id] = None
+
+    @property
+    def in_flight(self):
+        """Items submitted but not yet finished."""
+        return self._in_flight
+
+    def submit(self, item):
+        if self._shutting_down or self._in_flight >= self.workers + self.queue_size:
+            return False
+        self._hand_out(item, 0)
+        self._in_flight += 1
+        return True
+
+    def _hand_out(self, item, attempts):
+        worker_id = min(self._assigned, key=lambda worker_id: len(self._assigned[worker_id]))
+        self._assigned[worker_id].append([item, time.time(), False, attempts])
+        try:
+            self._task_conns[worker_id].send(item)
+        except OSError:
+            # The worker is gone; _reap_dead_workers() hands the item on
+            pass
+
+    def _collect(self, timeout):
+        events = []
+        for conn in multiprocessing.connection.wait(list(self._result_conns.values()), timeout):
+            try:
+                while conn.poll():
+                    events.append(conn.recv())
+            except (EOFError, OSError):
+                # The worker exited; _reap_dead_workers() deals with what it held
+                pass
+
+        for event, worker_id, item, _result, elapsed in events:
+            if event == EVENT_STARTED:
+                self._current[worker_id] = (item, time.time())
+                self._assigned[worker_id][0][2] = True
+            else:
+                self._current[worker_id] = None
+                self._assigned[worker_id].popleft()
+                self._in_flight -= 1
+        return events
+
+    def poll(self, timeout=0):
+        """Collect worker events, waiting up to timeout seconds for the first one."""
+        events = self._collect(timeout)
+        dead = [worker_id for worker_id, process in self._processes.items() if not process.is_alive()]
+        if dead:
+            # Whatever the dead workers sent before exiting is in their pipes by now
+            events.extend(self._collect(0))
+            events.extend(self._reap_dead_workers(dead))
+        return events
+
+    def begin_shutdown(self):
+        """Refuse new items and stop replacing workers that exit, while the items in flight finish."""
+        self._shutting_down = True
+
+    def _reap_dead_workers(self, dead):
+        """Requeue or fail the items of workers that died and start replacements unless shutting down."""
+        events = []
+        orphans = []
+        for worker_id in dead:
+            process = self._processes[worker_id]
+            held = self._assigned[worker_id]
+            if held:
+                item, handed_at, started, attempts = held.popleft()
+                if started or attempts:
+                    error = RuntimeError(f"worker exited with code {process.exitcode}")
+                    events.append((EVENT_FINISHED, worker_id, item, error, time.time() - handed_at))
+                    self._in_flight -= 1
+                else:
+                    # Died while taking the item, before running it
+                    orphans.append((worker_id, item, attempts + 1))
+            orphans.extend((worker_id, item, attempts) for item, _handed_at, _started, attempts in held)
+            self._task_conns.pop(worker_id).close()
+            self._result_conns.pop(worker_id).close()
+            if self._shutting_down:
+                del self._processes[worker_id]
+                del self._assigned[worker_id]
+                del self._current[worker_id]
+            else:
+                self._start_worker(worker_id)
+
+        for worker_id, item, attempts in orphans:
+            if self._assigned:
+                self._hand_out(item, attempts)
+            else:
+                events.append((EVENT_FINISHED, worker_id, item, RuntimeError("no worker left to run the item"), 0.0))
+                self._in_flight -= 1
+        return events
+
+    def status(self):
+        """Map worker id to (item, seconds running) or None when idle."""
+        now = time.time()
+        return {
+            worker_id: (current[0], now - current[1]) if current else None
+            for worker_id, current in sorted(self._current.items())
+        }
+
+    def close(self, wait=True, timeout=5.0):
+        """Stop the workers. With wait=False running items are abandoned."""
+        if wait:
+            for conn in self._task_conns.values():
+                try:
+                    conn.send(None)
+                except OSError:
+                    pass
+        deadline = time.time() + timeout
+        for process in self._processes.values():
+            if wait:
+                process.join(max(0, deadline - time.time()))
+            if process.is_alive():
+                # Workers ignore SIGTERM, so terminate() would not stop them
+                process.kill()
+                process.join(1)
+        self._processes.clear()
+        for conn in itertools.chain(self._task_conns.values(), self._result_conns.values()):
+            conn.close()
+        self._task_conns.clear()
+        self._result_conns.clear()
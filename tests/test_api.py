@@ -0,0 +1,68 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+"""Tests for the library API: no import side effects and a fast cold start."""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+CONTACTS = (b"userId,shouldJoin,joinDate,tierName,tierEntryAt,tierCalcAt,shouldReward\n"
+            b"u1,TRUE,1739195044079,Gold,,,FALSE\n")
+
+# Run in a fresh interpreter so the modules loaded by other tests do not count
+COLD_START = f"""
+import json, sys, time
+started = time.perf_counter()
+from src import api
+imported = set(sys.modules)
+result = api.validate_bytes({CONTACTS!r})
+print(json.dumps({{
+    "seconds": time.perf_counter() - started,
+    "status": result["status"],
+    "after_import": sorted(name for name in imported if name.startswith("src")),
+    "after_validation": sorted(set(sys.modules)),
+}}))
+"""
+
+STARTUP_BUDGET_SECONDS = 0.1
+
+
+def _cold_start(cwd):
+    completed = subprocess.run([sys.executable, "-c", COLD_START], cwd=cwd, capture_output=True, text=True,
+                               env={**os.environ, "PYTHONPATH": str(PROJECT_ROOT)}, check=True)
+    return json.loads(completed.stdout)
+
+
+class TestLibraryApi:
+    """Tests for src.api."""
+
+    def test_import_loads_nothing_and_validation_skips_heavy_modules(self, tmp_path):
+        """Importing src.api loads no other module; validating never loads Flask, the watcher or tracemalloc."""
+        run = _cold_start(tmp_path)
+        assert run["status"] == "valid"
+        assert run["after_import"] == ["src", "src.api"]
+        for module in ("flask", "watcher", "server", "tracemalloc", "src.watch.worker_pool"):
+            assert module not in run["after_validation"]
+        assert list(tmp_path.iterdir()) == []
+
+    def test_cold_start_to_first_validated_row(self, tmp_path):
+        """Import plus the first validation stays within the startup budget (best of three runs)."""
+        best = min(_cold_start(tmp_path)["seconds"] for _ in range(3))
+        assert best < STARTUP_BUDGET_SECONDS
+
+    def test_names_resolve_lazily(self):
+        """Every exported name resolves and unknown names raise AttributeError."""
+        from src import api
+        for name in api.__all__:
+            assert getattr(api, name) is not None
+        assert "validate_path" in dir(api)
+        try:
+            api.no_such_name
+        except AttributeError:
+            pass
+        else:
+            raise AssertionError("unknown name resolved")
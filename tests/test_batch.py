@@ -0,0 +1,103 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+"""Tests for the headless batch validation CLI and engine."""
+import io
+import json
+import batch
+from src.core.engine import validate_path, validate_stream
+
+CONTACTS = ("userId,shouldJoin,joinDate,tierName,tierEntryAt,tierCalcAt,shouldReward\n"
+            "u1,TRUE,1739195044079,Gold,,,FALSE\n"
+            "u2,TRUE,1739195044079,Gold,,,TRUE\n")
+INVALID_CONTACTS = CONTACTS + "u1,FALSE,1739195044079,Gold,,,TRUE\n"
+
+
+def _write(directory, name, content):
+    path = directory / name
+    path.write_bytes(content.encode("utf-8"))
+    return str(path)
+
+
+def _run(files, **kwargs):
+    output = io.StringIO()
+    code = batch.run(files, output=output, **kwargs)
+    return code, [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+class TestEngine:
+    """Tests for validate_path and validate_stream."""
+
+    def test_valid_file(self, tmp_path):
+        """A valid file gives status valid with its type and row count."""
+        result = validate_path(_write(tmp_path, "contacts.csv", CONTACTS))
+        assert result["status"] == "valid"
+        assert result["csv_type"] == "Contacts"
+        assert result["row_count"] == 2
+        assert result["errors"] == []
+
+    def test_row_errors_are_coded_and_capped(self, tmp_path):
+        """Each individual error is listed with its code; max_errors caps the list but not the count."""
+        result = validate_path(_write(tmp_path, "contacts.csv", INVALID_CONTACTS), max_errors=1)
+        assert result["status"] == "invalid"
+        assert result["error_count"] == 2
+        assert result["errors"] == [{"row": 4, "column": "userId", "code": "duplicate_user_id",
+                                     "message": "Duplicate userId found: u1"}]
+
+    def test_file_level_errors(self):
+        """BOM and unknown headers are reported as errors without a row."""
+        result = validate_stream(io.BytesIO(b"\xef\xbb\xbfa,b\n1,2\n"), "upload")
+        assert result["status"] == "invalid"
+        assert [error["row"] for error in result["errors"]] == [None, None]
+        assert "Byte Order Mark" in result["errors"][0]["message"]
+
+    def test_unreadable_file_fails(self, tmp_path):
+        """A missing file gives status failed instead of raising."""
+        assert validate_path(str(tmp_path / "missing.csv"))["status"] == "failed"
+
+    def test_row_that_breaks_a_validator_fails_the_file(self, tmp_path):
+        """A row with too few columns gives status failed and exit code 3, also without worker processes."""
+        short = _write(tmp_path, "short.csv", "userId,pointsToSpend,statusPoints,cashback,allocatedAt,expireAt,"
+                                              "setPlanExpiration,reason,title,description\nu1,10\n")
+        code, results = _run([short], workers=1)
+        assert code == batch.EXIT_FAILED
+        assert results[0]["status"] == "failed"
+        assert results[0]["error"].startswith("Row 2: IndexError")
+
+    def test_no_side_effects(self, tmp_path, capsys):
+        """Validation prints nothing and creates no files."""
+        path = _write(tmp_path, "contacts.csv", INVALID_CONTACTS)
+        validate_path(path)
+        assert capsys.readouterr().out == ""
+        assert [entry.name for entry in tmp_path.iterdir()] == ["contacts.csv"]
+
+
+class TestBatchCli:
+    """Tests for batch.run and its exit codes."""
+
+    def test_exit_codes(self, tmp_path):
+        """0 when all files are valid, 1 with an invalid file, 3 with an unreadable one."""
+        valid = _write(tmp_path, "valid.csv", CONTACTS)
+        invalid = _write(tmp_path, "invalid.csv", INVALID_CONTACTS)
+        assert _run([valid])[0] == batch.EXIT_VALID
+        assert _run([valid, invalid], workers=1)[0] == batch.EXIT_INVALID
+        assert _run([invalid, str(tmp_path / "missing.csv")], workers=1)[0] == batch.EXIT_FAILED
+
+    def test_directories_in_parallel(self, tmp_path):
+        """Directories are searched for CSV files and every file gets one JSON line."""
+        (tmp_path / "nested").mkdir()
+        _write(tmp_path, "a.csv", CONTACTS)
+        _write(tmp_path / "nested", "b.csv", INVALID_CONTACTS)
+        _write(tmp_path, "notes.txt", "not a csv")
+        files = batch.collect_files([str(tmp_path)])
+        assert [path.rsplit("/", 1)[-1].rsplit("\\", 1)[-1] for path in files] == ["a.csv", "b.csv"]
+
+        code, results = _run(files, workers=2)
+        assert code == batch.EXIT_INVALID
+        assert sorted(result["status"] for result in results) == ["invalid", "valid"]
+
+    def test_stdin(self):
+        """'-' validates the CSV read from stdin."""
+        code, results = _run(["-"], stdin=io.BytesIO(CONTACTS.encode("utf-8")))
+        assert code == batch.EXIT_VALID
+        assert results[0]["file"] == "<stdin>"
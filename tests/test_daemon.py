@@ -0,0 +1,84 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+"""Tests for the daemon-mode helpers of the watcher."""
+import os
+import signal
+import pytest
+from src.watch.daemon import InFlightBudget, ShutdownRequest, ThroughputStats
+
+
+class TestInFlightBudget:
+    """Tests for InFlightBudget."""
+
+    def test_caps_files_and_bytes(self):
+        """Files are admitted while both the file and the byte cap have room."""
+        budget = InFlightBudget(max_files=2, max_bytes=100)
+        assert budget.can_admit(60)
+        budget.admit(60)
+        assert not budget.can_admit(50)
+        assert budget.can_admit(40)
+        budget.admit(40)
+        assert not budget.can_admit(0)
+        budget.release(60)
+        assert (budget.files, budget.bytes) == (1, 40)
+        assert budget.can_admit(60)
+
+    def test_oversized_file_is_admitted_alone(self):
+        """A file larger than the byte cap still runs when nothing else is in flight."""
+        budget = InFlightBudget(max_bytes=100)
+        assert budget.can_admit(500)
+        budget.admit(500)
+        assert not budget.can_admit(1)
+        budget.release(500)
+        assert (budget.files, budget.bytes) == (0, 0)
+
+
+class TestThroughputStats:
+    """Tests for ThroughputStats."""
+
+    def test_snapshot_covers_the_interval(self):
+        """Counts and latency percentiles restart with each interval; totals do not."""
+        stats = ThroughputStats()
+        for latency in range(1, 101):
+            stats.record(1024 * 1024, 10, float(latency))
+        figures = stats.snapshot()
+        assert figures["files"] == 100
+        assert figures["latency_p50"] == 51.0
+        assert figures["latency_p95"] == 95.0
+
+        stats.record(0, 5, 0.5)
+        figures = stats.snapshot()
+        assert figures["files"] == 1
+        assert figures["latency_p50"] == figures["latency_p95"] == 0.5
+        assert (figures["total_files"], figures["total_rows"]) == (101, 1005)
+
+        assert stats.snapshot()["latency_p95"] == 0.0
+
+    def test_format(self):
+        """The stats line lists throughput, latency and the queue state."""
+        stats = ThroughputStats()
+        stats.record(2 * 1024 * 1024, 1000, 1.5)
+        line = ThroughputStats.format(stats.snapshot(), queued=3, in_flight=2, in_flight_bytes=1024 * 1024)
+        assert line.startswith("files=1 (")
+        assert "latency p50=1.50s p95=1.50s" in line
+        assert "queued=3 in_flight=2 (1.0 MB) total=1" in line
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGUSR1"), reason="POSIX signals")
+class TestShutdownRequest:
+    """Tests for ShutdownRequest."""
+
+    def test_first_signal_requests_second_forces(self):
+        """The first signal asks for a graceful stop, a second one interrupts."""
+        previous = signal.getsignal(signal.SIGUSR1)
+        shutdown = ShutdownRequest()
+        try:
+            shutdown.install([signal.SIGUSR1])
+            os.kill(os.getpid(), signal.SIGUSR1)
+            assert shutdown.requested
+            assert shutdown.signal_name == "SIGUSR1"
+            with pytest.raises(KeyboardInterrupt):
+                os.kill(os.getpid(), signal.SIGUSR1)
+        finally:
+            signal.signal(signal.SIGUSR1, previous)
@@ -0,0 +1,141 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+"""Tests for mapping validator messages to error codes."""
+import ast
+import inspect
+import time
+import pytest
+from src.core import validator as base_validator
+from src.contacts.contacts_csv_validator import ContactsValidator
+from src.core.error_codes import ErrorMessage, classify_error, error_details, join_errors, UNKNOWN_ERROR_CODE
+from src.points.points_csv_validator import PointsValidator
+from src.vouchers.voucher_csv_validator import VoucherValidator
+
+PAST = "1600000000000"
+FUTURE = str(int(time.time() * 1000) + 86_400_000)
+SECONDS = "1700000000"
+MICROSECONDS = "1700000000000000"
+
+
+@pytest.mark.parametrize("message,expected", [
+    ("Row should have 7 columns", ("column_count", None)),
+    ("Column 'userId' should not be empty", ("empty_value", "userId")),
+    ("Duplicate userId found: u1", ("duplicate_user_id", "userId")),
+    ("Column 'shouldJoin' should be 'TRUE'", ("invalid_value", "shouldJoin")),
+    ("Column 'cashback': Value contains decimal point. Integer fields should not have decimal values.",
+     ("decimal_separator", "cashback")),
+    ("Columns 'tierEntryAt' and 'tierCalcAt' should be empty", ("must_be_empty", "tierEntryAt")),
+    ("expireAt should be an integer (UNIX timestamp in milliseconds) when setPlanExpiration is FALSE",
+     ("not_integer", "expireAt")),
+    ("setPlanExpiration should be either TRUE or FALSE", ("invalid_value", "setPlanExpiration")),
+    ("Column 'joinDate': Timestamp (1700000000) appears to be in seconds format (10 digits).",
+     ("timestamp_seconds", "joinDate")),
+])
+def test_known_messages(message, expected):
+    """Validator messages map to a stable code and the column they concern."""
+    assert classify_error(message) == expected
+
+
+def test_bare_timestamp_message_uses_timestamp_column():
+    """Messages without a column mention are attributed to the validator's timestamp column."""
+    assert classify_error("Timestamp (1) is in the past. Current timestamp: 2", "expiration") == \
+        ("timestamp_in_past", "expiration")
+
+
+def test_unknown_message():
+    """Unrecognised messages still get a code."""
+    assert classify_error("Something new") == (UNKNOWN_ERROR_CODE, None)
+
+
+# Rows that between them produce every message of a validator, with the codes they must carry
+VALIDATOR_CASES = [
+    (ContactsValidator, [
+        ["", "FALSE", "abc", "", "x", "", "maybe"],
+        ["NULL", "TRUE", SECONDS, "", "", "", "TRUE"],
+        ["u1", "TRUE", FUTURE, "", "", "", "TRUE"],
+        ["u2", "TRUE", PAST, "", "", "", "TRUE"],
+        ["u2", "TRUE", PAST, "", "", "", "TRUE", "extra"],
+    ], {"empty_value", "invalid_value", "not_integer", "must_be_empty", "null_value", "timestamp_seconds",
+        "timestamp_not_past", "duplicate_user_id", "column_count"}),
+    (PointsValidator, [
+        ["u", "1,5", "abc", "x", "1", "", "maybe", "a,b", "", "d"],
+        ["u", "0", "0", "", "", "123", "TRUE", "", "", ""],
+        ["u", "1", "", "", "", PAST, "FALSE", "", "", ""],
+        ["u", "1", "", "", "", SECONDS, "FALSE", "", "", ""],
+        ["u", "1", "", "", "", MICROSECONDS, "FALSE", "", "", ""],
+        ["u", "1", "", "", "", "abc", "FALSE", "", "", ""],
+        ["u", "1", "", "", "", "", "TRUE", "", "", "", "extra"],
+    ], {"decimal_separator", "not_integer", "not_float", "must_be_empty", "invalid_value", "unquoted_comma",
+        "missing_dependency", "no_positive_value", "timestamp_not_future", "timestamp_seconds",
+        "timestamp_format", "too_many_columns"}),
+    (VoucherValidator, [
+        ["", "", "bad", "", "", "", "1,5"],
+        ["u", "", "one_time", "a,b", "i", "c1", "abc"],
+        ["u", "e1", "one_time", "n", "i", "c2", SECONDS],
+        ["u", "e2", "one_time", "n", "i", "c3", PAST],
+        ["u", "e1", "yearly", "n", "i", "c2", FUTURE],
+        ["u", "e3", "yearly", "n", "i", "c4"],
+    ], {"missing_identifier", "invalid_value", "empty_value", "decimal_separator", "unquoted_comma",
+        "not_integer", "timestamp_seconds", "timestamp_in_past", "duplicate_value", "column_count"}),
+]
+
+
+@pytest.mark.parametrize("validator_class,rows,expected_codes", VALIDATOR_CASES)
+def test_validators_carry_codes(tmp_path, validator_class, rows, expected_codes):
+    """Every validator error carries its code and column."""
+    validator = validator_class(csv_path=str(tmp_path / "data.csv"), log_path=None)
+    validator.start_validation()
+    for idx, row in enumerate(rows, start=2):
+        validator.validate_record(idx, row)
+    validator.finish_validation()
+
+    codes = set()
+    for error in validator.validation_error_details:
+        message = error["message"]
+        for individual_error in getattr(message, 'errors', (message,)):
+            assert isinstance(individual_error, ErrorMessage), individual_error
+        for code, column, text in error_details(message, validator.timestamp_column):
+            assert code != UNKNOWN_ERROR_CODE, text
+            codes.add(code)
+    assert codes == expected_codes
+
+
+def test_carried_code_survives_rewording():
+    """A message's own code wins over the text rules, so rewording it keeps its code."""
+    message = join_errors([ErrorMessage("Please fill in the code", "empty_value", "code"),
+                           ErrorMessage("Row too long", "too_many_columns")])
+    assert error_details(message) == [("empty_value", "code", "Please fill in the code"),
+                                      ("too_many_columns", None, "Row too long")]
+
+
+@pytest.mark.parametrize("module", [base_validator] + [inspect.getmodule(case[0]) for case in VALIDATOR_CASES])
+def test_every_validator_message_is_created_with_a_code(module):
+    """Each error a validator collects is built as an ErrorMessage (or from one), never as plain text."""
+    def creates_error_message(node):
+        return (isinstance(node, ast.Call) and
+                ((isinstance(node.func, ast.Name) and node.func.id == "ErrorMessage") or
+                 (isinstance(node.func, ast.Attribute) and node.func.attr == "in_column")))
+
+    collected = 0
+    for node in ast.walk(ast.parse(inspect.getsource(module))):
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == "append" \
+                and isinstance(node.func.value, ast.Name) and node.func.value.id.endswith("errors"):
+            assert creates_error_message(node.args[0]), ast.unparse(node)
+            collected += 1
+        elif isinstance(node, ast.Return) and isinstance(node.value, ast.Tuple) and len(node.value.elts) > 1 \
+                and isinstance(node.value.elts[1], ast.JoinedStr):
+            raise AssertionError(f"plain text returned as a row error: {ast.unparse(node)}")
+    assert collected or module is base_validator
+
+
+def test_row_errors_require_codes():
+    """A row's errors cannot be joined from plain text, so a missing code fails loudly."""
+    with pytest.raises(TypeError):
+        join_errors([ErrorMessage("Row should have 7 columns", "column_count"), "Something new"])
+
+
+def test_plain_text_falls_back_to_rules():
+    """Messages of legacy callers, given as plain text, are still classified by their text."""
+    assert error_details("Row should have 7 columns; Something new") == [
+        ("column_count", None, "Row should have 7 columns"), (UNKNOWN_ERROR_CODE, None, "Something new")]
@@ -0,0 +1,100 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+"""Tests for the watcher file event backends and readiness tracking."""
+import sys
+import pytest
+from src.watch.file_events import (
+    EVENT_CLOSED,
+    EVENT_CREATED,
+    EVENT_MODIFIED,
+    InotifyWatcher,
+    PollingWatcher,
+    ReadinessTracker,
+)
+
+
+class TestReadinessTracker:
+    """Tests for ReadinessTracker."""
+
+    def test_closed_file_is_ready_immediately(self, tmp_path):
+        """A close-write event should make the file ready without waiting."""
+        (tmp_path / "a.csv").write_text("userId\n", encoding="utf-8")
+        tracker = ReadinessTracker(str(tmp_path), stable_seconds=60)
+        assert tracker.observe("a.csv", EVENT_CREATED, now=0) is True
+        assert tracker.observe("a.csv", EVENT_CLOSED, now=0) is False
+        assert tracker.pop_ready(now=0) == ["a.csv"]
+        assert "a.csv" not in tracker
+
+    def test_growing_file_waits_for_stable_size(self, tmp_path):
+        """Without a close event the file is ready once its size stops changing."""
+        path = tmp_path / "b.csv"
+        path.write_text("userId\n", encoding="utf-8")
+        tracker = ReadinessTracker(str(tmp_path), stable_seconds=2)
+        tracker.observe("b.csv", EVENT_MODIFIED, now=0)
+        assert tracker.pop_ready(now=0) == []
+
+        path.write_text("userId\nabc\n", encoding="utf-8")
+        assert tracker.pop_ready(now=1.5) == []
+        assert tracker.pop_ready(now=3) == []
+        assert tracker.pop_ready(now=3.6) == ["b.csv"]
+
+    def test_one_growing_file_does_not_block_another(self, tmp_path):
+        """Readiness is tracked per file."""
+        (tmp_path / "slow.csv").write_text("x\n", encoding="utf-8")
+        (tmp_path / "fast.csv").write_text("y\n", encoding="utf-8")
+        tracker = ReadinessTracker(str(tmp_path), stable_seconds=60)
+        tracker.observe("slow.csv", EVENT_MODIFIED, now=0)
+        tracker.observe("fast.csv", EVENT_CLOSED, now=0)
+        assert tracker.pop_ready(now=0) == ["fast.csv"]
+        assert len(tracker) == 1
+
+    def test_vanished_file_is_dropped(self, tmp_path):
+        """Files removed before becoming ready are forgotten."""
+        tracker = ReadinessTracker(str(tmp_path), stable_seconds=1)
+        tracker.observe("gone.csv", EVENT_CLOSED, now=0)
+        assert tracker.pop_ready(now=0) == []
+        assert len(tracker) == 0
+
+    def test_next_timeout_is_none_when_idle(self, tmp_path):
+        """An idle tracker lets the watcher block indefinitely."""
+        tracker = ReadinessTracker(str(tmp_path))
+        assert tracker.next_timeout() is None
+
+
+class TestPollingWatcher:
+    """Tests for the polling fallback backend."""
+
+    def test_reports_new_and_modified_files(self, tmp_path):
+        """Files created or changed after start-up are reported."""
+        (tmp_path / "existing.csv").write_text("a\n", encoding="utf-8")
+        watcher = PollingWatcher(str(tmp_path), interval=0)
+        (tmp_path / "new.csv").write_text("b\n", encoding="utf-8")
+        assert watcher.poll(0) == [("new.csv", EVENT_CREATED)]
+
+        (tmp_path / "new.csv").write_text("b\nc\n", encoding="utf-8")
+        assert watcher.poll(0) == [("new.csv", EVENT_MODIFIED)]
+        assert watcher.poll(0) == []
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux only")
+class TestInotifyWatcher:
+    """Tests for the inotify backend."""
+
+    def test_reports_close_write(self, tmp_path):
+        """Writing and closing a file produces a closed event."""
+        watcher = InotifyWatcher(str(tmp_path))
+        try:
+            (tmp_path / "c.csv").write_text("userId\n", encoding="utf-8")
+            events = watcher.poll(1.0)
+            assert ("c.csv", EVENT_CLOSED) in events
+        finally:
+            watcher.close()
+
+    def test_poll_times_out_when_idle(self, tmp_path):
+        """Polling an idle directory returns no events."""
+        watcher = InotifyWatcher(str(tmp_path))
+        try:
+            assert watcher.poll(0.01) == []
+        finally:
+            watcher.close()
@@ -0,0 +1,104 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+"""Tests for CSV type and encoding detection."""
+import csv
+import io
+import pytest
+from src.utils.file_utils import (CONTACTS_HEADERS, POINTS_HEADERS, VOUCHERS_HEADERS, CSV_TYPES,
+                                  FallbackDecoder, decode_bytes, detect_csv_type, read_header_line,
+                                  read_text_file)
+
+
+def _full_split_detection(content_str):
+    """Reference behaviour: parse the header from the fully split content."""
+    content_lines = content_str.splitlines()
+    for delimiter in (',', ';'):
+        headers = csv.DictReader(content_lines, delimiter=delimiter).fieldnames
+        if headers and tuple(headers) in CSV_TYPES:
+            return CSV_TYPES[tuple(headers)][0], delimiter
+    return "Unknown", ','
+
+
+SAMPLES = [
+    ",".join(CONTACTS_HEADERS) + "\nu1,TRUE,1,,,,FALSE\n",
+    ",".join(POINTS_HEADERS) + "\r\n" + "x" * 10000,
+    ";".join(VOUCHERS_HEADERS) + "\n",
+    ",".join(VOUCHERS_HEADERS),
+    '"userId",shouldJoin,joinDate,tierName,tierEntryAt,tierCalcAt,shouldReward\n',
+    ",".join(CONTACTS_HEADERS) + ",extra\n",
+    "\n" + ",".join(CONTACTS_HEADERS) + "\n",
+    "",
+    "x" * 20000 + "\n",
+]
+
+
+class TestDetectCsvType:
+    """Tests for detect_csv_type."""
+
+    @pytest.mark.parametrize("content", SAMPLES)
+    def test_matches_full_split_detection(self, content):
+        """Reading only the header gives the same answer as splitting the whole content."""
+        csv_type, _validator_class, _expected_cols, delimiter = detect_csv_type(content)
+        assert (csv_type, delimiter) == _full_split_detection(content)
+
+    def test_accepts_bytes_and_streams(self):
+        """Bytes prefixes and text or binary streams are sniffed like decoded text."""
+        content = ";".join(POINTS_HEADERS) + "\n1;2;3\n"
+        expected = detect_csv_type(content)
+        assert expected[0] == "Points"
+        assert detect_csv_type(content.encode("utf-8")[:200]) == expected
+        assert detect_csv_type(io.BytesIO(content.encode("utf-8"))) == expected
+        assert detect_csv_type(io.StringIO(content)) == expected
+
+    def test_stream_is_read_only_up_to_the_header(self):
+        """Only the first line of a stream is consumed."""
+        stream = io.StringIO(",".join(VOUCHERS_HEADERS) + "\nrow\n")
+        detect_csv_type(stream)
+        assert stream.read() == "row\n"
+
+    def test_unknown_headers(self):
+        """Unrecognised headers return the Unknown tuple."""
+        assert detect_csv_type("a,b\n1,2\n") == ("Unknown", None, [], ',')
+
+    def test_bom_is_ignored(self):
+        """A BOM before the header does not hide the type, whatever the source."""
+        content = "\ufeff" + ",".join(CONTACTS_HEADERS) + "\nu1,TRUE,1,,,,FALSE\n"
+        assert detect_csv_type(content)[0] == "Contacts"
+        assert detect_csv_type(io.BytesIO(content.encode("utf-8")))[0] == "Contacts"
+
+    def test_read_header_line_handles_latin1_bytes(self):
+        """A non-UTF-8 header line is decoded as ISO-8859-1."""
+        assert read_header_line("userId,café\n".encode("latin-1")) == "userId,café"
+
+
+class TestFallbackDecoding:
+    """Tests for the single-pass UTF-8 / ISO-8859-1 decoding."""
+
+    def test_utf8_is_decoded_without_fallback(self):
+        """Valid UTF-8 split inside multi-byte characters decodes unchanged."""
+        raw = "userId,name\nu1,José €\n".encode("utf-8")
+        assert decode_bytes(raw, chunk_size=3) == (raw.decode("utf-8"), "utf-8", None)
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 5, 1024])
+    def test_switches_once_at_first_invalid_byte(self, chunk_size):
+        """The prefix stays UTF-8, the rest is ISO-8859-1 and the offset is the first bad byte."""
+        prefix = "userId,name\nu1,José\n".encode("utf-8")
+        rest = "u2,René\nu3,ü\n".encode("latin-1")
+        text, encoding, offset = decode_bytes(prefix + rest, chunk_size=chunk_size)
+        assert text == prefix.decode("utf-8") + rest.decode("latin-1")
+        assert encoding == "ISO-8859-1"
+        assert offset == len(prefix) + len("u2,Ren")
+
+    def test_truncated_sequence_at_end_falls_back(self):
+        """A multi-byte character cut off at the end of the data is reported at its first byte."""
+        decoder = FallbackDecoder()
+        assert decoder.decode(b"ab\xc3") == "ab"
+        assert decoder.decode(b"", final=True) == "\xc3"
+        assert decoder.fallback_offset == 2
+
+    def test_read_text_file_translates_newlines(self, tmp_path):
+        """Files are read like text mode: CRLF becomes LF, a BOM is kept for the caller."""
+        path = tmp_path / "upload.csv"
+        path.write_bytes(b"\xef\xbb\xbfa,b\r\n1,\xe9\r\n")
+        assert read_text_file(str(path), chunk_size=4) == ("\ufeffa,b\n1,é\n", "ISO-8859-1", 10)
@@ -0,0 +1,73 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+"""Tests for the background-writing Logger."""
+import gzip
+import zlib
+import pytest
+from src.core.logger import Logger
+
+
+def _read(path):
+    with open(path, encoding='utf-8') as file:
+        return file.read()
+
+
+class TestLogger:
+    """Tests for Logger."""
+
+    def test_close_writes_all_messages_in_order(self, tmp_path):
+        """Everything logged is on disk, in order, after close()."""
+        path = tmp_path / "errors.txt"
+        logger = Logger(str(path), flush_bytes=100, max_queued_batches=2)
+        for index in range(1000):
+            logger.log(f"Error {index}")
+        logger.close()
+        assert _read(path).splitlines() == [f"Error {index}" for index in range(1000)]
+
+    def test_small_batches_stay_buffered_until_flush(self, tmp_path):
+        """Messages below the byte threshold are written by flush(), not before."""
+        path = tmp_path / "errors.txt"
+        logger = Logger(str(path))
+        logger.log("first")
+        assert not path.exists()
+        logger.flush()
+        assert _read(path) == "first\n"
+        logger.close()
+
+    def test_list_messages_are_joined(self, tmp_path):
+        """A list of messages is written as one line."""
+        path = tmp_path / "errors.txt"
+        with Logger(str(path)) as logger:
+            logger.log(["a", "b"])
+        assert _read(path) == "a; b\n"
+
+    def test_appends_to_existing_file_and_restarts_after_close(self, tmp_path):
+        """The log is appended to, and logging after close() starts a new writer."""
+        path = tmp_path / "errors.txt"
+        path.write_text("header\n", encoding='utf-8')
+        logger = Logger(str(path))
+        logger.log("one")
+        logger.close()
+        logger.log("two")
+        logger.close()
+        assert _read(path) == "header\none\ntwo\n"
+
+    def test_write_errors_are_raised_on_close(self, tmp_path):
+        """A log file that cannot be opened is reported instead of being silently dropped."""
+        logger = Logger(str(tmp_path / "missing" / "errors.txt"), flush_bytes=1)
+        logger.log("lost")
+        with pytest.raises(OSError):
+            logger.close()
+
+    def test_compressed_log_is_readable_after_flush(self, tmp_path):
+        """A gzip log can be decompressed after flush() and appends stay one readable stream."""
+        path = tmp_path / "errors.txt.gz"
+        logger = Logger(str(path), compress_level=6)
+        logger.log("first")
+        logger.flush()
+        assert zlib.decompressobj(zlib.MAX_WBITS | 16).decompress(path.read_bytes()) == b"first\n"
+        logger.close()
+        with Logger(str(path), compress_level=1) as logger:
+            logger.log("second")
+        assert gzip.decompress(path.read_bytes()) == b"first\nsecond\n"
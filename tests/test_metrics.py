@@ -0,0 +1,71 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+"""Tests for the Prometheus-style metrics."""
+import threading
+import pytest
+from src.core import metrics
+
+
+class TestMetrics:
+    """Tests for counters, gauges, histograms and the text exposition."""
+
+    def test_counter_with_labels(self):
+        """Counters render one sample per label set, with escaped label values."""
+        counter = metrics.Counter('errors_total', 'Errors.', ['code'])
+        counter.inc(labels=('empty_value',))
+        counter.inc_many({('empty_value',): 2, ('say "hi"',): 1})
+        assert counter.render() == [
+            '# HELP errors_total Errors.',
+            '# TYPE errors_total counter',
+            'errors_total{code="empty_value"} 3',
+            'errors_total{code="say \\"hi\\""} 1',
+        ]
+
+    def test_label_count_is_checked(self):
+        """Missing labels are rejected."""
+        with pytest.raises(ValueError):
+            metrics.Counter('requests_total', 'Requests.', ['status']).inc()
+
+    def test_concurrent_increments_are_not_lost(self):
+        """Increments from several threads all count."""
+        counter = metrics.Counter('bytes_total', 'Bytes.')
+
+        def work():
+            for _ in range(10000):
+                counter.inc(2)
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert counter.render()[-1] == 'bytes_total 80000'
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Buckets count observations up to their bound and end with +Inf, _sum and _count."""
+        histogram = metrics.Histogram('seconds', 'Latency.', ['csv_type'], buckets=(0.1, 1))
+        for value in (0.05, 0.5, 5):
+            histogram.observe(value, ('Points',))
+        assert histogram.render()[2:] == [
+            'seconds_bucket{csv_type="Points",le="0.1"} 1',
+            'seconds_bucket{csv_type="Points",le="1"} 2',
+            'seconds_bucket{csv_type="Points",le="+Inf"} 3',
+            'seconds_sum{csv_type="Points"} 5.55',
+            'seconds_count{csv_type="Points"} 3',
+        ]
+
+    def test_registry_renders_gauges_and_callbacks(self):
+        """The registry joins all metrics; callback gauges returning None are left out."""
+        registry = metrics.Registry()
+        registry.register(metrics.Gauge('inflight', 'In flight.')).inc()
+        registry.register(metrics.CallbackGauge('rss', 'RSS.', lambda: None))
+        registry.register(metrics.CallbackGauge('answer', 'Answer.', lambda: 42))
+        text = registry.render()
+        assert 'inflight 1\n' in text
+        assert 'rss' not in text
+        assert text.endswith('answer 42\n')
+
+    def test_resident_memory_is_positive_where_available(self):
+        """RSS is a positive byte count, or None on platforms without a source."""
+        rss = metrics.process_resident_memory_bytes()
+        assert rss is None or rss > 0
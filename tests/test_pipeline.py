@@ -0,0 +1,72 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+"""Tests for the pipelined file reader."""
+import csv
+import io
+import pytest
+from src.core.tokenizer import iter_block_rows
+from src.watch.pipeline import PipelineReader
+
+
+class TestPipelineReader:
+    """Tests for PipelineReader."""
+
+    def test_blocks_end_at_line_boundaries(self, tmp_path):
+        """Blocks join to the text-mode content of the file and each ends with a newline."""
+        path = tmp_path / "points.csv"
+        content = "a,b\r\n" + "".join(f"{index},value {index}\r\n" for index in range(200)) + "last,row"
+        path.write_bytes(content.encode("utf-8"))
+        with PipelineReader(str(path), batch_bytes=7, queue_depth=1) as reader:
+            blocks = list(reader)
+        assert "".join(blocks) == content.replace("\r\n", "\n")
+        assert all(block.endswith("\n") for block in blocks[:-1])
+        assert reader.position == len(content)
+
+    def test_rows_match_csv_reader_with_multiline_fields(self, tmp_path):
+        """Quoted fields split across blocks are tokenized like csv.reader over the whole file."""
+        path = tmp_path / "quoted.csv"
+        content = 'a,b\n1,"line one\nline two\nline three"\n2,"x,y"\n3,z\n'
+        path.write_bytes(content.encode("utf-8"))
+        with PipelineReader(str(path), batch_bytes=5) as reader:
+            rows = list(iter_block_rows(reader))
+        assert rows == list(csv.reader(io.StringIO(content)))
+
+    def test_bom_and_encoding_fallback_are_reported(self, tmp_path):
+        """A BOM is stripped and the ISO-8859-1 switch is reported as a file offset."""
+        path = tmp_path / "latin1.csv"
+        path.write_bytes(b"\xef\xbb\xbf" + "name\nJosé\n".encode("latin-1"))
+        with PipelineReader(str(path), batch_bytes=2) as reader:
+            text = "".join(reader)
+        assert text == "name\nJosé\n"
+        assert reader.has_bom
+        assert reader.fallback_offset == 11
+
+    def test_reads_an_open_binary_stream(self):
+        """A stream is read from its current position and left open."""
+        stream = io.BytesIO(b"a,b\n1,2\n")
+        with PipelineReader(stream, batch_bytes=3) as reader:
+            assert "".join(reader) == "a,b\n1,2\n"
+        assert not stream.closed
+
+    def test_read_errors_are_raised_to_the_consumer(self, tmp_path):
+        """A file that cannot be read raises from the iteration."""
+        with PipelineReader(str(tmp_path / "missing.csv")) as reader:
+            with pytest.raises(OSError):
+                list(reader)
+
+    def test_close_stops_a_blocked_reader(self, tmp_path):
+        """Closing before the file is consumed does not wait for the queue to drain."""
+        path = tmp_path / "big.csv"
+        path.write_bytes(b"a,b\n" * 10000)
+        reader = PipelineReader(str(path), batch_bytes=16, queue_depth=1)
+        next(iter(reader))
+        reader.close()
+        assert not reader._thread.is_alive()
+
+    def test_invalid_settings_rejected(self, tmp_path):
+        """Batch size and queue depth must be positive."""
+        with pytest.raises(ValueError):
+            PipelineReader(str(tmp_path / "x.csv"), batch_bytes=0)
+        with pytest.raises(ValueError):
+            PipelineReader(str(tmp_path / "x.csv"), queue_depth=0)
@@ -0,0 +1,96 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+"""Tests for the validation profiling hooks."""
+import tracemalloc
+from src.core.profiling import Profiler, phase, lap
+from src.vouchers.voucher_csv_validator import VoucherValidator
+from src.utils import time_utils
+
+VOUCHERS = ("userId,externalId,voucherType,voucherName,iconName,code,expiration\n"
+            "u1,e1,one_time,Name,icon,C1,4102444800000\n"
+            "u2,e2,one_time,\"Name, with comma\",icon,C2,4102444800000\n")
+
+
+def _validator():
+    validator = VoucherValidator("<upload>", None)
+    validator._cleaned_content = VOUCHERS
+    return validator
+
+
+class TestProfiler:
+    """Tests for Profiler and the validator hooks."""
+
+    def test_phases_and_laps_are_counted(self):
+        """phase() and lap() add wall time and a call to their phase."""
+        profiler = Profiler()
+        with profiler.phase("read"):
+            pass
+        lap(profiler, "check")
+        lap(profiler, "check")
+        assert profiler.phases["read"][1] == 1
+        assert profiler.phases["check"][1] == 2
+        assert all(seconds >= 0 for seconds, _calls in profiler.phases.values())
+
+    def test_disabled_helpers_do_nothing(self):
+        """Without a profiler the helpers are no-ops."""
+        with phase(None, "read"):
+            pass
+        lap(None, "read")
+
+    def test_rules_are_timed_per_call(self):
+        """A profiled validator counts each rule helper call and its phases."""
+        profiler = Profiler()
+        validator = _validator()
+        validator.enable_profiling(profiler)
+        assert validator.validate() is False
+
+        assert profiler.rules["_validate_row"][1] == 2
+        assert profiler.rules["_needs_csv_quoting"][1] == 2
+        assert profiler.rules["_is_unix_millisecond_timestamp"][1] == 2
+        assert set(profiler.phases) == {"parse", "validation"}
+        assert any(line.startswith("Rule _needs_csv_quoting:") for line in profiler.format_lines())
+
+    def test_other_validators_are_not_instrumented(self):
+        """Profiling one validator leaves the module helpers and other instances untouched."""
+        _validator().enable_profiling(Profiler())
+        plain = _validator()
+        assert "_validate_row" not in vars(plain)
+        assert plain._validate_row.__func__.__globals__["_needs_csv_quoting"] is time_utils._needs_csv_quoting
+        assert plain.validate() is False
+
+    def test_as_dict(self):
+        """The breakdown is JSON-ready with seconds and calls."""
+        profiler = Profiler()
+        profiler.timed("rule", len)("abc")
+        assert profiler.as_dict()["rules"]["rule"]["calls"] == 1
+
+    def test_memory_per_phase(self):
+        """Memory accounting records net and peak allocation per phase and stops tracing on close."""
+        profiler = Profiler(timing=False, memory=True)
+        with profiler.phase("allocate"):
+            kept = bytearray(2 * 1024 * 1024)
+            del bytearray(4 * 1024 * 1024)[:]
+        lap(profiler, "free")
+        kept = None
+        lap(profiler, "release")
+        profiler.close()
+
+        net, peak, calls = profiler.memory["allocate"]
+        assert net >= 2 * 1024 * 1024
+        assert peak >= 6 * 1024 * 1024
+        assert calls == 1
+        assert profiler.memory["release"][0] < -1024 * 1024
+        assert not tracemalloc.is_tracing()
+        assert set(profiler.as_dict()) == {"memory"}
+        assert profiler.format_memory_lines()[0].startswith("allocate: peak 6.0 MB, net +2.0 MB")
+
+    def test_memory_only_skips_rule_timing(self):
+        """A memory-only profiler records validate()'s phases without instrumenting the rules."""
+        profiler = Profiler(timing=False, memory=True)
+        validator = _validator()
+        validator.enable_profiling(profiler)
+        assert validator.validate() is False
+        profiler.close()
+        assert "_validate_row" not in vars(validator)
+        assert set(profiler.memory) == {"parse", "validation"}
@@ -0,0 +1,133 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+"""Tests for the streaming details report."""
+import csv
+import gzip
+import json
+import pytest
+from src.core.report import DetailsReport, ReportOptions, format_details_entry, format_details_header
+from src.points.points_csv_validator import PointsValidator
+
+POINTS_HEADER = ("userId,pointsToSpend,statusPoints,cashback,allocatedAt,expireAt,setPlanExpiration,reason,title,"
+                 "description\n")
+
+
+def _row_error(row, message, category="data"):
+    return {"row": row, "message": message, "row_data": [f"user{row}", "x"], "category": category}
+
+
+class TestDetailsReport:
+    """Tests for DetailsReport."""
+
+    def test_nothing_is_reserved_without_errors(self, tmp_path):
+        """A clean file leaves no log or details file behind."""
+        report = DetailsReport(str(tmp_path), "clean.csv", "clean.csv")
+        report.close()
+        assert report.log_filename is None
+        assert list(tmp_path.iterdir()) == []
+
+    def test_streamed_report_matches_in_memory_format(self, tmp_path):
+        """The streamed report has the same entries, in row order, as the in-memory report."""
+        report = DetailsReport(str(tmp_path), "points.csv", "points.csv")
+        errors = [_row_error(2, "bad a; bad b"), _row_error(3, "old timestamp", "timestamp"), _row_error(4, "bad c")]
+        for error in errors:
+            report.add(error)
+        report.close()
+
+        assert report.log_filename == "points.txt"
+        assert report.details_filename == "points_details.txt"
+        expected = format_details_header("points.csv") + "".join(
+            format_details_entry(number, error) for number, error in enumerate(errors, 1))
+        text = (tmp_path / "points_details.txt").read_text(encoding="utf-8")
+        assert text == expected
+        assert "#2. ROW 3 TIMESTAMP ERRORS" in text
+
+    def test_names_do_not_clash_with_existing_logs(self, tmp_path):
+        """An existing log shifts both names, keeping the <log>_details pairing."""
+        (tmp_path / "points.txt").write_text("old", encoding="utf-8")
+        report = DetailsReport(str(tmp_path), "points.csv", "points.csv")
+        report.add(_row_error(2, "bad"))
+        report.close()
+        assert report.log_filename == "points_1.txt"
+        assert report.details_filename == "points_1_details.txt"
+
+    def test_dotted_file_names_keep_their_base_name(self, tmp_path):
+        """Only the file's extension is dropped, so dotted names neither lose parts nor clash with other files."""
+        report = DetailsReport(str(tmp_path), "points.2024-01.csv", "points.2024-01.csv")
+        report.add(_row_error(2, "bad"))
+        report.close()
+        assert report.log_filename == "points.2024-01.txt"
+        assert report.details_filename == "points.2024-01_details.txt"
+
+    def test_discard_removes_reserved_files(self, tmp_path):
+        """A discarded report leaves nothing in the logs folder."""
+        report = DetailsReport(str(tmp_path), "points.csv", "points.csv")
+        report.add(_row_error(2, "bad"))
+        report.discard()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_validation_that_raises_closes_the_report(self, tmp_path):
+        """Rows written before a validator raised stay readable; the unused log placeholder is removed."""
+        csv_path = tmp_path / "points.csv"
+        csv_path.write_text(POINTS_HEADER + "u1,0,0,0,,,TRUE,,,\nu2\n", encoding="utf-8")
+        logs = tmp_path / "logs"
+        logs.mkdir()
+        validator = PointsValidator(str(csv_path), None)
+        validator.report = DetailsReport(str(logs), "points.csv", "points.csv",
+                                         ReportOptions(("ndjson",), compress_level=6))
+        with pytest.raises(IndexError):
+            validator.validate()
+
+        assert sorted(path.name for path in logs.iterdir()) == ["points_details.txt.gz", "points_errors.ndjson.gz"]
+        with gzip.open(logs / "points_details.txt.gz", "rt", encoding="utf-8") as file:
+            assert "#1. ROW 2 VALIDATION ERRORS" in file.read()
+
+    def test_abandoned_report_without_rows_leaves_nothing(self, tmp_path):
+        """Reserved files that never received a row are removed when validation stops partway."""
+        report = DetailsReport(str(tmp_path), "points.csv", "points.csv", ReportOptions(("csv",)))
+        with pytest.raises(KeyError):
+            report.add({"row": 2})
+        report.abandon()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_exports_one_record_per_message(self, tmp_path):
+        """NDJSON and CSV exports split row messages and carry row, column, code and message."""
+        report = DetailsReport(str(tmp_path), "vouchers.csv", "vouchers.csv",
+                               ReportOptions(("ndjson", "csv")), timestamp_column="expiration")
+        report.add(_row_error(2, "Column 'code' should not be empty; Timestamp (1) is in the past. Current timestamp: 2"))
+        report.close()
+
+        with open(tmp_path / "vouchers_errors.ndjson", encoding="utf-8") as file:
+            records = [json.loads(line) for line in file]
+        assert [(r["row"], r["column"], r["code"]) for r in records] == [
+            (2, "code", "empty_value"), (2, "expiration", "timestamp_in_past")]
+        with open(tmp_path / "vouchers_errors.csv", encoding="utf-8", newline="") as file:
+            rows = list(csv.reader(file))
+        assert rows[0] == ["row", "column", "code", "message"]
+        assert rows[1] == ["2", "code", "empty_value", "Column 'code' should not be empty"]
+        assert len(rows) == 3
+
+    def test_unknown_export_format_rejected(self):
+        """Only the supported export formats are accepted."""
+        with pytest.raises(ValueError):
+            ReportOptions(("xml",))
+
+    def test_compressed_report_and_export(self, tmp_path):
+        """With a compression level every report file is gzipped and gets a .gz suffix."""
+        report = DetailsReport(str(tmp_path), "points.csv", "points.csv", ReportOptions(("ndjson",), compress_level=6))
+        error = _row_error(2, "Column 'cashback' should be a float.")
+        report.add(error)
+        report.close()
+
+        assert report.log_filename == "points.txt.gz"
+        assert report.details_filename == "points_details.txt.gz"
+        with gzip.open(tmp_path / "points_details.txt.gz", "rt", encoding="utf-8") as file:
+            assert file.read() == format_details_header("points.csv") + format_details_entry(1, error)
+        with gzip.open(tmp_path / "points_errors.ndjson.gz", "rt", encoding="utf-8") as file:
+            assert json.loads(file.readline())["code"] == "not_float"
+
+    def test_invalid_compression_level_rejected(self):
+        """Compression levels outside 1-9 are rejected."""
+        with pytest.raises(ValueError):
+            ReportOptions(compress_level=0)
@@ -0,0 +1,38 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+"""Tests for the sampling profiler."""
+import time
+from src.core.sampling import SamplingProfiler
+
+
+def _busy_loop(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(100))
+
+
+class TestSamplingProfiler:
+    """Tests for SamplingProfiler."""
+
+    def test_samples_the_calling_thread(self, tmp_path):
+        """Stacks of the profiled thread are written root first in the collapsed format."""
+        with SamplingProfiler(interval=0.001) as sampler:
+            _busy_loop(0.2)
+        assert sampler.sample_count > 0
+
+        path = tmp_path / "run_profile.folded"
+        sampler.write(str(path))
+        lines = path.read_text(encoding="utf-8").splitlines()
+        stack, count = lines[0].rsplit(" ", 1)
+        assert int(count) >= 1
+        assert any("_busy_loop (test_sampling.py:" in line for line in lines)
+        assert all(line.index("test_samples_the_calling_thread") < line.index("_busy_loop")
+                   for line in lines if "_busy_loop" in line)
+
+    def test_delay_skips_fast_runs(self):
+        """With a delay longer than the run nothing is sampled."""
+        with SamplingProfiler(interval=0.001, delay=60) as sampler:
+            _busy_loop(0.05)
+        assert sampler.sample_count == 0
+        assert not sampler._thread.is_alive()
@@ -0,0 +1,163 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+"""Tests for the watcher file scheduler."""
+import pytest
+import watcher
+from src.watch.daemon import InFlightBudget, ThroughputStats
+from src.watch.scheduler import CostModel, FileScheduler, POLICY_FAIR, POLICY_FIFO, POLICY_SJF
+
+
+def _drain(scheduler):
+    order = []
+    while scheduler:
+        order.append(scheduler.pop()[0])
+    return order
+
+
+class TestCostModel:
+    """Tests for CostModel."""
+
+    def test_first_sample_replaces_defaults(self):
+        """The first measurement is taken as-is."""
+        model = CostModel()
+        model.record(size_bytes=1000, rows=10, seconds=2)
+        assert model.bytes_per_row == 100
+        assert model.rows_per_second == 5
+        assert model.estimate_seconds(1000) == pytest.approx(2)
+
+    def test_later_samples_are_smoothed(self):
+        """Later measurements move the estimate part of the way."""
+        model = CostModel(smoothing=0.5)
+        model.record(1000, 10, 1)
+        model.record(2000, 10, 1)
+        assert model.bytes_per_row == 150
+
+    def test_empty_measurements_are_ignored(self):
+        """Files without rows or time do not skew the model."""
+        model = CostModel()
+        model.record(1000, 0, 1)
+        model.record(0, 500, 1.2)
+        assert model.samples == 0
+        assert model.bytes_per_row > 0
+
+
+class TestFileScheduler:
+    """Tests for FileScheduler policies."""
+
+    def test_sjf_orders_by_size(self):
+        """Shortest job first dispatches small files before big ones."""
+        scheduler = FileScheduler(POLICY_SJF)
+        scheduler.push("huge.csv", 400_000_000)
+        scheduler.push("fix.csv", 2_000)
+        scheduler.push("medium.csv", 5_000_000)
+        assert _drain(scheduler) == ["fix.csv", "medium.csv", "huge.csv"]
+
+    def test_fifo_keeps_arrival_order(self):
+        """FIFO ignores size."""
+        scheduler = FileScheduler(POLICY_FIFO)
+        scheduler.push("huge.csv", 400_000_000)
+        scheduler.push("fix.csv", 2_000)
+        assert _drain(scheduler) == ["huge.csv", "fix.csv"]
+
+    def test_fair_alternates_between_tenants(self):
+        """A tenant with many files does not monopolise dispatch."""
+        scheduler = FileScheduler(POLICY_FAIR)
+        for index in range(3):
+            scheduler.push(f"a/{index}.csv", 1_000, group="a")
+        scheduler.push("b/0.csv", 1_000, group="b")
+        order = _drain(scheduler)
+        assert order.index("b/0.csv") <= 1
+
+    def test_fair_balances_by_estimated_work(self):
+        """A tenant that received a large job waits while another catches up."""
+        scheduler = FileScheduler(POLICY_FAIR)
+        scheduler.push("a/big.csv", 10_000_000, group="a")
+        scheduler.push("a/small.csv", 1_000, group="a")
+        scheduler.push("b/one.csv", 2_000, group="b")
+        scheduler.push("b/two.csv", 3_000, group="b")
+        scheduler.push("b/three.csv", 4_000, group="b")
+        assert _drain(scheduler) == ["a/small.csv", "b/one.csv", "a/big.csv", "b/two.csv", "b/three.csv"]
+
+    def test_duplicate_push_is_ignored(self):
+        """A file is queued at most once."""
+        scheduler = FileScheduler()
+        scheduler.push("a.csv", 10)
+        scheduler.push("a.csv", 10)
+        assert len(scheduler) == 1
+
+    def test_unknown_policy_rejected(self):
+        """Invalid policy names raise ValueError."""
+        with pytest.raises(ValueError):
+            FileScheduler("random")
+
+    def test_pop_from_empty_raises(self):
+        """Popping with nothing queued raises IndexError."""
+        with pytest.raises(IndexError):
+            FileScheduler().pop()
+
+
+class _FakePool:
+    """Accepts every file and counts them as in flight."""
+
+    def __init__(self, workers=2):
+        self.workers = workers
+        self.in_flight = 0
+        self.submitted = []
+
+    def submit(self, file):
+        self.submitted.append(file)
+        self.in_flight += 1
+        return True
+
+
+class TestWatcherDispatch:
+    """Tests for how the watcher dispatches files and accounts for finished ones."""
+
+    def test_tail_file_queued_empty_is_measured_when_done(self, tmp_path, monkeypatch):
+        """A file queued at 0 bytes is admitted at its current size and recorded at its final size."""
+        monkeypatch.setattr(watcher, "watch_directory", str(tmp_path))
+        path = tmp_path / "growing.csv"
+        path.write_bytes(b"")
+        scheduler = FileScheduler()
+        budget = InFlightBudget(max_bytes=10 ** 9)
+        active_files = {"growing.csv": (0, 0.0)}
+        scheduler.push("growing.csv", 0)
+        path.write_bytes(b"x" * 30_000)
+
+        watcher.dispatch_queued_files(scheduler, budget, _FakePool(), active_files)
+        assert budget.bytes == 30_000
+        watcher.record_finished_file("growing.csv", {"rows": 500, "bytes": 60_000}, 1.2, active_files,
+                                     budget, scheduler.cost_model, ThroughputStats())
+        assert budget.bytes == 0
+        assert scheduler.cost_model.bytes_per_row == 120
+
+        scheduler.push("next.csv", 1_000)
+        assert scheduler.pop()[0] == "next.csv"
+
+    def test_unmeasured_size_does_not_break_estimates(self):
+        """A finished file without a known size leaves the cost model usable."""
+        scheduler = FileScheduler()
+        watcher.record_finished_file("gone.csv", {"rows": 500, "bytes": 0}, 1.2, {}, InFlightBudget(),
+                                     scheduler.cost_model, ThroughputStats())
+        scheduler.push("next.csv", 1_000)
+        assert scheduler.pop()[0] == "next.csv"
+
+    def test_small_file_queued_after_large_ones_starts_next(self, tmp_path, monkeypatch):
+        """Only idle workers get files, so a correction overtakes every large file still queued."""
+        monkeypatch.setattr(watcher, "watch_directory", str(tmp_path))
+        scheduler = FileScheduler()
+        budget = InFlightBudget()
+        pool = _FakePool(workers=2)
+        active_files = {}
+        for index in range(6):
+            scheduler.push(f"export{index}.csv", 400_000_000)
+        watcher.dispatch_queued_files(scheduler, budget, pool, active_files)
+        assert len(pool.submitted) == 2
+
+        scheduler.push("fix.csv", 2_000)
+        watcher.dispatch_queued_files(scheduler, budget, pool, active_files)
+        assert len(pool.submitted) == 2
+        pool.in_flight -= 1
+        watcher.dispatch_queued_files(scheduler, budget, pool, active_files)
+        assert pool.submitted[-1] == "fix.csv"
@@ -0,0 +1,78 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+"""Tests for splitting files into chunks while they are validated."""
+import time
+import pytest
+import batch
+from src.core.engine import validate_path
+from src.core.splitter import ChunkWriter, SplitOptions
+
+HEADER = "userId,externalId,voucherType,voucherName,iconName,code,expiration"
+
+
+def _read(path):
+    with open(path, encoding="utf-8", newline="") as file:
+        return file.read()
+
+
+class TestChunkWriter:
+    """Tests for ChunkWriter."""
+
+    def test_row_limit(self, tmp_path):
+        """Each chunk holds at most max_rows records after the header."""
+        writer = ChunkWriter(str(tmp_path), "data.csv", "a,b\n", max_rows=2)
+        for number in range(5):
+            writer.write(f"{number},x")
+        paths = writer.close()
+        assert [path.rsplit("/", 1)[-1] for path in paths] == [
+            "data_part0001.csv", "data_part0002.csv", "data_part0003.csv"]
+        assert [_read(path) for path in paths] == ["a,b\n0,x\n1,x\n", "a,b\n2,x\n3,x\n", "a,b\n4,x\n"]
+
+    def test_size_limit(self, tmp_path):
+        """Chunks stay within max_bytes, header included; a record too large for any chunk gets its own."""
+        writer = ChunkWriter(str(tmp_path), "data.csv", "a,b", max_bytes=12)
+        for record in ["1,é", "2,y", "3," + "z" * 20, "4,w"]:
+            writer.write(record)
+        contents = [_read(path) for path in writer.close()]
+        assert contents == ["a,b\n1,é\n", "a,b\n2,y\n", "a,b\n3," + "z" * 20 + "\n", "a,b\n4,w\n"]
+        assert len(contents[0].encode("utf-8")) <= 12
+
+    def test_discard_removes_chunks(self, tmp_path):
+        """discard() deletes every chunk written so far."""
+        writer = ChunkWriter(str(tmp_path), "data.csv", "a,b\n", max_rows=1)
+        writer.write("1,x")
+        writer.write("2,y")
+        writer.discard()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_a_limit_is_required(self, tmp_path):
+        """SplitOptions rejects a split without limits."""
+        with pytest.raises(ValueError):
+            SplitOptions(str(tmp_path))
+
+
+def test_validate_path_splits_with_quoting_preserved(tmp_path):
+    """Records are copied to the chunks exactly as written, while the file is validated."""
+    future_ts = str(int((time.time() + 30 * 86400) * 1000))
+    records = [f'u1,,one_time,"Sale, summer",basket,CODE1,{future_ts}',
+               f'u2,,one_time,"Two\nlines",basket,CODE2,{future_ts}',
+               f'u3,,one_time,Sale,basket,CODE3,{future_ts}']
+    source = tmp_path / "vouchers.csv"
+    source.write_text(HEADER + "\n" + "\n".join(records) + "\n\n", encoding="utf-8")
+    result = validate_path(str(source), split=SplitOptions(str(tmp_path / "chunks"), max_rows=2))
+    assert result["row_count"] == 3
+    assert [_read(path) for path in result["chunks"]] == [
+        HEADER + "\n" + records[0] + "\n" + records[1] + "\n", HEADER + "\n" + records[2] + "\n"]
+
+
+def test_batch_split_rows(tmp_path, capsys):
+    """batch.py --split-rows writes the chunks to --split-dir and lists them in the result."""
+    future_ts = str(int((time.time() + 30 * 86400) * 1000))
+    source = tmp_path / "vouchers.csv"
+    source.write_text(HEADER + "\n" + "".join(f"u{number},,one_time,Sale,basket,C{number},{future_ts}\n"
+                                              for number in range(3)))
+    chunks = tmp_path / "out"
+    assert batch.main([str(source), "--split-rows", "2", "--split-dir", str(chunks)]) == batch.EXIT_VALID
+    assert sorted(path.name for path in chunks.iterdir()) == ["vouchers_part0001.csv", "vouchers_part0002.csv"]
+    assert '"chunks"' in capsys.readouterr().out
@@ -0,0 +1,85 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+"""Tests for reading CSV files that are still being written."""
+import csv
+import io
+import os
+import time
+from src.watch.tail import RecordTail
+
+
+def _append(path, data):
+    with open(path, 'ab') as file:
+        file.write(data)
+
+
+def _age(path, seconds=10):
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+class TestRecordTail:
+    """Tests for RecordTail."""
+
+    def test_partial_line_is_held_back(self, tmp_path):
+        """Only newline-terminated lines are handed out until the file is finished."""
+        path = tmp_path / "growing.csv"
+        _append(path, b"userId,code\nu1,AB")
+        tail = RecordTail(str(path))
+        assert tail.read_complete() == "userId,code\n"
+        _append(path, b"C\nu2,")
+        assert tail.read_complete() == "u1,ABC\n"
+        assert tail.read_complete() == ""
+        _append(path, b"XYZ")
+        assert tail.finish() == "u2,XYZ"
+
+    def test_bom_is_stripped_and_reported(self, tmp_path):
+        """A leading BOM is detected even when it arrives split across reads."""
+        path = tmp_path / "bom.csv"
+        _append(path, b"\xef\xbb")
+        tail = RecordTail(str(path))
+        assert tail.read_complete() == ""
+        _append(path, b"\xbfuserId\n")
+        assert tail.read_complete() == "userId\n"
+        assert tail.has_bom
+
+    def test_multibyte_character_split_across_reads(self, tmp_path):
+        """UTF-8 sequences cut by a read boundary are decoded once complete."""
+        path = tmp_path / "utf8.csv"
+        data = "name\nJosé\n".encode("utf-8")
+        _append(path, data[:-2])
+        tail = RecordTail(str(path))
+        assert tail.read_complete() == "name\n"
+        _append(path, data[-2:])
+        assert tail.read_complete() == "José\n"
+
+    def test_invalid_utf8_switches_to_latin1(self, tmp_path):
+        """The tail switches to ISO-8859-1 at the first invalid byte and reports its file offset."""
+        path = tmp_path / "latin1.csv"
+        _append(path, b"\xef\xbb\xbf" + "name\nJosé\nRené\n".encode("latin-1"))
+        tail = RecordTail(str(path), chunk_size=4)
+        text = tail.finish()
+        assert text == "name\nJosé\nRené\n"
+        assert tail.fallback_offset == 11
+
+    def test_iter_lines_matches_csv_reader(self, tmp_path):
+        """Rows parsed from the tail equal a csv.reader over the finished file, multi-line fields included."""
+        path = tmp_path / "quoted.csv"
+        content = 'a,b\r\n1,"line one\r\nline two"\r\n2,"say ""hi"""\r\n\r\n3,last'
+        _append(path, content.encode("utf-8"))
+        _age(path)
+        tail = RecordTail(str(path), chunk_size=7)
+        rows = list(csv.reader(tail.iter_lines(stable_seconds=1, poll_seconds=0)))
+        assert rows == list(csv.reader(io.StringIO(content, newline=None)))
+
+    def test_is_complete_waits_for_quiet_period(self, tmp_path):
+        """A freshly written file is not complete; an old, fully read one is."""
+        path = tmp_path / "done.csv"
+        _append(path, b"a\n1\n")
+        tail = RecordTail(str(path))
+        assert not tail.is_complete(stable_seconds=5)
+        tail.read_complete()
+        assert not tail.is_complete(stable_seconds=5)
+        _age(path)
+        assert tail.is_complete(stable_seconds=5)
@@ -0,0 +1,67 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+"""Tests for the hybrid CSV tokenizer."""
+import csv
+import io
+import pytest
+from src.core import tokenizer
+from src.core.tokenizer import iter_block_records, iter_csv_rows, split_csv_text
+
+SAMPLES = [
+    "userId,code\nu1,A\nu2,B\n",
+    "userId,code\nu1,A\n\n\nu2,B",
+    'userId,name\nu1,"Smith, John"\nu2,plain\n',
+    'userId,name\nu1,"line one\nline two"\nu2,"say ""hi"""\nu3,x\n',
+    'a;b\n1;"2;3"\n4;5\n',
+    'a,b\n1,x"y\n2,"unterminated\n3,z\n',
+    ",,\n, ,\n",
+    "",
+]
+
+
+def _csv_rows(text, delimiter=','):
+    return list(csv.reader(io.StringIO(text, newline=None), delimiter=delimiter))
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+@pytest.mark.parametrize("delimiter", [",", ";"])
+def test_split_csv_text_matches_csv_reader(text, delimiter):
+    """Quote-free and quoted lines alike give exactly the csv module's rows."""
+    assert split_csv_text(text, delimiter) == _csv_rows(text, delimiter)
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_iter_csv_rows_matches_csv_reader_across_batches(text, monkeypatch):
+    """Quoted fields spanning a batch boundary continue into the next lines."""
+    monkeypatch.setattr(tokenizer, "BATCH_LINES", 2)
+    assert list(iter_csv_rows(io.StringIO(text, newline=None))) == _csv_rows(text)
+
+
+def test_carriage_returns_are_left_to_the_csv_module():
+    """A bare carriage return raises the same error as csv.reader."""
+    with pytest.raises(csv.Error) as expected:
+        list(csv.reader(["a\rb\n"]))
+    with pytest.raises(csv.Error) as actual:
+        split_csv_text("a\rb\n")
+    assert str(actual.value) == str(expected.value)
+
+
+def test_field_size_limit_is_enforced():
+    """Oversized unquoted fields raise the csv module's error."""
+    limit = csv.field_size_limit(10)
+    try:
+        assert split_csv_text("a,0123456789\n") == [["a", "0123456789"]]
+        with pytest.raises(csv.Error, match="field larger than field limit"):
+            split_csv_text("a,01234567890\n")
+    finally:
+        csv.field_size_limit(limit)
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_iter_block_records_keeps_record_text(text):
+    """Records come with their text as written, even when a quoted field spans blocks."""
+    records = list(iter_block_records(text.splitlines(keepends=True)))
+    assert [row for row, _text in records] == _csv_rows(text)
+    expected = text if text.endswith("\n") or not text else text + "\n"
+    assert "".join(record_text + "\n" for _row, record_text in records) == expected
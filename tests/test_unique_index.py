@@ -0,0 +1,70 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+"""Tests for UniqueValueIndex and duplicate voucher values across files."""
+import time
+from src.core.engine import validate_dataset
+from src.core.error_codes import classify_error
+from src.core.unique_index import UniqueValueIndex
+
+HEADER = "userId,externalId,voucherType,voucherName,iconName,code,expiration\n"
+
+
+class TestUniqueValueIndex:
+    """Tests for UniqueValueIndex."""
+
+    def test_repeats_are_found_across_growth(self):
+        """Every value is new once and found with its first row afterwards, after the table has grown."""
+        index = UniqueValueIndex()
+        assert all(index.check(f"code{number}", number) is None for number in range(5000))
+        assert len(index) == 5000
+        assert index.check("code1234", 9000) == (0, 1234, True)
+        assert index.check("code1234", 9001) == (0, 1234, False)
+        index.close()
+
+    def test_fingerprint_matches_are_confirmed_exactly(self, monkeypatch):
+        """Different values with the same fingerprint are not duplicates."""
+        index = UniqueValueIndex()
+        monkeypatch.setattr("src.core.unique_index.hash", lambda value: 42, raising=False)
+        assert index.check("a", 2) is None
+        assert index.check("b", 3) is None
+        assert index.check("b", 4) == (0, 3, True)
+        index.close()
+
+    def test_sources(self):
+        """The first occurrence names the source it was seen in."""
+        index = UniqueValueIndex()
+        first = index.source("a.csv")
+        second = index.source("b.csv")
+        assert index.check("x", 2, first) is None
+        assert index.check("x", 7, second) == (first, 2, True)
+        assert index.source_name(first) == "a.csv"
+        index.close()
+
+    def test_error_code(self):
+        """Duplicate messages have a stable code and the column they name."""
+        assert classify_error("Column 'code' has a duplicate value: X (first in row 2)") == ("duplicate_value", "code")
+
+
+def test_duplicates_across_voucher_files(tmp_path):
+    """validate_dataset() reports a code that an earlier voucher file already used, and that file's row."""
+    future_ts = str(int((time.time() + 30 * 86400) * 1000))
+    first = tmp_path / "a.csv"
+    second = tmp_path / "b.csv"
+    first.write_text(HEADER + f"u1,,one_time,Sale,basket,CODE1,{future_ts}\n")
+    second.write_text(HEADER + f"u2,,one_time,Sale,basket,CODE2,{future_ts}\n"
+                      + f"u3,,one_time,Sale,basket,CODE1,{future_ts}\n")
+    results = list(validate_dataset([str(first), str(second)]))
+    # a.csv's result is held back until b.csv is checked, so its repeated row makes it invalid too
+    assert results[0]["status"] == "invalid"
+    assert results[0]["error_count"] == 1
+    assert results[0]["errors"] == [{"row": 2, "column": "code", "code": "duplicate_value",
+                                     "message": "Column 'code' has a duplicate value: CODE1 (repeated in row 3 of b.csv)"}]
+    assert results[1]["status"] == "invalid"
+    assert results[1]["errors"] == [{"row": 3, "column": "code", "code": "duplicate_value",
+                                     "message": "Column 'code' has a duplicate value: CODE1 (first in row 2 of a.csv)"}]
+    # The dataset result lists the same row
+    assert results[2]["dataset"] is True
+    assert results[2]["errors"] == [{"file": str(first), "row": 2, "column": "code", "code": "duplicate_value",
+                                     "message": "Column 'code' has a duplicate value: CODE1 (repeated in row 3 of b.csv)"}]
+    assert len(results) == 3
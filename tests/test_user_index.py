@@ -0,0 +1,168 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+"""Tests for the userId indexes and the cross-file userId check."""
+import io
+import json
+import pytest
+import batch
+from src.core.engine import validate_dataset
+from src.core.user_index import UserIdIndex, UserIdFile
+
+CONTACTS = ("userId,shouldJoin,joinDate,tierName,tierEntryAt,tierCalcAt,shouldReward\n"
+            "u1,TRUE,1739195044079,Gold,,,FALSE\n"
+            "u2,TRUE,1739195044079,Gold,,,TRUE\n")
+POINTS = ("userId,pointsToSpend,statusPoints,cashback,allocatedAt,expireAt,setPlanExpiration,reason,title,description\n"
+          "u1,10,0,0,1739195044079,,TRUE,reason,title,description\n"
+          "u3,10,0,0,1739195044079,,TRUE,reason,title,description\n")
+
+
+def _write(directory, name, content):
+    path = directory / name
+    path.write_bytes(content.encode("utf-8"))
+    return str(path)
+
+
+class TestUserIdIndex:
+    """Tests for UserIdIndex."""
+
+    def test_add_and_lookup_across_growth(self):
+        """Every added userId is found after the table has grown several times; others are not."""
+        index = UserIdIndex()
+        assert all(index.add(f"user{number}") for number in range(20000))
+        assert len(index) == 20000
+        assert index.nbytes >= 20000 * 8
+        assert all(f"user{number}" in index for number in range(20000))
+        assert not any(f"other{number}" in index for number in range(20000))
+
+    def test_duplicates_are_not_added_twice(self):
+        """add() reports a userId that is already present."""
+        index = UserIdIndex()
+        assert index.add("u1")
+        assert not index.add("u1")
+        assert len(index) == 1
+
+    def test_expected_size_preallocates(self):
+        """A size hint avoids growing while the index is filled."""
+        index = UserIdIndex(expected=5000)
+        nbytes = index.nbytes
+        for number in range(5000):
+            index.add(str(number))
+        assert index.nbytes == nbytes
+
+
+class TestUserIdFile:
+    """Tests for UserIdFile."""
+
+    def test_persists_across_opens(self, tmp_path):
+        """userIds added and closed are found when the file is opened again."""
+        path = str(tmp_path / "users.uidx")
+        with UserIdFile(path) as index:
+            for number in range(3000):
+                index.add(f"user{number}")
+            assert "user10" in index
+        assert (tmp_path / "users.uidx").stat().st_size == len(UserIdFile.MAGIC) + 8 + 3000 * 8
+
+        with UserIdFile(path) as index:
+            assert len(index) == 3000
+            assert all(f"user{number}" in index for number in range(3000))
+            assert "user3000" not in index
+
+    def test_appends_add_runs_and_compact_merges_them(self, tmp_path):
+        """Each flush appends one sorted run of new userIds only; compact() merges the runs."""
+        path = str(tmp_path / "users.uidx")
+        with UserIdFile(path) as index:
+            index.add("a")
+            index.add("b")
+        with UserIdFile(path) as index:
+            assert not index.add("a")
+            assert index.add("c")
+            index.flush()
+            assert index.runs == 2
+            index.compact()
+            assert index.runs == 1
+            assert len(index) == 3
+            assert all(user_id in index for user_id in "abc")
+
+    def test_run_cut_short_is_ignored(self, tmp_path):
+        """A partially written run is skipped and overwritten by the next append."""
+        path = tmp_path / "users.uidx"
+        with UserIdFile(str(path)) as index:
+            index.add("a")
+        with open(path, "ab") as file:
+            file.write((5).to_bytes(8, "little") + b"partial")
+        with UserIdFile(str(path)) as index:
+            assert len(index) == 1
+            index.add("b")
+        with UserIdFile(str(path)) as index:
+            assert index.runs == 2
+            assert "a" in index and "b" in index
+
+    def test_rejects_other_files(self, tmp_path):
+        """A file without the magic is not taken for an index."""
+        path = tmp_path / "contacts.csv"
+        path.write_bytes(b"userId,shouldJoin\n")
+        with pytest.raises(ValueError):
+            UserIdFile(str(path))
+
+    def test_later_batches_are_checked_without_contacts(self, tmp_path):
+        """batch.py --user-index indexes a contacts run and checks a later points-only run against it."""
+        index_path = str(tmp_path / "tenant.uidx")
+        contacts = _write(tmp_path, "contacts.csv", CONTACTS)
+        points = _write(tmp_path, "points.csv", POINTS)
+        assert batch.main([contacts, "--user-index", index_path]) == batch.EXIT_VALID
+
+        output = io.StringIO()
+        with UserIdFile(index_path) as user_index:
+            batch.run([points], output=output, user_index=user_index)
+        assert json.loads(output.getvalue())["unknown_user_ids"] == 1
+
+
+class TestValidateDataset:
+    """Tests for validate_dataset."""
+
+    def test_unknown_user_ids_are_reported(self, tmp_path):
+        """Contacts are validated first and points rows with unknown userIds fail."""
+        points = _write(tmp_path, "points.csv", POINTS)
+        contacts = _write(tmp_path, "contacts.csv", CONTACTS)
+        results = list(validate_dataset([points, contacts]))
+
+        assert [result["file"] for result in results] == [contacts, points]
+        assert results[0]["status"] == "valid"
+        assert results[1]["unknown_user_ids"] == 1
+        unknown = [error for error in results[1]["errors"] if error["code"] == "unknown_user_id"]
+        assert [(error["row"], error["column"]) for error in unknown] == [(3, "userId")]
+
+    def test_bom_contacts_file_is_indexed(self, tmp_path):
+        """A contacts file starting with a BOM is still recognised, so orphaned userIds are found."""
+        points = _write(tmp_path, "points.csv", POINTS)
+        contacts = _write(tmp_path, "contacts.csv", "\ufeff" + CONTACTS)
+        results = list(validate_dataset([points, contacts]))
+
+        assert [result["file"] for result in results] == [contacts, points]
+        assert results[0]["csv_type"] == "Contacts"
+        assert results[1]["unknown_user_ids"] == 1
+
+    def test_without_contacts_files_are_checked_alone(self, tmp_path):
+        """Without a contacts file there is no userId check."""
+        results = list(validate_dataset([_write(tmp_path, "points.csv", POINTS)]))
+        assert "unknown_user_ids" not in results[0]
+
+    def test_failed_contacts_file_keeps_persisted_index(self, tmp_path):
+        """A contacts file that fails leaves the persisted userIds in use and adds none of its own."""
+        index_path = str(tmp_path / "tenant.uidx")
+        with UserIdFile(index_path) as user_index:
+            user_index.add("u1")
+        # The short last row makes the contacts validator raise after u2 was read
+        contacts = _write(tmp_path, "contacts.csv", CONTACTS.replace("u1,", "u9,") + "u4,TRUE\n")
+        points = _write(tmp_path, "points.csv", POINTS.replace("u3,", "u2,") + POINTS.splitlines(True)[2])
+
+        with UserIdFile(index_path) as user_index:
+            results = list(validate_dataset([points, contacts], user_index=user_index))
+        assert results[0]["status"] == "failed"
+        assert results[1]["unknown_user_ids"] == 2
+        assert [error["row"] for error in results[1]["errors"] if error["code"] == "unknown_user_id"] == [3, 4]
+
+        with UserIdFile(index_path) as user_index:
+            assert "u1" in user_index
+            assert "u2" not in user_index and "u9" not in user_index
@@ -0,0 +1,69 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+"""Tests for the per-user points totals."""
+import csv
+from decimal import Decimal
+import batch
+from src.points.points_csv_validator import PointsValidator
+from src.points.user_totals import UserTotals, TOTALS_COLUMNS
+
+HEADER = "userId,pointsToSpend,statusPoints,cashback,allocatedAt,expireAt,setPlanExpiration,reason,title,description\n"
+
+
+def _read(path):
+    with open(path, newline='', encoding='utf-8') as file:
+        return list(csv.reader(file))
+
+
+class TestUserTotals:
+    """Tests for UserTotals."""
+
+    def test_partial_sums_spilled_to_disk_are_merged(self, tmp_path):
+        """Totals of users spilled in several runs add up to the same result as in memory."""
+        totals = UserTotals(max_users=3)
+        for number in range(40):
+            totals.add(f"u{number % 7}", "10", "", "2")
+        assert totals.spills > 0
+        path = tmp_path / "totals.csv"
+        assert totals.write(path) == 7
+        rows = _read(path)
+        assert rows[0] == TOTALS_COLUMNS
+        assert rows[1] == ["u0", "60", "0", "12", "6"]
+        assert sum(int(row[4]) for row in rows[1:]) == 40
+        totals.close()
+
+    def test_cashback_is_exact(self):
+        """Cashback that is not a whole number is summed exactly."""
+        totals = UserTotals(max_users=1)
+        for _ in range(10):
+            totals.add("u1", "", "", "1e-1")
+        totals.add("u2", "", "5", "")
+        assert list(totals) == [("u1", [0, 0, Decimal("1.0"), 10]), ("u2", [0, 5, 0, 1])]
+        totals.close()
+
+
+def test_validator_writes_totals_of_valid_rows(tmp_path):
+    """PointsValidator with a totals_path sums only the rows that pass validation."""
+    csv_path = tmp_path / "points.csv"
+    csv_path.write_text(HEADER
+                        + "u1,10,5,1,,,TRUE,reason,title,description\n"
+                        + "u1,1.5,0,0,,,TRUE,reason,title,description\n"
+                        + "u2,7,0,0,,,TRUE,reason,title,description\n"
+                        + "u1,3,0,0,,,TRUE,reason,title,description\n")
+    validator = PointsValidator(str(csv_path), None)
+    validator.totals_path = str(tmp_path / "totals.csv")
+    assert validator.validate() is False
+    assert _read(validator.totals_path)[1:] == [["u1", "13", "5", "1", "2"], ["u2", "7", "0", "0", "1"]]
+    assert validator.user_totals is None
+
+
+def test_batch_totals_span_points_files(tmp_path):
+    """batch.py --points-totals sums a user's rows over all points files."""
+    first = tmp_path / "a.csv"
+    second = tmp_path / "b.csv"
+    first.write_text(HEADER + "u1,10,0,0,,,TRUE,reason,title,description\n")
+    second.write_text(HEADER + "u1,5,0,0,,,TRUE,reason,title,description\n")
+    totals_path = tmp_path / "totals.csv"
+    assert batch.main([str(first), str(second), "--points-totals", str(totals_path)]) == batch.EXIT_VALID
+    assert _read(totals_path)[1:] == [["u1", "15", "0", "0", "2"]]
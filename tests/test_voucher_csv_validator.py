@@ -153,3 +153,49 @@ class TestVoucherValidatorRowValidation:
         valid, message, timestamp_errors = validator._validate_row(row)
         assert valid is False
         assert "comma" in message.lower() or "quote" in message.lower()
+
+
+class TestVoucherValidatorErrorRecording:
+    """Tests for how VoucherValidator.validate records failing rows."""
+
+    def _validate(self, tmp_path, rows):
+        csv_path = tmp_path / "vouchers.csv"
+        csv_path.write_text("userId,externalId,voucherType,voucherName,iconName,code,expiration\n"
+                            + "".join(row + "\n" for row in rows))
+        validator = VoucherValidator(csv_path=str(csv_path), log_path=None)
+        return validator, validator.validate()
+
+    def test_each_failing_row_is_recorded_once_with_category(self, tmp_path):
+        """Timestamp-only and data failures are recorded once each and tagged with their category."""
+        future_ts = str(int((time.time() + 30 * 86400) * 1000))
+        validator, is_valid = self._validate(tmp_path, [
+            "u1,,one_time,Sale,basket,CODE1,1.5",
+            f"u2,,weekly,Sale,basket,CODE2,{future_ts}",
+            "u3,,weekly,Sale,basket,CODE3,1.5",
+        ])
+        assert is_valid is False
+        assert [(e["row"], e["category"]) for e in validator.validation_error_details] == [
+            (2, "timestamp"), (3, "data"), (4, "data")]
+        assert validator.timestamp_error_count == 1
+        assert validator.validation_error_count == 2
+
+    def test_duplicate_codes_and_external_ids(self, tmp_path):
+        """Repeated codes and externalIds are errors on the repeating rows; the first row is recorded once."""
+        future_ts = str(int((time.time() + 30 * 86400) * 1000))
+        validator, is_valid = self._validate(tmp_path, [
+            f"u1,,one_time,Sale,basket,CODE1,{future_ts}",
+            f",e1,one_time,Sale,basket,CODE2,{future_ts}",
+            f"u2,,one_time,Sale,basket,CODE1,{future_ts}",
+            f",e1,one_time,Sale,basket,CODE3,{future_ts}",
+            f"u3,,one_time,Sale,basket,CODE1,{future_ts}",
+        ])
+        assert is_valid is False
+        assert [(e["row"], e["message"]) for e in validator.validation_error_details] == [
+            (2, "Column 'code' has a duplicate value: CODE1 (repeated in row 4)"),
+            (4, "Column 'code' has a duplicate value: CODE1 (first in row 2)"),
+            (3, "Column 'externalId' has a duplicate value: e1 (repeated in row 5)"),
+            (5, "Column 'externalId' has a duplicate value: e1 (first in row 3)"),
+            (6, "Column 'code' has a duplicate value: CODE1 (first in row 2)"),
+        ]
+        # The notes on rows 2 and 3 do not count them as further failing rows
+        assert validator.validation_error_count == 3
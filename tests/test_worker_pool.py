@@ -0,0 +1,162 @@
+# SPDX-FileCopyrightText: 2026 SAP Engagement Cloud
+# SPDX-License-Identifier: MIT
+
+"""Tests for the watcher worker pool."""
+import os
+import signal
+import time
+import pytest
+from src.watch.worker_pool import WorkerPool, EVENT_STARTED, EVENT_FINISHED
+
+
+def _square(value):
+    return value * value
+
+
+def _slow_square(value):
+    time.sleep(0.5)
+    return value * value
+
+
+def _fail(value):
+    raise ValueError(f"bad value {value}")
+
+
+def _wait_started(pool, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        for event, worker_id, *_ in pool.poll(0.1):
+            if event == EVENT_STARTED:
+                return worker_id
+    raise AssertionError("no item started")
+
+
+def _collect_finished(pool, expected, timeout=10):
+    finished = {}
+    deadline = time.time() + timeout
+    while len(finished) < expected and time.time() < deadline:
+        for event, _worker_id, item, result, _elapsed in pool.poll(0.1):
+            if event == EVENT_FINISHED:
+                finished[item] = result
+    return finished
+
+
+class TestWorkerPool:
+    """Tests for WorkerPool."""
+
+    def test_runs_submitted_items(self):
+        """Every submitted item is processed exactly once."""
+        pool = WorkerPool(_square, workers=2, queue_size=4)
+        try:
+            for value in range(4):
+                assert pool.submit(value) is True
+            finished = _collect_finished(pool, 4)
+            assert finished == {0: 0, 1: 1, 2: 4, 3: 9}
+            assert pool.in_flight == 0
+        finally:
+            pool.close()
+
+    def test_submit_refuses_when_queue_is_full(self):
+        """A full queue hands the item back instead of blocking."""
+        pool = WorkerPool(_square, workers=1, queue_size=1)
+        try:
+            accepted = [pool.submit(value) for value in range(50)]
+            assert accepted[0] is True
+            assert False in accepted
+            _collect_finished(pool, accepted.count(True))
+        finally:
+            pool.close()
+
+    def test_task_exception_is_returned(self):
+        """Exceptions raised by the task come back as the result."""
+        pool = WorkerPool(_fail, workers=1)
+        try:
+            pool.submit(7)
+            finished = _collect_finished(pool, 1)
+            assert isinstance(finished[7], ValueError)
+        finally:
+            pool.close()
+
+    def test_status_reports_idle_workers(self):
+        """Idle workers are reported as None."""
+        pool = WorkerPool(_square, workers=2)
+        try:
+            assert pool.status() == {1: None, 2: None}
+        finally:
+            pool.close()
+
+    def test_started_event_precedes_finished(self):
+        """Workers announce an item before reporting its result."""
+        pool = WorkerPool(_square, workers=1)
+        try:
+            pool.submit(3)
+            events = []
+            deadline = time.time() + 10
+            while EVENT_FINISHED not in events and time.time() < deadline:
+                events.extend(event for event, *_ in pool.poll(0.1))
+            assert events.index(EVENT_STARTED) < events.index(EVENT_FINISHED)
+        finally:
+            pool.close()
+
+    @pytest.mark.skipif(not hasattr(signal, "SIGKILL"), reason="POSIX signals")
+    def test_sigterm_to_workers_drains_in_flight_items(self):
+        """A SIGTERM reaching the workers (e.g. sent to the process group) lets running items finish."""
+        pool = WorkerPool(_slow_square, workers=1)
+        try:
+            pool.submit(4)
+            worker_id = _wait_started(pool)
+            os.kill(pool._processes[worker_id].pid, signal.SIGTERM)
+            pool.begin_shutdown()
+            assert pool.submit(5) is False
+            assert _collect_finished(pool, 1) == {4: 16}
+            assert pool.in_flight == 0
+        finally:
+            pool.close()
+
+    @pytest.mark.skipif(not hasattr(signal, "SIGKILL"), reason="POSIX signals")
+    def test_workers_are_not_replaced_after_shutdown_begins(self):
+        """A worker that dies during shutdown fails its item and is not restarted."""
+        pool = WorkerPool(_slow_square, workers=2)
+        try:
+            pool.submit(3)
+            worker_id = _wait_started(pool)
+            pool.begin_shutdown()
+            process = pool._processes[worker_id]
+            os.kill(process.pid, signal.SIGKILL)
+            process.join(5)
+            finished = _collect_finished(pool, 1)
+            assert isinstance(finished[3], RuntimeError)
+            assert worker_id not in pool.status()
+            assert len(pool.status()) == 1
+        finally:
+            pool.close()
+
+    @pytest.mark.skipif(not hasattr(signal, "SIGKILL"), reason="POSIX signals")
+    def test_item_of_worker_dying_during_hand_off_is_handed_on(self):
+        """An item given to a worker that dies before announcing it runs on the replacement."""
+        pool = WorkerPool(_square, workers=1)
+        try:
+            process = pool._processes[1]
+            os.kill(process.pid, signal.SIGKILL)
+            process.join(5)
+            assert pool.submit(6) is True
+            assert _collect_finished(pool, 1) == {6: 36}
+            assert pool.in_flight == 0
+        finally:
+            pool.close()
+
+    @pytest.mark.skipif(not hasattr(signal, "SIGKILL"), reason="POSIX signals")
+    def test_dead_worker_fails_running_item_and_requeues_the_rest(self):
+        """The running item of a killed worker fails; items queued behind it still run."""
+        pool = WorkerPool(_slow_square, workers=1)
+        try:
+            pool.submit(2)
+            pool.submit(3)
+            worker_id = _wait_started(pool)
+            os.kill(pool._processes[worker_id].pid, signal.SIGKILL)
+            finished = _collect_finished(pool, 2)
+            assert isinstance(finished[2], RuntimeError)
+            assert finished[3] == 9
+            assert pool.in_flight == 0
+        finally:
+            pool.close()
@@ -1,21 +1,41 @@
 # SPDX-FileCopyrightText: 2024 SAP Engagement Cloud
 # SPDX-License-Identifier: MIT
 
+import io
 import os
 import sys
 import time
 import csv
+import shutil
+import argparse
+import fnmatch
+import functools
+import itertools
+import contextlib
 
-# Enable ANSI/VT100 color codes on Windows 10+
-if sys.platform == 'win32':
-    os.system('')
 from datetime import datetime
 from src.vouchers.voucher_csv_validator import VoucherValidator
 from src.contacts.contacts_csv_validator import ContactsValidator
 from src.points.points_csv_validator import PointsValidator
+from src.points.user_totals import TOTALS_EXTENSION
 from src.core.logger import Logger
+from src.core.profiling import Profiler, phase, lap
+from src.core.sampling import SamplingProfiler, PROFILE_EXTENSION
+from src.core.tokenizer import iter_csv_rows, iter_block_rows
+from src.core.report import (DetailsReport, ReportOptions, EXPORT_FORMATS, generate_unique_log_filename,
+                             reserve_log_filename, format_details_header, format_details_entry, log_base_name,
+                             open_report_file)
+from src.utils.file_utils import detect_csv_type, read_text_file
+from src.watch.file_events import create_watcher, list_files, ReadinessTracker
+from src.watch.scheduler import FileScheduler, POLICIES, POLICY_SJF
+from src.watch.daemon import InFlightBudget, ThroughputStats, ShutdownRequest
+from src.watch.worker_pool import WorkerPool, EVENT_STARTED
+from src.watch.tail import RecordTail
+from src.watch.pipeline import PipelineReader, DEFAULT_BATCH_BYTES, DEFAULT_QUEUE_DEPTH
 
 class Colors:
+    # Set NO_COLOR (https://no-color.org) to get plain output, e.g. under a process supervisor
+    ENABLED = not os.environ.get('NO_COLOR')
     GREEN = '\033[92m'
     RED = '\033[91m'
     YELLOW = '\033[93m'
@@ -25,9 +45,17 @@ class Colors:
     BOLD = '\033[1m'
     RESET = '\033[0m'
 
+def enable_windows_ansi():
+    """Enable ANSI/VT100 color codes on Windows 10+; done by main() so importing this module has no side effects."""
+    if sys.platform == 'win32':
+        os.system('')
+
 def colored_print(message, color=Colors.RESET):
     """Print message with color"""
-    print(f"{color}{message}{Colors.RESET}")
+    if Colors.ENABLED:
+        print(f"{color}{message}{Colors.RESET}")
+    else:
+        print(message)
 
 def print_header():
     """Print a welcome header with script information."""
@@ -52,24 +80,6 @@ def ensure_directories_exist():
                 colored_print(f"Error creating directory {directory}: {e}", Colors.RED)
                 raise
 
-print_header()
-
-ensure_directories_exist()
-
-colored_print(" Setting up directories...", Colors.BLUE)
-print(f"   Watch directory: {os.path.abspath(os.path.join('.', 'watch_folder'))}")
-print(f"   Success folder:  {os.path.abspath(os.path.join('.', 'watch_folder', 'success'))}")
-print(f"   Error folder:    {os.path.abspath(os.path.join('.', 'watch_folder', 'error'))}")
-print(f"   Logs folder:     {os.path.abspath(os.path.join('.', 'watch_folder', 'logs'))}")
-print()
-colored_print("Supported file types:", Colors.BLUE)
-print("   • Contacts CSV (userId, shouldJoin, joinDate, tierName, tierEntryAt, tierCalcAt, shouldReward)")
-print("   • Points CSV   (userId, pointsToSpend, statusPoints, cashback, allocatedAt, expireAt, setPlanExpiration, reason, title, description)")
-print("   • Vouchers CSV (userId, externalId, voucherType, voucherName, iconName, code, expiration)")
-print()
-colored_print(" To validate files: Drop your CSV files into the watch_folder directory", Colors.GREEN)
-print()
-colored_print(" Checking for existing CSV files in watch folder...", Colors.YELLOW)
 
 
 def generate_unique_filename(directory, original_name):
@@ -81,15 +91,12 @@ def generate_unique_filename(directory, original_name):
         counter += 1
     return new_name
 
-def _check_for_non_printable_start(file_path):
-    with open(file_path, 'rb') as file:
-        content = file.read()
-        
-    if content.startswith(b'\xef\xbb\xbf'):
+def _check_for_non_printable_start(content):
+    if content.startswith('\ufeff'):
         print(f"     UTF-8 BOM detected in file")
         colored_print(f"    BOM will be handled internally for validation", Colors.YELLOW)
         
-        cleaned_content = content[3:].decode('utf-8')
+        cleaned_content = content[1:]
         return False, "The file started with a Byte Order Mark (BOM), which is not supported.", cleaned_content
     
     return True, "", None
@@ -120,116 +127,163 @@ def log_user_id_errors(user_id_lines, null_user_id_lines, error_logger, errors):
                 errors.append(error_message)
 
 watch_directory = os.path.join(".", "watch_folder")
+# Output folders inside watch_folder; every other subfolder is treated as a tenant drop folder
+RESERVED_FOLDERS = ("success", "error", "logs")
 
-processed_files = {'success': 0, 'error': 0}
-files_processed = False
-
-def process_existing_files():
-    """Process any CSV files that already exist in the watch folder on startup."""
-    global files_processed
-    existing_csv_files = [f for f in os.listdir(watch_directory) 
+def list_existing_files():
+    """Return the CSV files that already exist in the watch folder and its tenant folders on startup."""
+    existing_csv_files = [f for f in list_files(watch_directory, subdirectories=True, exclude=RESERVED_FOLDERS)
                          if f.endswith('.csv') and not '_comma_fixed' in f]
     
     if existing_csv_files:
         colored_print(f"Found {len(existing_csv_files)} existing CSV file(s) to process", Colors.CYAN)
-        
-        for file in existing_csv_files:
-            full_path = os.path.join(watch_directory, file)
-            file_size = os.path.getsize(full_path)
-            colored_print(f"\nProcessing existing file: {file}", Colors.BOLD + Colors.BLUE)
-            file_size_mb = file_size / (1024 * 1024)
-            if file_size_mb >= 1:
-                print(f"   Size: {file_size_mb:.1f} MB ({file_size:,} bytes)")
-            else:
-                print(f"   Size: {file_size:,} bytes")
-            
-            start_time = time.time()
-            is_valid = classify_csv(full_path)
-            processing_time = time.time() - start_time
-            
-            colored_print(f"\n PROCESSING COMPLETE", Colors.BOLD + Colors.PURPLE)
-            print(f"   Original file: {file}")
-            print(f"   Processing time: {processing_time:.2f} seconds")
-            
-            if is_valid:
-                destination = os.path.join(watch_directory, "success", os.path.basename(full_path))
-                try:
-                    os.rename(full_path, destination)
-                    colored_print(f"    Status: VALID", Colors.BOLD + Colors.GREEN)
-                    print(f"    Moved to: success/{os.path.basename(full_path)}")
-                    processed_files['success'] += 1
-                except OSError as e:
-                    colored_print(f"     Error moving file to success folder: {e}", Colors.RED)
-                    processed_files['error'] += 1
-            else:
-                destination = os.path.join(watch_directory, "error", os.path.basename(full_path))
-                try:
-                    os.rename(full_path, destination)
-                    colored_print(f"   Status: ERRORS FOUND", Colors.BOLD + Colors.RED)
-                    print(f"    Moved to: error/{os.path.basename(full_path)}")
-                    print(f"   Error log: logs/{os.path.splitext(os.path.basename(full_path))[0]}.txt")
-                    processed_files['error'] += 1
-                except OSError as e:
-                    colored_print(f"     Error moving file to error folder: {e}", Colors.RED)
-                    processed_files['error'] += 1
-            
-            colored_print("-" * 60, Colors.CYAN)
-        
-        files_processed = True
-        
-        return set(os.listdir(watch_directory))
     else:
         colored_print("    No existing CSV files found", Colors.GREEN)
-        return set(os.listdir(watch_directory))
+    return existing_csv_files
 
-def has_file_stopped_growing(file_path):
+def render_transcript(text):
+    """Collapse carriage-return progress updates the way a terminal would display them."""
+    lines = []
+    for line in text.split("\n"):
+        segments = [segment for segment in line.split("\r") if segment.strip()]
+        if segments:
+            lines.append(segments[-1])
+    return lines
+
+def run_validation_job(file, tail_stable_seconds=None, report_options=None, pipeline=None, profile=False,
+                       sample_pattern=None, sample_after=None, profile_memory=False):
+    """
+    Worker entry point: validate one file from the watch folder and capture its console output.
+
+    With tail_stable_seconds set the file is validated while it is still being written (tail mode).
+    With pipeline set to (batch_bytes, queue_depth) reading overlaps with validation (pipeline mode).
+    report_options (ReportOptions) selects extra report outputs. With profile set a timing
+    breakdown per phase and rule is appended to the transcript. With profile_memory set the
+    peak and net allocation of each stage is appended to the transcript and the summary log.
+    Files matching the glob sample_pattern, and any file still validating after sample_after
+    seconds, are sampled by a SamplingProfiler whose stacks are saved to logs/<name>_profile.folded.
+    """
+    full_path = os.path.join(watch_directory, file)
+    output = io.StringIO()
+    stats = {}
+    error = None
+    profiler = Profiler(timing=profile, memory=profile_memory) if profile or profile_memory else None
+    sampler = None
+    if sample_pattern is not None and fnmatch.fnmatch(file, sample_pattern):
+        sampler = SamplingProfiler().start()
+    elif sample_after is not None:
+        sampler = SamplingProfiler(delay=sample_after).start()
+    with contextlib.redirect_stdout(output):
+        try:
+            if tail_stable_seconds is not None:
+                is_valid = tail_classify_csv(full_path, stats, tail_stable_seconds, report_options, profiler)
+            elif pipeline is not None:
+                is_valid = pipeline_classify_csv(full_path, stats, report_options, *pipeline, profiler=profiler)
+            else:
+                is_valid = classify_csv(full_path, stats, report_options, profiler)
+        except Exception as e:
+            is_valid = False
+            error = str(e)
+        finally:
+            if profiler is not None:
+                profiler.close()
+        if profile:
+            print("    Timing breakdown:")
+            for line in profiler.format_lines():
+                print(f"      {line}")
+        if profile_memory:
+            memory_lines = profiler.format_memory_lines()
+            print("    Memory by stage:")
+            for line in memory_lines:
+                print(f"      {line}")
+            if stats.get('summary_log'):
+                append_memory_summary(stats['summary_log'], memory_lines, report_options)
+        if sampler is not None:
+            sampler.stop()
+            if sampler.stacks:
+                profile_filename = save_sampling_profile(sampler, full_path)
+                print(f"    Sampling profile: logs/{profile_filename} ({sampler.sample_count:,} samples)")
     try:
-        size_before = os.path.getsize(file_path)
-        time.sleep(2)
-        size_after = os.path.getsize(file_path)
-        return size_before == size_after
+        # The final size: in tail mode the file was usually queued while it was still empty
+        size = os.path.getsize(full_path)
     except OSError:
-        return True
+        size = 0
+    return {
+        'is_valid': is_valid,
+        'transcript': render_transcript(output.getvalue()),
+        'error': error,
+        'rows': stats.get('rows', 0),
+        'bytes': size,
+    }
 
-def write_summary_log(error_log_path, filename, errors, timestamp_error_count=0, validator_error_count=0, validation_error_details=[]):
-    """Write a structured summary of errors to the log file."""
-    details_filename = None
-    if validation_error_details:
-        log_dir = os.path.dirname(error_log_path)
-        base_name = os.path.splitext(os.path.basename(error_log_path))[0]
-        details_filename = f"{base_name}_details.txt"
-        counter = 1
-        while os.path.exists(os.path.join(log_dir, details_filename)):
-            details_filename = f"{base_name}_details_{counter}.txt"
-            counter += 1
-        details_log_path = os.path.join(log_dir, details_filename)
-        
-        with open(details_log_path, 'w', encoding='utf-8') as details_file:
-            details_file.write("="*80 + "\n")
-            details_file.write(f"DETAILED VALIDATION ERRORS FOR: {filename}\n")
-            details_file.write("="*80 + "\n\n")
+def append_memory_summary(error_log_path, memory_lines, report_options=None):
+    """Add the per-stage memory breakdown to the end of a summary log."""
+    options = report_options or ReportOptions()
+    with Logger(error_log_path, compress_level=options.compress_level) as error_logger:
+        error_logger.log("MEMORY BY STAGE (tracemalloc)")
+        for line in memory_lines:
+            error_logger.log(f"  {line}")
 
-            for i, error in enumerate(validation_error_details, 1):
-                if isinstance(error, dict):
-                    row_num = error["row"]
-                    row_data = error["row_data"]
-                    individual_errors = error["message"].split("; ")
+def save_sampling_profile(sampler, file_path):
+    """Write the sampled stacks of a file's validation to watch_folder/logs and return the file name."""
+    logs_directory = os.path.join(watch_directory, "logs")
+    profile_filename = generate_unique_log_filename(logs_directory, os.path.basename(file_path), PROFILE_EXTENSION)
+    sampler.write(os.path.join(logs_directory, profile_filename))
+    return profile_filename
 
-                    details_file.write(f"#{i}. ROW {row_num} VALIDATION ERRORS\n")
-                    details_file.write("-" * 50 + "\n")
+def tenant_of(file):
+    """Tenant folder a queued file was dropped into ('' for the watch folder itself)."""
+    return os.path.dirname(file)
 
-                    for j, individual_error in enumerate(individual_errors, 1):
-                        details_file.write(f"   {j}. {individual_error}\n")
+def move_processed_file(file, is_valid, processed_files):
+    """Move a validated file into success/ or error/ and update the statistics."""
+    full_path = os.path.join(watch_directory, file)
+    if is_valid:
+        destination = os.path.join(watch_directory, "success", file)
+        try:
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            os.rename(full_path, destination)
+            colored_print(f"    Status: VALID", Colors.BOLD + Colors.GREEN)
+            print(f"    Moved to: success/{file}")
+            processed_files['success'] += 1
+        except OSError as e:
+            colored_print(f"     Error moving file to success folder: {e}", Colors.RED)
+            processed_files['error'] += 1
+    else:
+        destination = os.path.join(watch_directory, "error", file)
+        try:
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            os.rename(full_path, destination)
+            colored_print(f"   Status: ERRORS FOUND", Colors.BOLD + Colors.RED)
+            print(f"    Moved to: error/{file}")
+            processed_files['error'] += 1
+        except OSError as e:
+            colored_print(f"     Error moving file to error folder: {e}", Colors.RED)
+            processed_files['error'] += 1
 
-                    details_file.write(f"\n   Row Data: {row_data}\n")
-                    details_file.write("\n" + "="*80 + "\n\n")
-                else:
-                    details_file.write(f"#{i}. {error}\n")
-                    details_file.write("-" * 50 + "\n\n")
+def write_summary_log(error_log_path, filename, errors, timestamp_error_count=0, validator_error_count=0, validation_error_details=[], details_filename=None, compress_level=None):
+    """
+    Write a structured summary of errors to the log file.
+
+    details_filename names a details report that was already streamed during validation
+    (see DetailsReport); otherwise one is written here from validation_error_details.
+    With compress_level (1-9) the files are gzip-compressed; error_log_path should end in .gz.
+    """
+    if validation_error_details and details_filename is None:
+        log_dir = os.path.dirname(error_log_path)
+        base_name = log_base_name(os.path.basename(error_log_path))
+        extension = ".txt.gz" if compress_level is not None else ".txt"
+        details_filename = reserve_log_filename(log_dir, f"{base_name}_details", extension)
+        details_log_path = os.path.join(log_dir, details_filename)
+        
+        with open_report_file(details_log_path, compress_level) as details_file:
+            details_file.write(format_details_header(filename))
+            for i, error in enumerate(validation_error_details, 1):
+                details_file.write(format_details_entry(i, error))
     
     total_errors = len(errors) + timestamp_error_count + validator_error_count
     
-    with open(error_log_path, 'w', encoding='utf-8') as log_file:
+    with open_report_file(error_log_path, compress_level) as log_file:
         log_file.write("="*60 + "\n")
         log_file.write(f"VALIDATION REPORT FOR: {filename}\n")
         log_file.write("="*60 + "\n\n")
@@ -261,7 +315,7 @@ def write_summary_log(error_log_path, filename, errors, timestamp_error_count=0,
         if timestamp_error_count > 0:
             log_file.write(f"{error_count}. TIMESTAMP FORMAT ERRORS\n")
             log_file.write("-" * 40 + "\n")
-            log_file.write(f"Issue: Found {timestamp_error_count} timestamp errors\n")
+            log_file.write(f"Issue: Found {timestamp_error_count} rows with only timestamp errors\n")
             log_file.write(" Common issues: UNIX timestamp is in seconds instead of milliseconds\n\n\n")
             error_count += 1
             error_count += 1
@@ -285,7 +339,7 @@ def write_summary_log(error_log_path, filename, errors, timestamp_error_count=0,
         
         log_file.write("="*60 + "\n")
         
-        if (timestamp_error_count > 0 or validator_error_count > 0) and validation_error_details and details_filename:
+        if (timestamp_error_count > 0 or validator_error_count > 0) and details_filename:
             log_file.write(f"Details: See {details_filename} for specific rows and error details\n")
             log_file.write("="*60 + "\n")
 
@@ -307,6 +361,8 @@ def check_file_size_and_get_mode(file_path):
     if file_size_mb > 500:
         colored_print(f"   File too large: {size_display} (Maximum: 500MB)", Colors.RED)
         colored_print(f"    Please split the file into smaller chunks for processing", Colors.YELLOW)
+        colored_print(f"    To validate it and write 100MB chunks in one pass: python3 batch.py --split-mb 100 \"{file_path}\"",
+                      Colors.YELLOW)
         return False, "oversized", file_size_mb
     
     elif file_size_mb > 100:
@@ -323,53 +379,37 @@ def check_file_size_and_get_mode(file_path):
         colored_print(f"    File size: {size_display}", Colors.GREEN)
         return True, "normal", file_size_mb
 
-def count_file_rows(file_path, encoding='utf-8'):
-    """Quickly count rows in file for progress tracking."""
-    try:
-        with open(file_path, 'r', encoding=encoding) as file:
-            return sum(1 for line in file) - 1
-    except UnicodeDecodeError:
-        with open(file_path, 'r', encoding='ISO-8859-1') as file:
-            return sum(1 for line in file) - 1
-
-def generate_unique_log_filename(logs_directory, original_name):
-    base_name = os.path.splitext(original_name)[0]
-    extension = ".txt"
-    log_filename = f"{base_name}{extension}"
-    counter = 1
-    
-    while os.path.exists(os.path.join(logs_directory, log_filename)):
-        log_filename = f"{base_name}_{counter}{extension}"
-        counter += 1
-    
-    return log_filename
+def count_content_rows(content):
+    """Count data rows in decoded content for progress tracking."""
+    lines = content.count('\n')
+    if content and not content.endswith('\n'):
+        lines += 1
+    return lines - 1
+
+def semicolon_separator_error(headers):
+    return f"The file uses semicolon (;) separators, but comma (,) is the accepted format.\n\nFound: {'; '.join(headers)}\nExpected: {', '.join(headers)}"
 
-def classify_csv(file_path):
+def classify_csv(file_path, stats=None, report_options=None, profiler=None):
     print("    Checking file size and requirements...")
     
     size_ok, processing_mode, file_size_mb = check_file_size_and_get_mode(file_path)
     if not size_ok:
         return False
+    lap(profiler, "size check")
     
     print("    Analyzing file encoding...")
-    logs_directory = os.path.join(watch_directory, "logs")
-    original_filename = os.path.basename(file_path)
-    unique_log_filename = generate_unique_log_filename(logs_directory, original_filename)
-    error_log_path = os.path.join(logs_directory, unique_log_filename)
-    error_logger = Logger(error_log_path) 
+    header_error_message = None
     errors = []
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            content = file.read()
+    content, encoding, fallback_offset = read_text_file(file_path)
+    if fallback_offset is None:
         print("    File encoding: UTF-8")
-    except UnicodeDecodeError:
-        print("     UTF-8 failed, trying ISO-8859-1 encoding...")
-        with open(file_path, 'r', encoding='ISO-8859-1') as file:
-            content = file.read()
+    else:
+        print(f"     UTF-8 failed at byte {fallback_offset:,}, decoding the rest as ISO-8859-1...")
         print("    File encoding: ISO-8859-1")
+    lap(profiler, "read")
     
     print("    Checking for file format issues...")
-    bom_result = _check_for_non_printable_start(file_path)
+    bom_result = _check_for_non_printable_start(content)
     has_bom = False
     
     if len(bom_result) == 3:
@@ -383,6 +423,7 @@ def classify_csv(file_path):
         has_bom = False
         if not is_valid:
             errors.append(error_message)
+    lap(profiler, "bom check")
         
     print("     Parsing CSV structure...")
     
@@ -403,8 +444,7 @@ def classify_csv(file_path):
             semicolon_headers = reader.fieldnames
             if semicolon_headers in [contacts_headers, points_headers, vouchers_headers]:
                 print("     File uses semicolon separators, but comma is the accepted format")
-                separator_error = f"The file uses semicolon (;) separators, but comma (,) is the accepted format.\n\nFound: {'; '.join(semicolon_headers)}\nExpected: {', '.join(semicolon_headers)}"
-                errors.append(separator_error)
+                errors.append(semicolon_separator_error(semicolon_headers))
                 headers = semicolon_headers
                 delimiter = ';'
             else:
@@ -413,6 +453,7 @@ def classify_csv(file_path):
             print(f"   Error trying semicolon separator: {e}")
     
     print(f"   Final headers: {len(headers) if headers else 0} columns")
+    lap(profiler, "header detection")
     print("    Identifying CSV type...")
     if headers == contacts_headers:
         print("    Detected: CONTACTS CSV")
@@ -422,38 +463,35 @@ def classify_csv(file_path):
         null_user_id_lines = {}
         for line_number, row in enumerate(reader, start=2):
             check_user_id(row, user_id_lines, null_user_id_lines, line_number)
-        log_user_id_errors(user_id_lines, null_user_id_lines, error_logger, errors)
+        log_user_id_errors(user_id_lines, null_user_id_lines, None, errors)
+        lap(profiler, "duplicate scan")
         print("    Creating contacts validator...")
         validator = ContactsValidator(file_path, None, contacts_headers, delimiter)
-        if has_bom:
-            validator._cleaned_content = content
+        validator._cleaned_content = content
     elif headers == points_headers:
         print("    Detected: POINTS CSV")
         print("     Creating points validator...")
         validator = PointsValidator(file_path, None, points_headers, delimiter)
-        if has_bom:
-            validator._cleaned_content = content
+        validator._cleaned_content = content
     elif headers == vouchers_headers:
         print("    Detected: VOUCHERS CSV")
         print("     Creating vouchers validator...")
         validator = VoucherValidator(file_path, None, vouchers_headers, delimiter)
-        if has_bom:
-            validator._cleaned_content = content
+        validator._cleaned_content = content
     else:
         print("   Unknown CSV type - headers don't match expected format")
         error_message = generate_error_message(os.path.basename(file_path), headers, contacts_headers, points_headers, vouchers_headers)
-        error_logger.log(error_message)
+        header_error_message = error_message
         errors.append(error_message)
         validator = None
     
     print("    Running detailed validation...")
     validation_result = False
-    timestamp_error_count = 0
     
     if validator is not None:
         if processing_mode in ['medium_file', 'large_file']:
             try:
-                total_rows = count_file_rows(file_path)
+                total_rows = count_content_rows(content)
                 if total_rows > 1000:
                     colored_print(f"    Processing {total_rows:,} rows with progress tracking...", Colors.CYAN)
                     validator._enable_progress_tracking = True
@@ -461,28 +499,220 @@ def classify_csv(file_path):
             except Exception as e:
                 print(f"     Could not count rows for progress tracking: {e}")
         
+        attach_details_report(validator, file_path, report_options)
+        if profiler is not None:
+            validator.enable_profiling(profiler)
+        lap(profiler, "setup")
         validation_result = validator.validate()
-        
-        if hasattr(validator, '_timestamp_error_count'):
-            timestamp_error_count = validator._timestamp_error_count
+        if stats is not None:
+            stats['rows'] = validator.row_count
     else:
         print("     No validator available - cannot check content-specific errors")
-    
-    if errors or not validation_result or timestamp_error_count > 0:
+
+    with phase(profiler, "report"):
+        return finalize_classification(file_path, validator, validation_result, errors, header_error_message, content,
+                                       report_options, stats)
+
+MAX_FILE_SIZE_BYTES = 500 * 1024 * 1024
+TAIL_POLL_SECONDS = 0.2
+
+def tail_classify_csv(file_path, stats=None, stable_seconds=2.0, report_options=None, profiler=None):
+    """
+    Validate a file while it is still being transferred.
+
+    Complete lines are parsed and validated as they land; the verdict is reached once the
+    file has not changed for stable_seconds. Files the tail cannot handle (unrecognised
+    headers, more than 500MB) are validated by classify_csv once complete.
+    """
+    print("    Tail mode: validating records while the file is being written...")
+    tail = RecordTail(file_path)
+    lines = tail.iter_lines(stable_seconds, TAIL_POLL_SECONDS, MAX_FILE_SIZE_BYTES)
+
+    def fall_back(reason):
+        print(f"    {reason} - waiting for the transfer to finish...")
+        while not tail.is_complete(stable_seconds):
+            time.sleep(TAIL_POLL_SECONDS)
+        return classify_csv(file_path, stats, report_options, profiler)
+
+    header_line = next(lines, None)
+    validator, errors = stream_validate(file_path, header_line or '', lambda delimiter: iter_csv_rows(lines, delimiter),
+                                        tail, report_options, profiler)
+    if validator is None:
+        return fall_back("Headers not recognised")
+
+    if tail.position > MAX_FILE_SIZE_BYTES:
+        validator.report.discard()
+        return fall_back("File exceeds the size limit")
+
+    print(f"    Transfer complete: {format_file_size(tail.position)}")
+    if tail.fallback_offset is not None:
+        print(f"     UTF-8 failed at byte {tail.fallback_offset:,}, the rest was decoded as ISO-8859-1")
+    validation_result = validator.finish_validation()
+    if stats is not None:
+        stats['rows'] = validator.row_count
+
+    with phase(profiler, "report"):
+        return finalize_classification(file_path, validator, validation_result, errors, report_options=report_options,
+                                       stats=stats)
+
+def pipeline_classify_csv(file_path, stats=None, report_options=None, batch_bytes=DEFAULT_BATCH_BYTES,
+                          queue_depth=DEFAULT_QUEUE_DEPTH, profiler=None):
+    """
+    Validate a complete file with reading and decoding overlapped with validation.
+
+    A PipelineReader thread reads and decodes batches of batch_bytes while this thread
+    tokenizes and validates the previous ones; at most queue_depth decoded batches wait
+    in between. Rows are never all held in memory. Files with unrecognised headers are
+    validated by classify_csv.
+    """
+    print("    Checking file size and requirements...")
+    size_ok, _processing_mode, _file_size_mb = check_file_size_and_get_mode(file_path)
+    if not size_ok:
+        return False
+
+    print("    Pipeline mode: reading and validating in parallel...")
+    with PipelineReader(file_path, batch_bytes, queue_depth) as reader:
+        blocks = iter(reader)
+        first_block = next(blocks, '')
+        header_end = first_block.find('\n') + 1 or len(first_block)
+        remaining = itertools.chain((first_block[header_end:],), blocks)
+        validator, errors = stream_validate(file_path, first_block[:header_end],
+                                            lambda delimiter: iter_block_rows(remaining, delimiter),
+                                            reader, report_options, profiler)
+    if validator is None:
+        print("    Headers not recognised - validating the whole file...")
+        return classify_csv(file_path, stats, report_options, profiler)
+
+    if reader.fallback_offset is not None:
+        print(f"     UTF-8 failed at byte {reader.fallback_offset:,}, the rest was decoded as ISO-8859-1")
+    validation_result = validator.finish_validation()
+    if stats is not None:
+        stats['rows'] = validator.row_count
+
+    with phase(profiler, "report"):
+        return finalize_classification(file_path, validator, validation_result, errors, report_options=report_options,
+                                       stats=stats)
+
+def stream_validate(file_path, header_line, rows, source, report_options=None, profiler=None):
+    """
+    Validate a file whose rows are produced while it is being read.
+
+    source is the RecordTail or PipelineReader reading the file; rows(delimiter) returns
+    the rows after header_line. Returns (validator, errors) with every row validated but
+    finish_validation() not yet called, or (None, []) when the header is not recognised.
+    Reading, parsing and validation overlap, so profiler times them as one phase.
+    """
+    csv_type, validator_class, expected_cols, delimiter = detect_csv_type(header_line)
+    if validator_class is None:
+        return None, []
+
+    errors = []
+    print(f"    Detected: {csv_type.upper()} CSV")
+    if source.has_bom:
+        print("     File starts with a Byte Order Mark (BOM)")
+        errors.append("The file started with a Byte Order Mark (BOM), which is not supported.")
+    if delimiter == ';':
+        print("     File uses semicolon separators, but comma is the accepted format")
+        errors.append(semicolon_separator_error(expected_cols))
+
+    validator = validator_class(file_path, None, expected_cols, delimiter)
+    is_contacts = validator_class is ContactsValidator
+    user_id_lines = {}
+    null_user_id_lines = {}
+    user_id_line_number = 1
+
+    attach_details_report(validator, file_path, report_options)
+    if profiler is not None:
+        validator.enable_profiling(profiler)
+    validator.start_validation()
+    idx = 1
+    with phase(profiler, "read + validation"):
+        try:
+            for row in rows(delimiter):
+                if is_contacts and row:
+                    # Same numbering and userId lookup as the csv.DictReader scan in classify_csv
+                    user_id_line_number += 1
+                    check_user_id({'userId': row[0]}, user_id_lines, null_user_id_lines, user_id_line_number)
+                if any(row):
+                    idx += 1
+                    validator.validate_record(idx, row)
+        except BaseException:
+            validator.abort_validation()
+            raise
+
+    if is_contacts:
+        log_user_id_errors(user_id_lines, null_user_id_lines, None, errors)
+    return validator, errors
+
+def write_cleaned_copy(file_path, cleaned_file_path, content=None):
+    """Write the file without its BOM, from decoded content or by copying the bytes after the BOM."""
+    if content is not None:
+        with open(cleaned_file_path, 'w', encoding='utf-8') as cleaned_file:
+            cleaned_file.write(content)
+        return
+    with open(file_path, 'rb') as source, open(cleaned_file_path, 'wb') as cleaned_file:
+        if source.read(3) != b'\xef\xbb\xbf':
+            source.seek(0)
+        shutil.copyfileobj(source, cleaned_file, 1024 * 1024)
+
+def attach_details_report(validator, file_path, report_options=None):
+    """
+    Stream the validator's row errors into a details report in watch_folder/logs instead of memory.
+
+    With points totals selected a points validator also writes logs/<name>_totals.csv.
+    """
+    logs_directory = os.path.join(watch_directory, "logs")
+    original_filename = os.path.basename(file_path)
+    validator.report = DetailsReport(logs_directory, original_filename,
+                                     getattr(validator, '_original_filename', original_filename),
+                                     report_options, validator.timestamp_column)
+    if report_options is not None and report_options.points_totals and isinstance(validator, PointsValidator):
+        totals_filename = generate_unique_log_filename(
+            logs_directory, getattr(validator, '_original_filename', original_filename), TOTALS_EXTENSION)
+        validator.totals_path = os.path.join(logs_directory, totals_filename)
+
+def finalize_classification(file_path, validator, validation_result, errors, header_error_message=None, content=None, report_options=None, stats=None):
+    """
+    Write the error report for a validated file, handle BOM-only files and return the verdict.
+
+    The path of a written summary log is recorded in stats['summary_log'].
+    """
+    logs_directory = os.path.join(watch_directory, "logs")
+    original_filename = os.path.basename(file_path)
+
+    if errors or not validation_result:
         if validator:
             filename_for_log = getattr(validator, '_original_filename', os.path.basename(file_path))
-            
-
-            validation_error_details = validator.validation_error_details + validator.timestamp_error_details
-            timestamp_error_count = len(validator.timestamp_error_details)
-            
-            validator_error_count = len(validator.validation_error_details)
+            validation_error_details = validator.validation_error_details
+            timestamp_error_count = validator.timestamp_error_count
+            validator_error_count = validator.validation_error_count
         else:
             filename_for_log = os.path.basename(file_path)
+            timestamp_error_count = 0
             validator_error_count = 0
             validation_error_details = []
         
-        write_summary_log(error_log_path, filename_for_log, errors, timestamp_error_count, validator_error_count, validation_error_details)
+        report = getattr(validator, 'report', None)
+        options = report_options or ReportOptions()
+        if report is not None and report.log_filename:
+            # The details were streamed during validation; its log name is already reserved
+            unique_log_filename = report.log_filename
+            details_filename = report.details_filename
+        else:
+            unique_log_filename = generate_unique_log_filename(logs_directory, original_filename, ".txt" + options.suffix)
+            details_filename = None
+        error_log_path = os.path.join(logs_directory, unique_log_filename)
+        write_summary_log(error_log_path, filename_for_log, errors, timestamp_error_count, validator_error_count,
+                          validation_error_details, details_filename, options.compress_level)
+        if stats is not None:
+            stats['summary_log'] = error_log_path
+        if header_error_message:
+            with Logger(error_log_path, compress_level=options.compress_level) as error_logger:
+                error_logger.log(header_error_message)
+        print(f"   Error log: logs/{unique_log_filename}")
+        if report is not None and report.export is not None:
+            for export_filename in report.export.filenames:
+                print(f"   Error export: logs/{export_filename}")
         
         has_bom_error = any("Byte Order Mark (BOM)" in error for error in errors)
         total_errors_found = len(errors) + timestamp_error_count + validator_error_count
@@ -496,12 +726,11 @@ def classify_csv(file_path):
             cleaned_file_path = os.path.join(os.path.dirname(file_path), cleaned_filename)
             
             try:
-                with open(cleaned_file_path, 'w', encoding='utf-8') as cleaned_file:
-                    cleaned_file.write(content)
+                write_cleaned_copy(file_path, cleaned_file_path, content)
                 print(f"    Created cleaned file: {cleaned_filename}")
                 
                 print("    Re-validating cleaned file...")
-                cleaned_result = classify_csv(cleaned_file_path)
+                cleaned_result = classify_csv(cleaned_file_path, report_options=report_options)
                 
                 if cleaned_result:
                     print(f"    Cleaned file validation: SUCCESS")
@@ -571,122 +800,324 @@ def generate_error_message(filename, headers_found, contacts_headers, points_hea
     
     return error_msg
 
-previous_files = process_existing_files()
+def print_final_statistics(processed_files):
+    colored_print(f" Final Statistics:", Colors.BOLD + Colors.CYAN)
+    print(f"    Successfully processed: {processed_files['success']} files")
+    print(f"   Files with errors: {processed_files['error']} files")
+    print(f"    Total processed: {processed_files['success'] + processed_files['error']} files")
+    print()
+
+def print_worker_status(pool):
+    """Print one status line per worker."""
+    for worker_id, current in pool.status().items():
+        if current is None:
+            print(f"   [worker {worker_id}] idle")
+        else:
+            file, running_for = current
+            print(f"   [worker {worker_id}] validating {file} ({running_for:.0f}s)")
 
-print()
-colored_print(" Now watching for new CSV files... (Press Ctrl+C to stop)", Colors.YELLOW)
-colored_print("-" * 60, Colors.CYAN)
+def is_cleaned_copy(file, active_files):
+    """True for the '<name>_edited.csv' copy classify_csv writes while '<name>.csv' is being validated."""
+    base, extension = os.path.splitext(file)
+    return base.endswith("_edited") and f"{base[:-len('_edited')]}{extension}" in active_files
 
-try:
-    if files_processed:
-        timeout_start_time = time.time()
-        print()
-        colored_print(f" Auto-completion timer started (10 seconds)", Colors.YELLOW)
+def dispatch_queued_files(scheduler, budget, pool, active_files):
+    """
+    Hand queued files to idle workers in scheduler order while the in-flight budget has room.
+
+    Files are only submitted while a worker is free: the pool's own queue is FIFO, so a
+    file waiting there could no longer be overtaken by a smaller one queued after it.
+    Sizes are read again at dispatch, as tail mode queues files while they are still being
+    written; the size admitted to the budget is kept in active_files for its release.
+    """
+    while scheduler and pool.in_flight < pool.workers:
+        file, size, _group = scheduler.peek()
+        try:
+            size = max(size, os.path.getsize(os.path.join(watch_directory, file)))
+        except OSError:
+            pass
+        if not budget.can_admit(size) or not pool.submit(file):
+            break
+        scheduler.pop()
+        budget.admit(size)
+        active_files[file] = (size, active_files.get(file, (0, time.time()))[1])
+
+def record_finished_file(file, result, elapsed, active_files, budget, cost_model, stats):
+    """Release a finished file from the budget and feed its final size, rows and time to the cost model and statistics."""
+    size, queued_at = active_files.pop(file, (0, time.time()))
+    budget.release(size)
+    rows = result['rows'] if isinstance(result, dict) else 0
+    final_size = (result.get('bytes') if isinstance(result, dict) else None) or size
+    cost_model.record(final_size, rows, elapsed)
+    stats.record(final_size, rows, time.time() - queued_at)
+
+def handle_worker_event(event, worker_id, file, result, elapsed, processed_files):
+    """Print the outcome reported by a worker and move the file accordingly."""
+    if event == EVENT_STARTED:
+        colored_print(f"[worker {worker_id}] Validating {file}", Colors.BLUE)
+        return False
+
+    if isinstance(result, Exception):
+        is_valid, transcript, error = False, [], str(result)
     else:
-        timeout_start_time = None
-    
-    while True:
-        current_files = set(os.listdir(watch_directory))
-        new_files = current_files - previous_files
+        is_valid, transcript, error = result['is_valid'], result['transcript'], result['error']
 
-        for file in new_files:
-            if file.endswith(".csv"):
-                if '_comma_fixed' in file:
-                    colored_print(f"     Skipping auto-generated comma-fixed file: {file}", Colors.CYAN)
-                    continue
-                    
-                full_path = os.path.join(watch_directory, file)
-                file_size = os.path.getsize(full_path)
-                colored_print(f"\nNew file detected: {file}", Colors.BOLD + Colors.BLUE)
-                file_size_mb = file_size / (1024 * 1024)
-                if file_size_mb >= 1:
-                    print(f"   Size: {file_size_mb:.1f} MB ({file_size:,} bytes)")
-                else:
-                    print(f"   Size: {file_size:,} bytes")
-                colored_print("   Waiting for file transfer to complete...", Colors.YELLOW)
-                
-                while not has_file_stopped_growing(full_path):
-                    colored_print("    File still growing, waiting...", Colors.YELLOW)
-                    
-                colored_print(f"    File transfer complete, starting validation...", Colors.GREEN)
-                
-                start_time = time.time()
-                is_valid = classify_csv(full_path)
-                processing_time = time.time() - start_time
-                
-                colored_print(f"\n PROCESSING COMPLETE", Colors.BOLD + Colors.PURPLE)
-                print(f"   Original file: {file}")
-                print(f"   Processing time: {processing_time:.2f} seconds")
-                
-                if is_valid:
-                    destination = os.path.join(watch_directory, "success", os.path.basename(full_path))
-                    try:
-                        os.rename(full_path, destination)
-                        colored_print(f"    Status: VALID", Colors.BOLD + Colors.GREEN)
-                        print(f"    Moved to: success/{os.path.basename(full_path)}")
-                        processed_files['success'] += 1
-                    except OSError as e:
-                        colored_print(f"     Error moving file to success folder: {e}", Colors.RED)
-                        processed_files['error'] += 1
-                else:
-                    destination = os.path.join(watch_directory, "error", os.path.basename(full_path))
-                    try:
-                        os.rename(full_path, destination)
-                        error_log = os.path.join(watch_directory, "logs", os.path.splitext(os.path.basename(full_path))[0] + ".txt")
-                        colored_print(f"   Status: ERRORS FOUND", Colors.BOLD + Colors.RED)
-                        print(f"    Moved to: error/{os.path.basename(full_path)}")
-                        print(f"   Error log: logs/{os.path.splitext(os.path.basename(full_path))[0]}.txt")
-                        processed_files['error'] += 1
-                    except OSError as e:
-                        colored_print(f"     Error moving file to error folder: {e}", Colors.RED)
-                        processed_files['error'] += 1
-                
-                files_processed = True
-                
-                if timeout_start_time is None:
-                    timeout_start_time = time.time()
-                    print()
-                    colored_print(f" Auto-completion timer started (10 seconds)", Colors.YELLOW)
-                
-                colored_print("-" * 60, Colors.CYAN)
+    colored_print(f"\n[worker {worker_id}] PROCESSING COMPLETE", Colors.BOLD + Colors.PURPLE)
+    for line in transcript:
+        print(f"[worker {worker_id}] {line}")
+    print(f"   Original file: {file}")
+    print(f"   Processing time: {elapsed:.2f} seconds")
 
-        previous_files = current_files
-        
-        if files_processed and timeout_start_time is not None:
-            elapsed_time = time.time() - timeout_start_time
-            remaining_time = 10 - elapsed_time
-            
-            if elapsed_time >= 10:
-                print()
-                colored_print(f" Auto-completion timeout reached", Colors.YELLOW)
-                print()
-                colored_print(f" Final Statistics:", Colors.BOLD + Colors.CYAN)
-                print(f"    Successfully processed: {processed_files['success']} files")
-                print(f"   Files with errors: {processed_files['error']} files")
-                print(f"    Total processed: {processed_files['success'] + processed_files['error']} files")
-                print()
-                colored_print(f" Auto-completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", Colors.BOLD + Colors.GREEN)
-                break
-            elif remaining_time > 0:
-                print(f"\r Auto-completion in {remaining_time:.1f}s (Ctrl+C to stop early)" + " " * 20, end='\r')
-        
-        time.sleep(1)
+    if error:
+        colored_print(f"   Unexpected error while validating {file}: {error}", Colors.RED)
+        colored_print("   File left in the watch folder", Colors.YELLOW)
+        processed_files['error'] += 1
+    else:
+        move_processed_file(file, is_valid, processed_files)
+    colored_print("-" * 60, Colors.CYAN)
+    return True
 
-except KeyboardInterrupt:
-    print()
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Watch ./watch_folder and validate dropped loyalty CSV files.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="number of validation worker processes (default: CPU count)")
+    parser.add_argument("--queue-size", type=int, default=None,
+                        help="capacity of the queue handing files to workers (default: twice the worker count); "
+                             "files are only handed over when a worker is idle and wait in the scheduler until then")
+    parser.add_argument("--schedule", choices=POLICIES, default=POLICY_SJF,
+                        help="order for queued files: sjf = smallest estimated work first, fifo = arrival order, "
+                             "fair = balance work across tenant subfolders (default: sjf)")
+    parser.add_argument("--daemon", action="store_true",
+                        help="run as a long-lived service: no auto-completion timer, graceful shutdown on "
+                             "SIGTERM/SIGINT and periodic statistics")
+    parser.add_argument("--max-inflight-files", type=int, default=None,
+                        help="maximum files being validated at once; further files wait in the queue")
+    parser.add_argument("--max-inflight-mb", type=float, default=None,
+                        help="maximum combined size in MB of files being validated at once")
+    parser.add_argument("--stats-interval", type=float, default=60.0,
+                        help="seconds between throughput/latency statistics in daemon mode (default: 60)")
+    parser.add_argument("--shutdown-timeout", type=float, default=300.0,
+                        help="seconds to let in-flight files finish after a shutdown signal (default: 300)")
+    parser.add_argument("--export", choices=EXPORT_FORMATS, action="append", default=[],
+                        help="also write row errors as <log>_errors.ndjson or <log>_errors.csv with row, column, "
+                             "code and message; repeat for both")
+    parser.add_argument("--points-totals", action="store_true",
+                        help="write each user's pointsToSpend, statusPoints and cashback totals over the valid rows "
+                             "of a points file to logs/<name>_totals.csv")
+    parser.add_argument("--compress-level", type=int, choices=range(1, 10), default=None, metavar="1-9",
+                        help="gzip logs, details reports and exports at this level (1 = fastest, 9 = smallest)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--tail", action="store_true",
+                      help="start validating files while they are still being transferred, reaching the "
+                           "verdict as soon as the transfer completes")
+    mode.add_argument("--pipeline", action="store_true",
+                      help="read and decode each file on a separate thread while its rows are validated")
+    parser.add_argument("--stable-seconds", type=float, default=2.0,
+                        help="seconds without writes after which a transfer counts as complete (default: 2)")
+    parser.add_argument("--profile", action="store_true",
+                        help="add a timing breakdown per validation phase and rule to each file's output")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="record peak and net memory allocation per stage (tracemalloc; slows validation down) "
+                             "in each file's output and summary log")
+    parser.add_argument("--sample-profile", nargs="?", const="*", default=None, metavar="PATTERN",
+                        help="sample the call stacks of files matching PATTERN (default: all files) and write "
+                             "them to logs/<name>_profile.folded for flame graphs")
+    parser.add_argument("--sample-after", type=float, default=None, metavar="SECONDS",
+                        help="sample any file whose validation takes longer than SECONDS")
+    parser.add_argument("--batch-kb", type=int, default=DEFAULT_BATCH_BYTES // 1024,
+                        help=f"pipeline mode: KB read and decoded per batch (default: {DEFAULT_BATCH_BYTES // 1024})")
+    parser.add_argument("--queue-depth", type=int, default=DEFAULT_QUEUE_DEPTH,
+                        help=f"pipeline mode: decoded batches that may wait for validation (default: {DEFAULT_QUEUE_DEPTH})")
+    args = parser.parse_args(argv)
+    if args.batch_kb < 1 or args.queue_depth < 1:
+        parser.error("--batch-kb and --queue-depth must be at least 1")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    enable_windows_ansi()
+
+    shutdown = ShutdownRequest()
+    if args.daemon:
+        shutdown.install()
+        if not sys.stdout.isatty():
+            # Keep supervisor logs readable and timely
+            Colors.ENABLED = False
+            if hasattr(sys.stdout, 'reconfigure'):
+                sys.stdout.reconfigure(line_buffering=True)
+
+    print_header()
+
+    ensure_directories_exist()
+
+    colored_print(" Setting up directories...", Colors.BLUE)
+    print(f"   Watch directory: {os.path.abspath(os.path.join('.', 'watch_folder'))}")
+    print(f"   Success folder:  {os.path.abspath(os.path.join('.', 'watch_folder', 'success'))}")
+    print(f"   Error folder:    {os.path.abspath(os.path.join('.', 'watch_folder', 'error'))}")
+    print(f"   Logs folder:     {os.path.abspath(os.path.join('.', 'watch_folder', 'logs'))}")
     print()
-    colored_print(" Shutdown requested by user", Colors.YELLOW)
+    colored_print("Supported file types:", Colors.BLUE)
+    print("   • Contacts CSV (userId, shouldJoin, joinDate, tierName, tierEntryAt, tierCalcAt, shouldReward)")
+    print("   • Points CSV   (userId, pointsToSpend, statusPoints, cashback, allocatedAt, expireAt, setPlanExpiration, reason, title, description)")
+    print("   • Vouchers CSV (userId, externalId, voucherType, voucherName, iconName, code, expiration)")
     print()
-    colored_print(" Final Statistics:", Colors.BOLD + Colors.CYAN)
-    
-    print(f"    Successfully processed: {processed_files['success']} files")
-    print(f"   Files with errors: {processed_files['error']} files")
-    print(f"    Total processed: {processed_files['success'] + processed_files['error']} files")
-    print()
-    colored_print(f" Goodbye! Watcher stopped at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", Colors.BOLD + Colors.GREEN)
-    
-except Exception as e:
+    colored_print(" To validate files: Drop your CSV files into the watch_folder directory", Colors.GREEN)
     print()
+    colored_print(" Checking for existing CSV files in watch folder...", Colors.YELLOW)
+
+    processed_files = {'success': 0, 'error': 0}
+    scheduler = FileScheduler(args.schedule)
+    max_inflight_bytes = int(args.max_inflight_mb * 1024 * 1024) if args.max_inflight_mb else None
+    budget = InFlightBudget(args.max_inflight_files, max_inflight_bytes)
+    stats = ThroughputStats()
+    # Files queued or being validated (name -> (size, queued at)); used for budgets, statistics
+    # and to ignore the BOM-cleaned copies workers create
+    active_files = {}
+
+    def enqueue(file):
+        try:
+            size = os.path.getsize(os.path.join(watch_directory, file))
+        except OSError:
+            return
+        active_files[file] = (size, time.time())
+        scheduler.push(file, size, tenant_of(file))
+
+    for file in list_existing_files():
+        enqueue(file)
+    files_processed = False
+
+    report_options = ReportOptions(args.export, args.compress_level, args.points_totals)
+    task = functools.partial(run_validation_job, report_options=report_options,
+                             tail_stable_seconds=args.stable_seconds if args.tail else None,
+                             pipeline=(args.batch_kb * 1024, args.queue_depth) if args.pipeline else None,
+                             profile=args.profile, sample_pattern=args.sample_profile,
+                             sample_after=args.sample_after, profile_memory=args.profile_memory)
+    pool = WorkerPool(task, workers=args.workers, queue_size=args.queue_size)
+    # Start watching before dispatching so files dropped meanwhile are not missed
+    file_watcher = create_watcher(watch_directory, subdirectories=True, exclude=RESERVED_FOLDERS)
+    readiness = ReadinessTracker(watch_directory, stable_seconds=args.stable_seconds)
+
     print()
-    colored_print(f" Unexpected error occurred: {str(e)}", Colors.BOLD + Colors.RED)
-    colored_print(" Please restart the watcher", Colors.YELLOW)
+    mode = "daemon mode, " if args.daemon else ""
+    if args.tail:
+        mode += "tail mode, "
+    colored_print(f" Now watching for new CSV files ({mode}{file_watcher.backend}, {pool.workers} workers, {scheduler.policy} scheduling)... (Press Ctrl+C to stop)", Colors.YELLOW)
+    colored_print("-" * 60, Colors.CYAN)
+
+    timeout_start_time = None
+    last_status_time = time.time()
+    last_stats_time = time.time()
+    shutdown_deadline = None
+
+    try:
+        while True:
+            if shutdown.requested:
+                if shutdown_deadline is None:
+                    shutdown_deadline = time.time() + args.shutdown_timeout
+                    pool.begin_shutdown()
+                    print()
+                    colored_print(f" {shutdown.signal_name} received - finishing {pool.in_flight} in-flight file(s), "
+                                  f"{len(scheduler)} queued file(s) stay in the watch folder", Colors.YELLOW)
+                if pool.in_flight == 0 or time.time() >= shutdown_deadline:
+                    if pool.in_flight:
+                        colored_print(f" Shutdown timeout reached, abandoning {pool.in_flight} in-flight file(s)", Colors.RED)
+                        pool.close(wait=False)
+                    print()
+                    print_final_statistics(processed_files)
+                    colored_print(f" Watcher stopped at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", Colors.BOLD + Colors.GREEN)
+                    break
+
+            # Only hand a file to the pool when a worker is idle and the in-flight budget has
+            # room, so the scheduler decides the order and large drops apply backpressure
+            if not shutdown.requested:
+                dispatch_queued_files(scheduler, budget, pool, active_files)
+
+            busy = pool.in_flight > 0 or bool(scheduler)
+            poll_timeout = readiness.next_timeout()
+            if busy:
+                poll_timeout = 0.1 if poll_timeout is None else min(poll_timeout, 0.1)
+            elif timeout_start_time is not None or args.daemon:
+                # Daemon mode wakes up regularly to notice shutdown signals and print statistics
+                poll_timeout = 1.0 if poll_timeout is None else min(poll_timeout, 1.0)
+
+            for file, event in file_watcher.poll(poll_timeout):
+                if not file.endswith(".csv"):
+                    continue
+                if '_comma_fixed' in file:
+                    colored_print(f"     Skipping auto-generated comma-fixed file: {file}", Colors.CYAN)
+                    continue
+                if not os.path.exists(os.path.join(watch_directory, file)):
+                    continue
+                if is_cleaned_copy(file, active_files):
+                    continue
+                if args.tail:
+                    # Validation follows the transfer, so the file is queued straight away
+                    if file not in active_files:
+                        colored_print(f"\nNew file detected, queued for tail validation: {file}", Colors.BOLD + Colors.BLUE)
+                        enqueue(file)
+                    continue
+                if readiness.observe(file, event):
+                    colored_print(f"\nNew file detected: {file}", Colors.BOLD + Colors.BLUE)
+                    colored_print("   Waiting for file transfer to complete...", Colors.YELLOW)
+
+            for file in readiness.pop_ready():
+                if file in active_files:
+                    continue
+                colored_print(f"    File transfer complete, queued for validation: {file}", Colors.GREEN)
+                enqueue(file)
+
+            for event, worker_id, file, result, elapsed in pool.poll():
+                if handle_worker_event(event, worker_id, file, result, elapsed, processed_files):
+                    record_finished_file(file, result, elapsed, active_files, budget, scheduler.cost_model, stats)
+                    files_processed = True
+                    if timeout_start_time is None and not args.daemon:
+                        timeout_start_time = time.time()
+                        print()
+                        colored_print(f" Auto-completion timer started (10 seconds)", Colors.YELLOW)
+
+            if pool.in_flight > 1 and time.time() - last_status_time >= 5:
+                print_worker_status(pool)
+                last_status_time = time.time()
+
+            if args.daemon and time.time() - last_stats_time >= args.stats_interval:
+                figures = stats.snapshot()
+                print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] stats "
+                      + ThroughputStats.format(figures, len(scheduler), budget.files, budget.bytes))
+                last_stats_time = time.time()
+
+            if files_processed and timeout_start_time is not None and not (pool.in_flight or scheduler or len(readiness)):
+                elapsed_time = time.time() - timeout_start_time
+                remaining_time = 10 - elapsed_time
+
+                if elapsed_time >= 10:
+                    print()
+                    colored_print(f" Auto-completion timeout reached", Colors.YELLOW)
+                    print()
+                    print_final_statistics(processed_files)
+                    colored_print(f" Auto-completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", Colors.BOLD + Colors.GREEN)
+                    break
+                elif remaining_time > 0:
+                    print(f"\r Auto-completion in {remaining_time:.1f}s (Ctrl+C to stop early)" + " " * 20, end='\r')
+
+    except KeyboardInterrupt:
+        print()
+        print()
+        colored_print(" Shutdown requested by user", Colors.YELLOW)
+        print()
+        pool.close(wait=False)
+        print_final_statistics(processed_files)
+        colored_print(f" Goodbye! Watcher stopped at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", Colors.BOLD + Colors.GREEN)
+
+    except Exception as e:
+        print()
+        print()
+        colored_print(f" Unexpected error occurred: {str(e)}", Colors.BOLD + Colors.RED)
+        colored_print(" Please restart the watcher", Colors.YELLOW)
+
+    finally:
+        pool.close()
+        file_watcher.close()
+
+
+if __name__ == '__main__':
+    main()